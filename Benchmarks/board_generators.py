@@ -0,0 +1,91 @@
+'''
+Seeded board generators shared by the benchmarks.
+'''
+import random
+from typing import Dict, List
+from Models.board import BOARD_SIZE, Board
+from Services.Game.game_simulator import play_random_game
+from Services.Pieces.piece_service import get_piece_by_name
+
+# Rounds played for the boards of every fill level.
+FILL_LEVELS: Dict[str, int] = {"early": 2, "mid": 4, "late": 7}
+
+# Road pieces of create_dense_road_board, junctions first.
+ROAD_PIECES = [
+  "four_road",
+  "road_t_junction_north_east_west",
+  "road_t_junction_north_east_south",
+  "road_t_junction_east_south_west",
+  "road_t_junction_north_south_west",
+  "curved_road_north_east",
+  "curved_road_east_south",
+  "curved_road_south_west",
+  "curved_road_west_north",
+  "straight_road_north_south",
+  "straight_road_east_west",
+]
+
+
+def create_played_board(seed: int, rounds: int) -> Board:
+  '''
+  Creates the board of a random game (see play_random_game) after the passed number of rounds.
+  '''
+  return Board.from_bytes(bytes(play_random_game(seed, rounds)))
+
+def create_road_grid_board(size: int = BOARD_SIZE, offset: int = 0) -> Board:
+  '''
+  Creates a lattice of roads in the top left size x size squares: four way junctions on even squares, connected by
+  straight roads, which closes a loop around every empty odd square. offset shifts the lattice to the right.
+  '''
+  board = Board()
+  for x in range(size):
+    for y in range(size):
+      if x % 2 == 0 and y % 2 == 0:
+        name = "four_road"
+      elif x % 2 == 1 and y % 2 == 0:
+        name = "straight_road_east_west"
+      elif x % 2 == 0 and y % 2 == 1:
+        name = "straight_road_north_south"
+      else:
+        continue
+      board.set_piece(x + offset, y, get_piece_by_name(name))
+
+  return board
+
+def create_benchmark_boards(seed: int, count: int) -> Dict[str, List[Board]]:
+  '''
+  Returns count boards per fill level and loop heavy road grids of growing size.
+  '''
+  rng = random.Random(seed)
+  boards = {
+    level: [create_played_board(rng.getrandbits(32), rounds) for _ in range(count)]
+    for level, rounds in FILL_LEVELS.items()
+  }
+  boards["road_grid"] = [create_road_grid_board(size, rng.randrange(BOARD_SIZE - size + 1)) for size in (3, 5, 7)]
+
+  return boards
+
+def create_dense_road_board(rng: random.Random, width: int, height: int) -> Board:
+  '''
+  Creates a board, whose top left width x height squares are filled with road pieces. Junctions are preferred,
+  which produces many loops.
+  '''
+  board = Board()
+  weights = [6, 3, 3, 3, 3, 1, 1, 1, 1, 1, 1]
+  for x in range(width):
+    for y in range(height):
+      board.set_piece(x, y, get_piece_by_name(rng.choices(ROAD_PIECES, weights)[0]))
+
+  return board
+
+def create_four_road_board(width: int, height: int) -> Board:
+  '''
+  Creates a board, whose top left width x height squares are all four way road pieces, the worst case of the
+  exhaustive search.
+  '''
+  board = Board()
+  for x in range(width):
+    for y in range(height):
+      board.set_piece(x, y, get_piece_by_name("four_road"))
+
+  return board
@@ -0,0 +1,86 @@
+'''
+Measures the cold start of short-lived processes, e.g. CLI invocations and pool workers: the wall time of a fresh
+interpreter, which imports the evaluation path and scores an empty board, against that of a bare interpreter. Also
+reports the heavy modules, which were imported on the way; matplotlib and numpy must not be among them.
+
+Run from the repository root via python -m Benchmarks.cold_start_benchmark [--runs 20] [--limit-ms 100]
+'''
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+HEAVY_MODULES = ("matplotlib", "numpy")
+
+SCRIPTS: Dict[str, str] = {
+  "bare_interpreter": "pass",
+  "evaluation_path": (
+    "from Models.board import Board\n"
+    "from Services.Board.Evaluation.board_evaluation_service import evaluate_board_position\n"
+    "evaluate_board_position(Board())\n"
+  ),
+  "cli_import": "import main",
+}
+
+REPORT = "import sys; print(' '.join(sorted({name.split('.')[0] for name in sys.modules} & set(%r))))"
+
+
+def time_script(script: str, runs: int) -> List[float]:
+  '''
+  Returns the wall times in milliseconds of runs fresh interpreters running the script from the repository root.
+  '''
+  root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+  environment = dict(os.environ, PYTHONPATH=root)
+  times: List[float] = []
+  for _ in range(runs):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", script], cwd=root, env=environment, check=True)
+    times.append((time.perf_counter() - start) * 1000)
+
+  return times
+
+def get_imported_heavy_modules(script: str) -> List[str]:
+  '''
+  Returns the HEAVY_MODULES, which are imported by the script.
+  '''
+  root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+  output = subprocess.run(
+    [sys.executable, "-c", script + "\n" + REPORT % (HEAVY_MODULES,)],
+    cwd=root, env=dict(os.environ, PYTHONPATH=root), check=True, capture_output=True, text=True,
+  ).stdout
+
+  return output.split()
+
+def main(arguments: List[str]) -> int:
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument("--runs", type=int, default=20)
+  parser.add_argument("--limit-ms", type=float, default=100.0, help="fail, if the evaluation path takes longer (default 100)")
+  options = parser.parse_args(arguments)
+
+  # Warm up the bytecode caches, which every later process finds on disk.
+  time_script(SCRIPTS["evaluation_path"], 1)
+
+  results = {}
+  for name, script in SCRIPTS.items():
+    times = time_script(script, options.runs)
+    results[name] = {
+      "median_ms": statistics.median(times),
+      "min_ms": min(times),
+      "imports": get_imported_heavy_modules(script),
+    }
+  print(json.dumps(results, indent=2))
+
+  evaluation = results["evaluation_path"]
+  if evaluation["median_ms"] > options.limit_ms or {"matplotlib", "numpy"} & set(evaluation["imports"]):
+    print(f"evaluation path exceeds {options.limit_ms}ms or imports matplotlib/numpy", file=sys.stderr)
+    return 1
+
+  return 0
+
+
+if __name__ == "__main__":
+  sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,146 @@
+'''
+Benchmark suite for the evaluator, the board I/O and the piece lookups.
+
+Every case is timed on seeded boards of several fill levels (see board_generators) and reported as JSON. Passing a
+saved result as baseline compares the minimum times and flags cases, which became slower than the threshold allows;
+the exit code is 1 in that case.
+
+Run from the repository root via
+  python -m Benchmarks.evaluation_benchmark [--output result.json] [--baseline baseline.json] [--threshold 0.1]
+'''
+import argparse
+import json
+import platform
+import sys
+import time
+from typing import Any, Callable, Dict, List, Tuple
+from Benchmarks.board_generators import create_benchmark_boards
+from Models.board import Board
+from Models.enums import BasicDice
+from Services.Board.Evaluation.board_evaluation_service import (
+  determine_deductions_for_unconnected_pieces,
+  determine_points_from_central_squares,
+  determine_points_from_longest_railway,
+  determine_points_from_longest_road,
+  determine_points_from_networks,
+  determine_score_upper_bound,
+  evaluate_board_position,
+)
+from Services.Board.Storage.board_codec import decode_board, encode_board
+from Services.Pieces.piece_service import get_basic_pieces_for_dice, get_piece_by_id, get_piece_by_name
+
+FORMAT_VERSION = 1
+
+BOARD_CASES: Dict[str, Callable[[Board], Any]] = {
+  "evaluate_board_position": evaluate_board_position,
+  "determine_points_from_central_squares": lambda board: determine_points_from_central_squares(board.grid),
+  "determine_points_from_networks": determine_points_from_networks,
+  "determine_points_from_longest_road": determine_points_from_longest_road,
+  "determine_points_from_longest_railway": determine_points_from_longest_railway,
+  "determine_deductions_for_unconnected_pieces": determine_deductions_for_unconnected_pieces,
+  "determine_score_upper_bound": lambda board: determine_score_upper_bound(board, 1),
+  "board_to_json": lambda board: board.to_json(None),
+  "encode_board": encode_board,
+}
+
+
+def time_case(function: Callable[[], Any], calls: int, repeat: int) -> Dict[str, float]:
+  '''
+  Runs the function calls times per repetition, after one call to warm up, and returns the minimum and median time per
+  call in microseconds.
+  '''
+  function()
+  samples: List[float] = []
+  for _ in range(repeat):
+    start = time.perf_counter()
+    for _ in range(calls):
+      function()
+    samples.append((time.perf_counter() - start) / calls * 1e6)
+
+  samples.sort()
+  return {"min_us": samples[0], "median_us": samples[len(samples) // 2], "calls": calls, "repeat": repeat}
+
+def run_suite(seed: int = 0, count: int = 20, repeat: int = 5) -> Dict[str, Any]:
+  '''
+  Runs all cases and returns the result document.
+  '''
+  boards = create_benchmark_boards(seed, count)
+  results: Dict[str, Dict[str, float]] = {}
+
+  for level, level_boards in boards.items():
+    for name, case in BOARD_CASES.items():
+      results[f"{name}[{level}]"] = _time_boards(case, level_boards, repeat)
+
+    serialized = [board.to_json(None) for board in level_boards]
+    results[f"board_from_json[{level}]"] = _time_boards(Board.from_json, serialized, repeat)
+    results[f"decode_board[{level}]"] = _time_boards(decode_board, [encode_board(board) for board in level_boards], repeat)
+
+  results["get_piece_by_name"] = time_case(lambda: get_piece_by_name("curved_road_south_west"), 10000, repeat)
+  results["get_piece_by_id"] = time_case(lambda: get_piece_by_id(17), 10000, repeat)
+  results["get_basic_pieces_for_dice"] = time_case(lambda: get_basic_pieces_for_dice(BasicDice.road_t_junction), 10000, repeat)
+
+  return {
+    "version": FORMAT_VERSION,
+    "meta": {"python": platform.python_version(), "platform": platform.platform(), "seed": seed, "count": count},
+    "results": results,
+  }
+
+def compare_results(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[Tuple[str, float, float]]:
+  '''
+  Returns the (case, baseline, current) minimum times of all cases, which are more than threshold (e.g. 0.1 = 10 %)
+  slower than in the baseline. Cases missing in either result are ignored.
+  '''
+  regressions: List[Tuple[str, float, float]] = []
+  for name, result in current["results"].items():
+    previous = baseline["results"].get(name)
+    if previous is not None and result["min_us"] > previous["min_us"] * (1 + threshold):
+      regressions.append((name, previous["min_us"], result["min_us"]))
+
+  return regressions
+
+def _time_boards(case: Callable[[Any], Any], inputs: List[Any], repeat: int) -> Dict[str, float]:
+  iterator = iter(())
+
+  def call() -> None:
+    nonlocal iterator
+    value = next(iterator, None)
+    if value is None:
+      iterator = iter(inputs)
+      value = next(iterator)
+    case(value)
+
+  return time_case(call, len(inputs), repeat)
+
+def main(arguments: List[str]) -> int:
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument("--output", help="file to write the JSON result to, printed if omitted")
+  parser.add_argument("--baseline", help="saved JSON result to compare with")
+  parser.add_argument("--threshold", type=float, default=0.1, help="allowed slowdown against the baseline (default 0.1)")
+  parser.add_argument("--seed", type=int, default=0)
+  parser.add_argument("--count", type=int, default=20, help="boards per fill level (default 20)")
+  parser.add_argument("--repeat", type=int, default=5)
+  options = parser.parse_args(arguments)
+
+  result = run_suite(options.seed, options.count, options.repeat)
+  document = json.dumps(result, indent=2)
+  if options.output:
+    with open(options.output, "w") as file:
+      file.write(document)
+  else:
+    print(document)
+
+  if options.baseline:
+    with open(options.baseline) as file:
+      regressions = compare_results(result, json.load(file), options.threshold)
+
+    for name, previous, current in regressions:
+      print(f"REGRESSION {name}: {previous:.1f}us -> {current:.1f}us ({current / previous - 1:+.0%})", file=sys.stderr)
+    if regressions:
+      return 1
+    print(f"no regressions against {options.baseline}", file=sys.stderr)
+
+  return 0
+
+
+if __name__ == "__main__":
+  sys.exit(main(sys.argv[1:]))
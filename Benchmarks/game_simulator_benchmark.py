@@ -0,0 +1,31 @@
+'''
+Measures how many complete random games per second the simulator plays, with and without scoring them in bulk.
+
+Run from the repository root via
+  python -m Benchmarks.game_simulator_benchmark [games]
+'''
+import sys
+import time
+import numpy as np
+from Services.Board.Evaluation.batch_evaluation_service import evaluate_boards_batch
+from Services.Game.game_simulator import play_random_game
+
+
+def main() -> None:
+  games = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+  play_random_game(0)
+
+  start = time.perf_counter()
+  boards = [play_random_game(seed) for seed in range(games)]
+  simulated = time.perf_counter() - start
+
+  start = time.perf_counter()
+  scores = evaluate_boards_batch(np.frombuffer(b"".join(boards), dtype=np.uint8).reshape(games, 7, 7))
+  scored = time.perf_counter() - start
+
+  print(f"simulation: {games / simulated:.0f} games/s")
+  print(f"simulation and batch scoring: {games / (simulated + scored):.0f} games/s, mean score {scores.mean():.2f}")
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,107 @@
+'''
+Compares the longest path engine with the exhaustive search it replaced on dense boards.
+
+Run from the repository root via
+  python -m Benchmarks.longest_path_benchmark
+'''
+import random
+import time
+from typing import Callable, List, Set, Tuple
+from Benchmarks.board_generators import create_dense_road_board, create_four_road_board
+from Models.board import Board
+from Models.enums import SquareConnectorType
+from Models.square import Square
+from Services.Board.Evaluation.longest_path_engine import find_longest_path
+
+
+def exhaustive_longest_path(board: Board, connector: SquareConnectorType) -> int:
+  '''
+  The exhaustive search, which determine_points_from_longest_road and determine_points_from_longest_railway used
+  before the longest path engine. Starts a depth first search copying the visited states from every occupied square.
+  '''
+  longest = 0
+  for square in board.get_squares_with_pieces():
+    assert square.piece is not None
+
+    if connector not in (square.piece.north, square.piece.east, square.piece.south, square.piece.west):
+      continue
+
+    longest = max(longest, _find_longest_path_from_node(square, "", set(), board, connector))
+
+  return longest
+
+def _find_longest_path_from_node(node: Square, incoming_orientation: str, visited: Set[Tuple[Square, str]], board: Board, connector: SquareConnectorType) -> int:
+  if (node, incoming_orientation) in visited:
+    return 0
+
+  visited = visited.copy()
+  visited.add((node, incoming_orientation))
+
+  best = 1
+  for neighbor, orientation in _get_neighbors(node, board, incoming_orientation, connector):
+    length = 1 + _find_longest_path_from_node(neighbor, orientation, visited, board, connector)
+    if length > best:
+      best = length
+
+  return best
+
+def _get_neighbors(node: Square, board: Board, incoming_orientation: str, connector: SquareConnectorType) -> Set[Tuple[Square, str]]:
+  piece = node.piece
+  assert piece is not None
+  neighbors: Set[Tuple[Square, str]] = set()
+
+  if piece.north == connector and node.y > 0 and incoming_orientation != "south":
+    adjacent = board.grid[node.x][node.y - 1]
+    if adjacent.piece and adjacent.piece.south == connector:
+      neighbors.add((adjacent, "north"))
+
+  if piece.east == connector and node.x < 6 and incoming_orientation != "west":
+    adjacent = board.grid[node.x + 1][node.y]
+    if adjacent.piece and adjacent.piece.west == connector:
+      neighbors.add((adjacent, "east"))
+
+  if piece.south == connector and node.y < 6 and incoming_orientation != "north":
+    adjacent = board.grid[node.x][node.y + 1]
+    if adjacent.piece and adjacent.piece.north == connector:
+      neighbors.add((adjacent, "south"))
+
+  if piece.west == connector and node.x > 0 and incoming_orientation != "east":
+    adjacent = board.grid[node.x - 1][node.y]
+    if adjacent.piece and adjacent.piece.east == connector:
+      neighbors.add((adjacent, "west"))
+
+  return neighbors
+
+def _time(function: Callable[[], int]) -> Tuple[int, float]:
+  start = time.perf_counter()
+  result = function()
+  return result, time.perf_counter() - start
+
+def main() -> None:
+  rng = random.Random(0)
+  road = SquareConnectorType.road
+  boards: List[Tuple[str, Board]] = [(f"four road {width}x{height}", create_four_road_board(width, height)) for width, height in ((2, 3), (3, 3), (3, 4))]
+  for width, height in ((4, 4), (4, 5)):
+    boards.extend((f"junctions {width}x{height}", create_dense_road_board(rng, width, height)) for _ in range(3))
+
+  rows: List[Tuple[str, int, float, float]] = []
+  for name, board in boards:
+    expected, exhaustive_seconds = _time(lambda: exhaustive_longest_path(board, road))
+    result, engine_seconds = _time(lambda: find_longest_path(board.cells, road.value))
+    assert result == expected, (name, result, expected)
+    rows.append((name, result, exhaustive_seconds, engine_seconds))
+
+  print(f"{'board':>18} {'longest':>7} {'exhaustive [s]':>14} {'engine [s]':>10} {'speedup':>9}")
+  for name, longest, exhaustive_seconds, engine_seconds in rows:
+    print(f"{name:>18} {longest:>7} {exhaustive_seconds:>14.4f} {engine_seconds:>10.4f} {exhaustive_seconds / engine_seconds:>9.1f}")
+
+  worst = max(rows, key=lambda row: row[2])
+  print(f"worst case: {worst[2]:.3f}s exhaustive vs {worst[3]:.4f}s engine, {worst[2] / worst[3]:.0f}x faster")
+
+  # Larger junction blocks are out of reach for the exhaustive search, only the engine is timed.
+  seconds = [_time(lambda: find_longest_path(create_dense_road_board(rng, 6, 6).cells, road.value))[1] for _ in range(10)]
+  print(f"junctions 6x6 engine only: mean {sum(seconds) / len(seconds):.3f}s, max {max(seconds):.3f}s")
+
+
+if __name__ == "__main__":
+  main()
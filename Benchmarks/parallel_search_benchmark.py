@@ -0,0 +1,41 @@
+'''
+Measures the rollout throughput of the root and leaf parallel search for a growing number of worker processes.
+
+Run from the repository root via
+  python -m Benchmarks.parallel_search_benchmark [budget]
+'''
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from Models.board import Board
+from Models.enums import BasicDice, SpecialDice
+from Services.Search.parallel_search import leaf_parallel_search, root_parallel_search
+
+ROLL = [BasicDice.straight_rail, BasicDice.curved_road, BasicDice.road_t_junction, SpecialDice.underground]
+REMAINING_ROUNDS = 6
+
+
+def main() -> None:
+  budget = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+  cores = os.cpu_count() or 1
+  worker_counts = sorted({1, 2, 4, 8, cores} & set(range(1, cores + 1)))
+
+  print(f"{'mode':>6} {'workers':>7} {'rollouts/s':>10} {'scaling':>8}")
+  for mode, search in (("root", root_parallel_search), ("leaf", leaf_parallel_search)):
+    single = 0.0
+    for workers in worker_counts:
+      with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Warm up the worker processes, so the start up time is not measured.
+        search(Board(), ROLL, workers, workers, REMAINING_ROUNDS, seed=0, executor=executor)
+
+        start = time.perf_counter()
+        search(Board(), ROLL, budget, workers, REMAINING_ROUNDS, seed=0, executor=executor)
+        throughput = budget / (time.perf_counter() - start)
+
+      single = single or throughput
+      print(f"{mode:>6} {workers:>7} {throughput:>10.1f} {throughput / single:>7.2f}x")
+
+
+if __name__ == "__main__":
+  main()
@@ -1,10 +1,165 @@
 from __future__ import annotations #
 from Models.enums import SquareConnectorType
+from Models.piece import Piece
 from Models.square import Square
-from typing import List, Set
+from typing import List, Set, Tuple
 import json
+import random
 
-from Services.Pieces.piece_service import get_piece_by_name
+from Services.Pieces.piece_registry import get_piece_registry
+from Services.Pieces.piece_service import get_piece_by_id, get_piece_by_name, get_piece_id
+
+BOARD_SIZE = 7
+CELL_COUNT = BOARD_SIZE * BOARD_SIZE
+EMPTY = 0
+
+NORTH, EAST, SOUTH, WEST = 0, 1, 2, 3
+DIRECTIONS: Tuple[str, ...] = ("north", "east", "south", "west")
+OPPOSITE: Tuple[int, ...] = (SOUTH, WEST, NORTH, EAST)
+
+# Random 64 bit keys for every (cell, piece id), see Board.zobrist_hash. Piece ids are below 64, empty cells have key 0.
+# The keys are generated from a fixed seed, so hashes are stable across processes and runs.
+MAX_PIECE_ID = 63
+_zobrist_random = random.Random(0x5EED)
+ZOBRIST_KEYS: Tuple[Tuple[int, ...], ...] = tuple(
+  (0,) + tuple(_zobrist_random.getrandbits(64) for _ in range(MAX_PIECE_ID)) for _ in range(CELL_COUNT)
+)
+
+
+def cell_index(x: int, y: int) -> int:
+  '''
+  Returns the index of the cell (x, y) in the flat cell array. Cells are stored column by column, i.e. index = x * 7 + y,
+  which matches the grid[x][y] access of Board.grid. Raises a ValueError for coordinates off the board, which would
+  otherwise address another cell.
+  '''
+  if not (0 <= x < BOARD_SIZE and 0 <= y < BOARD_SIZE):
+    raise ValueError(f"Square ({x}, {y}) is not on the board")
+
+  return x * BOARD_SIZE + y
+
+def cell_coordinates(index: int) -> Tuple[int, int]:
+  '''
+  Returns the (x, y) coordinates of a cell index.
+  '''
+  return divmod(index, BOARD_SIZE)
+
+def _determine_north_connector(x: int, y: int) -> SquareConnectorType:
+  '''
+  Determines the connector type for the north side of a Square.
+  '''
+
+  if (x == 1 or x == 5) and y == 0:
+    return SquareConnectorType.road
+
+  if x == 3 and y == 0:
+    return SquareConnectorType.railway
+
+  return SquareConnectorType.none
+
+def _determine_east_connector(x: int, y: int) -> SquareConnectorType:
+  '''
+  Determines the connector type for the east side of a Square.
+  '''
+
+  if x == 6 and (y == 1 or y == 5):
+    return SquareConnectorType.railway
+
+  if x == 6 and y == 3:
+    return SquareConnectorType.road
+
+  return SquareConnectorType.none
+
+def _determine_south_connector(x: int, y: int) -> SquareConnectorType:
+  '''
+  Determines the connector type for the south side of a Square.
+  '''
+
+  if (x == 1 or x == 5) and y == 6:
+    return SquareConnectorType.road
+
+  if x == 3 and y == 6:
+    return SquareConnectorType.railway
+
+  return SquareConnectorType.none
+
+def _determine_west_connector(x: int, y:int) -> SquareConnectorType:
+  '''
+  Determines the connector type for the west side of a Square.
+  '''
+
+  if x == 0 and (y == 1 or y == 5):
+    return SquareConnectorType.railway
+
+  if x == 0 and y == 3:
+    return SquareConnectorType.road
+
+  return SquareConnectorType.none
+
+def _determine_neighbour(x: int, y: int, direction: int) -> int:
+  '''
+  Returns the cell index of the neighbour in the passed direction or -1, if the side faces the board edge.
+  '''
+  if direction == NORTH:
+    return cell_index(x, y - 1) if y > 0 else -1
+  if direction == EAST:
+    return cell_index(x + 1, y) if x < 6 else -1
+  if direction == SOUTH:
+    return cell_index(x, y + 1) if y < 6 else -1
+  return cell_index(x - 1, y) if x > 0 else -1
+
+# Precomputed per-cell tables, indexed by cell index. EXIT_CONNECTOR_TYPES holds the fixed (north, east, south, west)
+# connectors of the board edge, EXIT_CONNECTORS the same as plain ints (SquareConnectorType values).
+EXIT_CONNECTOR_TYPES: Tuple[Tuple[SquareConnectorType, ...], ...] = tuple(
+  (
+    _determine_north_connector(x, y),
+    _determine_east_connector(x, y),
+    _determine_south_connector(x, y),
+    _determine_west_connector(x, y),
+  )
+  for x in range(BOARD_SIZE) for y in range(BOARD_SIZE)
+)
+EXIT_CONNECTORS: Tuple[Tuple[int, ...], ...] = tuple(
+  tuple(connector.value for connector in connectors) for connectors in EXIT_CONNECTOR_TYPES
+)
+EXIT_CELLS: Tuple[int, ...] = tuple(index for index in range(CELL_COUNT) if any(EXIT_CONNECTORS[index]))
+# The side of every exit cell facing the board edge (-1 for other cells) and the bit representing the exit in exit masks.
+EXIT_SIDES: Tuple[int, ...] = tuple(
+  EXIT_CONNECTORS[index].index(max(EXIT_CONNECTORS[index])) if index in EXIT_CELLS else -1 for index in range(CELL_COUNT)
+)
+EXIT_BITS: Tuple[int, ...] = tuple(1 << EXIT_CELLS.index(index) if index in EXIT_CELLS else 0 for index in range(CELL_COUNT))
+CENTRAL_CELLS: Tuple[int, ...] = tuple(cell_index(x, y) for x in range(2, 5) for y in range(2, 5))
+NEIGHBOURS: Tuple[Tuple[int, ...], ...] = tuple(
+  tuple(_determine_neighbour(x, y, direction) for direction in range(4))
+  for x in range(BOARD_SIZE) for y in range(BOARD_SIZE)
+)
+
+
+def get_facing_connectors(cells: bytearray, index: int) -> Tuple[int, int, int, int]:
+  '''
+  Returns the connectors (SquareConnectorType values), which face the cell from its north, east, south and west
+  neighbours. Sides on the board edge are faced by the exits, i.e. by none for all but the exit cells.
+  '''
+  connectors = get_piece_registry().connectors_by_id
+  neighbours = NEIGHBOURS[index]
+  exits = EXIT_CONNECTORS[index]
+
+  return tuple( # type: ignore
+    exits[side] if neighbours[side] == -1 else connectors[cells[neighbours[side]]][OPPOSITE[side]]
+    for side in range(4)
+  )
+
+
+class BoardEvaluator:
+  '''
+  Base of the evaluators, which can be attached to a board (see Board.attach_evaluator) to follow its changes.
+  before_change is called before the cell changes, after_change afterwards with the id the cell held before.
+  '''
+
+  def before_change(self, index: int) -> None:
+    pass
+
+  def after_change(self, index: int, previous_id: int) -> None:
+    pass
 
 
 class Board:
@@ -15,16 +170,92 @@ class Board:
   - Uses (column, row) indexing where (0,0) is TOP-LEFT corner
   - column (x): 0 = left edge, 6 = right edge
   - row (y): 0 = top edge, 6 = bottom edge
-  - Access via: grid[row][column] or grid[y][x]
+  - Access via: grid[x][y]
+
+  STORAGE:
+  - The pieces are stored in a flat bytearray of 49 piece ids (0 = empty), see cell_index.
+  - The Squares of grid are thin views onto that array and are only created when grid is accessed.
+  - The frontier holds the empty cells facing at least one connector, see frontier.
+  - The Zobrist hash of the pieces is kept up to date with every placement, so boards reached by different placement
+    orders have the same hash. Boards are equal, if their pieces are equal. As boards are mutable, they are not
+    hashable, key sets and dicts by zobrist_hash or to_bytes instead.
+
+  MAKE / UNMAKE:
+  - place records the placement on an undo stack, undo takes back the latest one. A search can therefore explore
+    placements on a single board instead of copying it per move.
+  - Every change, by set_piece, place or undo, keeps the occupied cells, the frontier and the hash up to date and is
+    reported to the attached evaluator (see attach_evaluator).
   '''
-  squares: Set[Square] | None = None
   
   def __init__(self):
-    self._grid = self._create_grid()
+    self._cells = bytearray(CELL_COUNT)
+    self._frontier: Set[int] = set(EXIT_CELLS)
+    self._occupied: Set[int] = set()
+    self._hash = 0
+    self._undo_stack: List[int] = []
+    self._evaluator: BoardEvaluator | None = None
+    self._grid: List[List[Square]] | None = None
+    self.squares: Set[Square] | None = None
     
   @property
   def grid(self) -> List[List[Square]]:
+    if self._grid is None:
+      self._grid = self._create_grid()
+
     return self._grid 
+
+  @property
+  def cells(self) -> bytearray:
+    '''
+    The flat array of piece ids. Should be treated as read-only, use set_piece to place pieces.
+    '''
+    return self._cells
+
+  @property
+  def frontier(self) -> Set[int]:
+    '''
+    The indices of the empty cells, which face a connector of a neighbouring piece or an exit. Only these cells can
+    take a legal placement. Kept up to date by set_piece and should be treated as read-only.
+    '''
+    return self._frontier
+
+  @property
+  def occupied(self) -> Set[int]:
+    '''
+    The indices of the cells holding a piece. Kept up to date by set_piece and should be treated as read-only.
+    '''
+    return self._occupied
+
+  @property
+  def undo_depth(self) -> int:
+    '''
+    The number of placements, which can be taken back by undo.
+    '''
+    return len(self._undo_stack)
+
+  @property
+  def placement_history(self) -> Tuple[int, ...]:
+    '''
+    The cell indices of the placements, which can be taken back by undo, the oldest first.
+    '''
+    return tuple(self._undo_stack)
+
+  @property
+  def evaluator(self) -> BoardEvaluator | None:
+    return self._evaluator
+
+  @property
+  def zobrist_hash(self) -> int:
+    '''
+    The XOR of the Zobrist keys (see ZOBRIST_KEYS) of all placed pieces.
+    '''
+    return self._hash
+
+  def __eq__(self, other: object) -> bool:
+    if not isinstance(other, Board):
+      return NotImplemented
+
+    return self._hash == other._hash and self._cells == other._cells
  
   def _create_grid(self) -> List[List[Square]]:
     '''
@@ -35,70 +266,155 @@ class Board:
       row: List[Square] = []
       
       for y in range(7):
+        connectors = EXIT_CONNECTOR_TYPES[cell_index(x, y)]
         row.append(Square(
           x = x,
           y = y,
-          north = self.__determine_north_connector(x, y),
-          east = self.__determine_east_connector(x, y),
-          south = self.__determine_south_connector(x, y),
-          west = self.__determine_west_connector(x, y)
+          north = connectors[NORTH],
+          east = connectors[EAST],
+          south = connectors[SOUTH],
+          west = connectors[WEST],
+          board = self
         ))
       
       rows.append(row)
     
     return rows
       
-  def __determine_north_connector(self, x: int, y: int) -> SquareConnectorType:
+  def copy(self) -> Board:
     '''
-    Determines the connector type for the north side of a Square.
+    Returns an independent copy of the board. Only the cell array is copied, the Square views are created lazily.
+    The copy starts with an empty undo stack and without evaluator.
     '''
+    board = Board.__new__(Board)
+    board._cells = self._cells[:]
+    board._frontier = set(self._frontier)
+    board._occupied = set(self._occupied)
+    board._hash = self._hash
+    board._undo_stack = []
+    board._evaluator = None
+    board._grid = None
+    board.squares = None
     
-    if (x == 1 or x == 5) and y == 0:
-      return SquareConnectorType.road
+    return board
       
-    if x == 3 and y == 0:
-      return SquareConnectorType.railway
+  def to_bytes(self) -> bytes:
+    '''
+    Returns the board as 49 bytes of piece ids, e.g. to pass it to another process.
+    '''
+    return bytes(self._cells)
     
-    return SquareConnectorType.none 
+  @classmethod
+  def from_bytes(cls, data: bytes) -> Board:
+    '''
+    Creates a board from the bytes returned by to_bytes. Fails with a ValueError, if a cell holds an id, which
+    belongs to no piece.
+    '''
+    if len(data) != CELL_COUNT:
+      raise ValueError(f"A board consists of {CELL_COUNT} cells, got {len(data)}")
+    piece_count = len(get_piece_registry())
+    invalid = [piece_id for piece_id in data if piece_id > piece_count]
+    if invalid:
+      raise ValueError(f"Piece ids {invalid} do not exist")
   
-  def __determine_east_connector(self, x: int, y: int) -> SquareConnectorType:
+    board = Board()
+    board._cells[:] = data
+    for index in range(CELL_COUNT):
+      board._update_frontier(index)
+      board._hash ^= ZOBRIST_KEYS[index][data[index]]
+      if data[index] != EMPTY:
+        board._occupied.add(index)
+
+    return board
+
+  def get_piece_id(self, x: int, y: int) -> int:
     '''
-    Determines the connector type for the east side of a Square.
+    Returns the id of the piece placed on (x, y) or 0, if the square is empty.
     '''
+    return self._cells[cell_index(x, y)]
     
-    if x == 6 and (y == 1 or y == 5):
-      return SquareConnectorType.railway
+  def get_piece(self, x: int, y: int) -> Piece | None:
+    '''
+    Returns the piece placed on (x, y) or None, if the square is empty.
+    '''
+    return get_piece_by_id(self._cells[cell_index(x, y)])
       
-    if x == 6 and y == 3:
-      return SquareConnectorType.road
+  def set_piece(self, x: int, y: int, piece: Piece | None) -> None:
+    '''
+    Places the piece on (x, y). Passing None clears the square. The change is not recorded for undo.
+    '''
+    self._set_cell(cell_index(x, y), EMPTY if piece is None else get_piece_id(piece))
     
-    return SquareConnectorType.none
+  def place(self, x: int, y: int, piece: Piece) -> None:
+    '''
+    Places the piece on the empty square (x, y), so that undo can take it back.
+    '''
+    self.place_id(cell_index(x, y), get_piece_id(piece))
   
-  def __determine_south_connector(self, x: int, y: int) -> SquareConnectorType:
+  def place_id(self, index: int, piece_id: int) -> None:
     '''
-    Determines the connector type for the south side of a Square.
+    Places the piece with the id on the empty cell, so that undo can take it back. Allocates nothing, so it may be
+    used for every move of a search.
     '''
+    if self._cells[index] != EMPTY:
+      raise ValueError(f"Square {cell_coordinates(index)} is already occupied")
     
-    if (x == 1 or x == 5) and y == 6:
-      return SquareConnectorType.road
+    self._set_cell(index, piece_id)
+    self._undo_stack.append(index)
       
-    if x == 3 and y == 6:
-      return SquareConnectorType.railway
+  def undo(self) -> int:
+    '''
+    Takes back the latest placement of place or place_id and returns the index of its cell.
+    '''
+    if not self._undo_stack:
+      raise ValueError("No placement to undo")
     
-    return SquareConnectorType.none
+    index = self._undo_stack.pop()
+    self._set_cell(index, EMPTY)
   
-  def __determine_west_connector(self, x: int, y:int) -> SquareConnectorType:
+    return index
+
+  def undo_to(self, depth: int) -> None:
     '''
-    Determines the connector type for the west side of a Square.
+    Takes back placements, until only depth of them remain, e.g. the depth before a search descended.
     '''
+    while len(self._undo_stack) > depth:
+      self.undo()
     
-    if x == 0 and (y == 1 or y == 5):
-      return SquareConnectorType.railway
+  def attach_evaluator(self, evaluator: BoardEvaluator | None) -> None:
+    '''
+    Reports all following changes of the board to the evaluator, e.g. an IncrementalEvaluator, which keeps its score
+    up to date with them. None detaches the current evaluator.
+    '''
+    self._evaluator = evaluator
       
-    if x == 0 and y == 3:
-      return SquareConnectorType.road
+  def _set_cell(self, index: int, piece_id: int) -> None:
+    previous_id = self._cells[index]
+    evaluator = self._evaluator
+    if evaluator is not None:
+      evaluator.before_change(index)
     
-    return SquareConnectorType.none
+    keys = ZOBRIST_KEYS[index]
+    self._hash ^= keys[previous_id] ^ keys[piece_id]
+    self._cells[index] = piece_id
+    if piece_id == EMPTY:
+      self._occupied.discard(index)
+    else:
+      self._occupied.add(index)
+
+    self._update_frontier(index)
+    for neighbour in NEIGHBOURS[index]:
+      if neighbour != -1:
+        self._update_frontier(neighbour)
+
+    if evaluator is not None:
+      evaluator.after_change(index, previous_id)
+
+  def _update_frontier(self, index: int) -> None:
+    if self._cells[index] == EMPTY and any(get_facing_connectors(self._cells, index)):
+      self._frontier.add(index)
+    else:
+      self._frontier.discard(index)
   
   def get_exit_nodes(self) -> Set[Square]:
     '''
@@ -127,7 +443,7 @@ class Board:
 
     self.squares = set()
     
-    for row in self._grid:
+    for row in self.grid:
       for square in row:
         self.squares.add(square)
         
@@ -137,18 +453,19 @@ class Board:
     '''
     Returns all squares of the board that have pieces placed on them.
     '''
-    all_squares: Set[Square] = self.get_all_squares()
-    occupied_squares = {square for square in all_squares if square.piece is not None}
+    grid = self.grid
+    occupied_squares = {grid[index // BOARD_SIZE][index % BOARD_SIZE] for index in self._occupied}
     
     return occupied_squares
     
-  def to_json(self) -> None:
+  def to_json(self, path: str | None = "board.json") -> str:
     '''
-    Exports the board grid to a JSON string.
+    Exports the board grid to a JSON string, which is written to path, unless it is None, and returned. See
+    Services.Board.Storage for compact binary encodings.
     '''
     grid_data = []
     
-    for row in self._grid:
+    for row in self.grid:
       row_data = []
       
       for square in row:
@@ -166,8 +483,11 @@ class Board:
     
     data = json.dumps(grid_data, indent=2)
     
-    with open("board.json", 'w') as file:
-      file.write(data)
+    if path is not None:
+      with open(path, 'w') as file:
+        file.write(data)
+
+    return data
       
   @classmethod
   def from_json(cls, json_data: str) -> Board:
@@ -183,13 +503,11 @@ class Board:
     data = json.loads(json_data)
     
     board = Board()
-    grid = board.grid
     
     for row in data:
       for col in row:
-        square: Square = grid[col['x']][col['y']] # type: ignore
         if col['piece'] is not None:
-          square.piece = get_piece_by_name(col['piece'])
+          board.set_piece(col['x'], col['y'], get_piece_by_name(col['piece']))
     
     return board
     
\ No newline at end of file
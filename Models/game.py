@@ -1,3 +1,132 @@
+from __future__ import annotations
+from random import Random
+from typing import List, Sequence
+from Models.board import Board, cell_coordinates
+from Models.enums import UniqueTiles
+from Services.Board.Evaluation.board_evaluation_service import evaluate_board_position
+from Services.Dice.dice_service import roll_dice
+from Services.Moves.move_generator import Placement, generate_placements, generate_round_placements
+from Services.Pieces.piece_registry import Dice, get_piece_registry
+
+ROUNDS = 7
+MAX_UNIQUE_TILES = 3
+
+
 class Game:
-  def __init__(self):
-    pass
\ No newline at end of file
+  '''
+  A game of Railroad Ink: 7 rounds, in each of which the three route dice and the special dice are rolled.
+
+  RULES:
+  - Every rolled dice has to be placed, as long as one of its pieces can be placed legally (see generate_placements).
+  - Additionally, at most one unique tile may be placed per round, at most 3 per game, and every unique tile once.
+
+  The used unique tiles are kept as a bitmask over the UniqueTiles values.
+  '''
+
+  def __init__(self, seed: int | None = None, board: Board | None = None):
+    self.board = board if board is not None else Board()
+    self.rng = Random(seed)
+    self.round = 0
+    self.dice: List[Dice] = []
+    self.used_unique_tiles = 0
+    self.unique_tile_count = 0
+    self._in_round = False
+    self._unique_tile_this_round = False
+
+  @property
+  def is_finished(self) -> bool:
+    return self.round == ROUNDS and not self._in_round
+
+  @property
+  def in_round(self) -> bool:
+    return self._in_round
+
+  @property
+  def unique_tile_placed(self) -> bool:
+    '''
+    Whether a unique tile has been placed in the current round.
+    '''
+    return self._unique_tile_this_round
+
+  def roll(self, dice: Sequence[Dice] | None = None) -> List[Dice]:
+    '''
+    Starts the next round with the passed dice or, if none are passed, with freshly rolled dice.
+    '''
+    if self._in_round:
+      raise ValueError(f"Round {self.round} has not been ended")
+    if self.round == ROUNDS:
+      raise ValueError("The game is finished")
+
+    self.round += 1
+    self.dice = list(dice) if dice is not None else roll_dice(self.rng)
+    self._in_round = True
+    self._unique_tile_this_round = False
+
+    return list(self.dice)
+
+  def can_place_unique_tile(self, tile: UniqueTiles) -> bool:
+    '''
+    Returns, whether the unique tile may still be placed in the current round.
+    '''
+    return (
+      self._in_round
+      and not self._unique_tile_this_round
+      and self.unique_tile_count < MAX_UNIQUE_TILES
+      and not self.used_unique_tiles & 1 << tile.value
+    )
+
+  def get_legal_placements(self) -> List[Placement]:
+    '''
+    Returns all legal placements of the remaining dice and of the unique tiles, which may still be placed.
+    '''
+    if not self._in_round:
+      return []
+
+    placements = generate_round_placements(self.board, self.dice)
+    for tile in UniqueTiles:
+      if self.can_place_unique_tile(tile):
+        placements.extend(generate_placements(self.board, tile))
+
+    return placements
+
+  def place(self, placement: Placement) -> None:
+    '''
+    Makes the placement, which has to be one of get_legal_placements.
+    '''
+    index, piece_id = placement
+    piece = get_piece_registry().get_by_id(piece_id)
+    if piece is None:
+      raise ValueError(f"Piece id {piece_id} does not exist")
+
+    dice = piece.dice
+    if isinstance(dice, UniqueTiles):
+      if not self.can_place_unique_tile(dice):
+        raise ValueError(f"Unique tile {dice.name} may not be placed")
+    elif dice not in self.dice:
+      raise ValueError(f"No remaining dice shows {dice.name}")
+
+    if placement not in generate_placements(self.board, dice):
+      raise ValueError(f"Piece {piece.name} may not be placed on {cell_coordinates(index)}")
+
+    self.board.set_piece(*cell_coordinates(index), piece)
+    if isinstance(dice, UniqueTiles):
+      self.used_unique_tiles |= 1 << dice.value
+      self.unique_tile_count += 1
+      self._unique_tile_this_round = True
+    else:
+      self.dice.remove(dice)
+
+  def end_round(self) -> None:
+    '''
+    Ends the current round. Fails, if one of the remaining dice can still be placed.
+    '''
+    if not self._in_round:
+      raise ValueError("No round has been started")
+    if generate_round_placements(self.board, self.dice):
+      raise ValueError(f"Dice {[dice.name for dice in self.dice]} can still be placed")
+
+    self.dice = []
+    self._in_round = False
+
+  def score(self) -> int:
+    return evaluate_board_position(self.board)
@@ -1,3 +1,4 @@
+from typing import Tuple
 from Models.enums import BasicDice, SpecialDice, SquareConnectorType, UniqueTiles
 
 
@@ -15,7 +16,15 @@ class Piece:
     south: Which connector the piece has to the west
     
     has_train_station: Indicates, whether the piece has a train station, where transfer from rail to road is possible.
+
+    id: The small integer id assigned by the piece registry. 0 for pieces which are not part of the registry.
+
+    connectors: The (north, east, south, west) connectors as plain ints, i.e. the SquareConnectorType values.
+
+  Pieces are shared between all boards and must not be modified.
   '''
+  __slots__ = ("_name", "_dice", "_north", "_east", "_south", "_west", "_has_train_station", "_id", "_connectors")
+
   def __init__(
     self,
     name: str,
@@ -25,6 +34,7 @@ class Piece:
     east: SquareConnectorType,
     south: SquareConnectorType,
     west: SquareConnectorType,
+    id: int = 0,
   ):
     self._name = name
     self._dice = dice
@@ -33,6 +43,8 @@ class Piece:
     self._south = south
     self._west = west
     self._has_train_station = has_rail_station
+    self._id = id
+    self._connectors = (north.value, east.value, south.value, west.value)
   
   @property
   def name(self) -> str:
@@ -46,6 +58,18 @@ class Piece:
   def has_train_station(self) -> bool:
     return self._has_train_station
 
+  @property
+  def id(self) -> int:
+    return self._id
+
+  @property
+  def connectors(self) -> Tuple[int, int, int, int]:
+    return self._connectors
+
+  @property
+  def is_underground(self) -> bool:
+    return self._dice == SpecialDice.underground
+
   @property
   def north(self) -> SquareConnectorType:
     return self._north
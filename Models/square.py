@@ -1,10 +1,15 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
 from Models.enums import SquareConnectorType
 from Models.piece import Piece
 
+if TYPE_CHECKING:
+  from Models.board import Board
+
 
 class Square:
   """
-  Represents a square on the board. 
+  Represents a square on the board. A square is a thin view onto the cell array of its Board, it does not store a piece itself.
 
   Attributes:
     x: column (0,6, left to right)
@@ -24,6 +29,8 @@ class Square:
                
     piece: indicates the current piece placed on the square. Initially, this is None.
   """
+  __slots__ = ("_x", "_y", "_north", "_east", "_south", "_west", "_board")
+
   def __init__(
     self, 
     x: int, 
@@ -32,6 +39,7 @@ class Square:
     east: SquareConnectorType,
     south: SquareConnectorType,
     west: SquareConnectorType,
+    board: Board,
   ):
     if x > 6 or x < 0 or y < 0 or y > 6:
       raise AttributeError("Values not permitted")
@@ -42,8 +50,7 @@ class Square:
     self._east = east
     self._south = south
     self._west = west
-    self._is_central = self._determine_if_central()
-    self._piece = None
+    self._board = board
 
   @property
   def x(self) -> int:
@@ -53,6 +60,10 @@ class Square:
   def y(self) -> int:
     return self._y
 
+  @property
+  def board(self) -> Board:
+    return self._board
+
   @property
   def north(self) -> SquareConnectorType:
     return self._north
@@ -71,15 +82,15 @@ class Square:
   
   @property
   def is_central(self) -> bool:
-    return self._is_central
+    return self._determine_if_central()
   
   @property
   def piece(self) -> Piece | None:
-    return self._piece
+    return self._board.get_piece(self._x, self._y)
   
   @piece.setter
-  def piece(self, piece: Piece) -> None:
-    self._piece = piece
+  def piece(self, piece: Piece | None) -> None:
+    self._board.set_piece(self._x, self._y, piece)
     
   
   def _determine_if_central(self) -> bool:
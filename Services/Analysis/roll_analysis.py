@@ -0,0 +1,262 @@
+from __future__ import annotations
+import heapq
+import time
+from itertools import islice
+from random import Random
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Sequence, Tuple
+from Models.board import Board, cell_coordinates
+from Models.enums import UniqueTiles
+from Services.Board.Evaluation.board_evaluation_service import evaluate_board_breakdown, evaluate_board_position
+from Services.Moves.move_generator import Placement
+from Services.Moves.round_generator import generate_round_moves
+from Services.Pieces.piece_registry import Dice, get_piece_registry
+from Services.Search.rollout_policies import RolloutPolicy, random_rollout
+
+if TYPE_CHECKING:
+  from concurrent.futures import Executor, Future
+
+# Scores of a candidate: the breakdown of evaluate_board_breakdown and the mean final score of its rollouts or None.
+Scores = Tuple[Dict[str, int], float | None]
+
+
+class RoundCandidate:
+  '''
+  Placements for the dice of a round, in the order they should be made, with the breakdown of the resulting board
+  (see evaluate_board_breakdown) and, with a lookahead, the mean final score of rollouts from it.
+  '''
+  __slots__ = ("placements", "breakdown", "expected")
+
+  def __init__(self, placements: List[Placement], breakdown: Dict[str, int], expected: float | None = None):
+    self.placements = placements
+    self.breakdown = breakdown
+    self.expected = expected
+
+  @property
+  def score(self) -> int:
+    return self.breakdown["score"]
+
+  @property
+  def value(self) -> float:
+    '''
+    The value candidates are ranked by: the expected final score with a lookahead, else the score.
+    '''
+    return self.expected if self.expected is not None else self.score
+
+  def to_dict(self) -> Dict[str, Any]:
+    registry = get_piece_registry()
+    placements = [
+      {"x": cell_coordinates(index)[0], "y": cell_coordinates(index)[1], "piece": registry.get_by_id(piece_id).name} # type: ignore
+      for index, piece_id in self.placements
+    ]
+    return {"placements": placements, **self.breakdown, "expected": self.expected}
+
+  def __repr__(self) -> str:
+    return f"RoundCandidate(placements={self.placements}, score={self.score}, expected={self.expected})"
+
+
+class RollAnalysis:
+  '''
+  The result of analyze_roll: the best candidates, the best first, the number of distinct candidates scored and
+  whether all of them were scored before the time limit expired.
+  '''
+  __slots__ = ("candidates", "evaluated", "complete", "elapsed")
+
+  def __init__(self, candidates: List[RoundCandidate], evaluated: int, complete: bool, elapsed: float):
+    self.candidates = candidates
+    self.evaluated = evaluated
+    self.complete = complete
+    self.elapsed = elapsed
+
+
+def analyze_roll(
+  board: Board,
+  dice: Sequence[Dice],
+  top: int = 10,
+  used_unique_tiles: int | None = None,
+  remaining_rounds: int = 0,
+  lookahead: int = 0,
+  rollout: RolloutPolicy = random_rollout,
+  seed: int | None = None,
+  workers: int = 1,
+  chunk_size: int = 64,
+  time_limit: float | None = None,
+  executor: Executor | None = None,
+) -> RollAnalysis:
+  '''
+  Returns the top placements for the dice of a round on the board, ranked by the score of the resulting board.
+
+  Every distinct resulting board is scored once, however many placement orders reach it (see generate_round_moves). If
+  used_unique_tiles is passed, the bitmask of the unique tiles used so far (see Game), a unique tile, which may still
+  be placed, is tried with the dice as well. With a lookahead, candidates are ranked by the mean final score of that
+  many rollouts over the remaining rounds instead, which may place the unique tiles left after the candidate, all of
+  them, if used_unique_tiles is not passed. All candidates share the rollout seed, so they are compared on similar
+  dice.
+
+  Candidates are scored in chunks of chunk_size by the worker processes. With a single worker and no executor, they are
+  scored in this process. Once time_limit seconds have passed, the best candidates scored so far are returned: the
+  workers stop within the rollout they are running (see score_candidates) and chunks not started yet are cancelled.
+  '''
+  start = time.perf_counter()
+  # Wall clock time, as the deadline is checked in the worker processes as well.
+  deadline = time.time() + time_limit if time_limit is not None else None
+  chunks = _Chunks(generate_round_moves(board, dice, used_unique_tiles), chunk_size, deadline)
+  task = (board.to_bytes(), used_unique_tiles or 0, remaining_rounds, lookahead, rollout, seed, deadline)
+  ranking = _Ranking(top)
+
+  if executor is None and workers <= 1:
+    for start_index, chunk in chunks:
+      _add_scores(ranking, chunks, start_index, chunk, score_candidates(*task, chunk))
+  elif executor is None:
+    from concurrent.futures import ProcessPoolExecutor
+
+    # Not a context manager, which would wait for every submitted chunk on exit.
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+      _score_parallel(pool, chunks, task, ranking, 2 * workers)
+    finally:
+      pool.shutdown(wait=False, cancel_futures=True)
+  else:
+    _score_parallel(executor, chunks, task, ranking, 2 * max(workers, 1))
+
+  return RollAnalysis(ranking.get_candidates(), ranking.count, chunks.exhausted and not chunks.expired, time.perf_counter() - start)
+
+def score_candidates(
+  cells: bytes,
+  used_unique_tiles: int,
+  remaining_rounds: int,
+  lookahead: int,
+  rollout: RolloutPolicy,
+  seed: int | None,
+  deadline: float | None,
+  candidates: List[List[Placement]],
+) -> List[Scores]:
+  '''
+  Scores a chunk of candidates on the board with the passed cells and bitmask of used unique tiles, see analyze_roll.
+  Runs in the worker processes.
+
+  Once the deadline (see time.time) has passed, the scores of the candidates scored so far are returned, so there may
+  be fewer scores than candidates. The candidate being scored then keeps the mean of its rollouts so far. The first
+  candidate gets at least one rollout, so every chunk started returns a score.
+  '''
+  registry = get_piece_registry()
+  board = Board.from_bytes(cells)
+  scores: List[Scores] = []
+  for placements in candidates:
+    if scores and deadline is not None and time.time() > deadline:
+      break
+
+    used = used_unique_tiles
+    for placement in placements:
+      board.place_id(*placement)
+      face = registry.get_by_id(placement[1]).dice # type: ignore
+      if isinstance(face, UniqueTiles):
+        used |= 1 << face.value
+
+    expected = None
+    if lookahead:
+      rng = Random(seed)
+      depth = board.undo_depth
+      total = rollouts = 0
+      while rollouts < lookahead and not (rollouts and deadline is not None and time.time() > deadline):
+        rollout(board, [], remaining_rounds, rng, used, False)
+        total += evaluate_board_position(board)
+        rollouts += 1
+        board.undo_to(depth)
+      expected = total / rollouts
+
+    scores.append((evaluate_board_breakdown(board), expected))
+    board.undo_to(0)
+
+  return scores
+
+
+class _Ranking:
+  '''
+  Keeps the top scored candidates. Ties are ranked in the order the candidates were enumerated, also if chunks are
+  added out of order.
+  '''
+
+  def __init__(self, top: int):
+    self.top = top
+    self.count = 0
+    self._heap: List[Tuple[float, int, RoundCandidate]] = []
+
+  def add(self, start_index: int, chunk: List[List[Placement]], scores: List[Scores]) -> None:
+    for index, (placements, (breakdown, expected)) in enumerate(zip(chunk, scores), start_index):
+      candidate = RoundCandidate(placements, breakdown, expected)
+      entry = (candidate.value, -index, candidate)
+      self.count += 1
+      if len(self._heap) < self.top:
+        heapq.heappush(self._heap, entry)
+      elif entry[:2] > self._heap[0][:2]:
+        heapq.heapreplace(self._heap, entry)
+
+  def get_candidates(self) -> List[RoundCandidate]:
+    return [candidate for _, _, candidate in sorted(self._heap, key=lambda entry: entry[:2], reverse=True)]
+
+
+class _Chunks:
+  '''
+  Iterates over the candidates in chunks, with the index of their first candidate, and stops early, once the
+  deadline (see time.time) has passed. expired is set as well, when a chunk is not scored completely.
+  '''
+
+  def __init__(self, candidates: Iterator[List[Placement]], size: int, deadline: float | None):
+    self._candidates = candidates
+    self._size = size
+    self.deadline = deadline
+    self.exhausted = False
+    self.expired = False
+    self._index = 0
+
+  def __iter__(self) -> Iterator[Tuple[int, List[List[Placement]]]]:
+    return self
+
+  def __next__(self) -> Tuple[int, List[List[Placement]]]:
+    if self.exhausted or self.expired:
+      raise StopIteration
+    if self.deadline is not None and time.time() > self.deadline:
+      self.expired = True
+      raise StopIteration
+
+    chunk = list(islice(self._candidates, self._size))
+    if len(chunk) < self._size:
+      self.exhausted = True
+    if not chunk:
+      raise StopIteration
+
+    self._index += len(chunk)
+    return self._index - len(chunk), chunk
+
+def _score_parallel(executor: Executor, chunks: _Chunks, task: Tuple[Any, ...], ranking: _Ranking, limit: int) -> None:
+  pending: Dict[Future[List[Scores]], Tuple[int, List[List[Placement]]]] = {}
+  for start_index, chunk in chunks:
+    pending[executor.submit(score_candidates, *task, chunk)] = (start_index, chunk)
+    while len(pending) >= limit:
+      _collect(pending, ranking, chunks)
+
+  if chunks.expired:
+    for future in pending:
+      future.cancel()
+  while pending:
+    _collect(pending, ranking, chunks)
+
+def _collect(pending: Dict[Future[List[Scores]], Tuple[int, List[List[Placement]]]], ranking: _Ranking, chunks: _Chunks) -> None:
+  '''
+  Waits for the next scored chunks and ranks them. The workers stop at the deadline, so this waits no longer than a
+  rollout past it.
+  '''
+  from concurrent.futures import FIRST_COMPLETED, wait
+
+  done, _ = wait(pending, return_when=FIRST_COMPLETED)
+  for future in done:
+    start_index, chunk = pending.pop(future)
+    if future.cancelled():
+      chunks.expired = True
+    else:
+      _add_scores(ranking, chunks, start_index, chunk, future.result())
+
+def _add_scores(ranking: _Ranking, chunks: _Chunks, start_index: int, chunk: List[List[Placement]], scores: List[Scores]) -> None:
+  ranking.add(start_index, chunk, scores)
+  if len(scores) < len(chunk):
+    chunks.expired = True
@@ -0,0 +1,185 @@
+from __future__ import annotations
+from typing import Sequence
+import numpy as np
+from Models.board import BOARD_SIZE, CELL_COUNT, CENTRAL_CELLS, EXIT_CELLS, EXIT_CONNECTORS, EXIT_SIDES, NEIGHBOURS, OPPOSITE, Board
+from Models.enums import SquareConnectorType
+from Services.Board.Evaluation.longest_path_engine import find_longest_path
+from Services.Board.Evaluation.network_engine import NETWORK_POINTS, PORT_COUNT
+from Services.Pieces.piece_registry import get_piece_registry
+
+ROAD = SquareConnectorType.road.value
+RAILWAY = SquareConnectorType.railway.value
+
+# Padding cell, which is always empty. Sides on the board edge use it as their neighbour.
+_OUTSIDE = CELL_COUNT
+
+
+def encode_boards(boards: Sequence[Board]) -> np.ndarray:
+  '''
+  Returns the piece ids of the boards as an (N, 7, 7) uint8 array, indexed like Board.grid, i.e. [board, x, y].
+  '''
+  ids = np.frombuffer(b"".join(board.to_bytes() for board in boards), dtype=np.uint8)
+  return ids.reshape(len(boards), BOARD_SIZE, BOARD_SIZE)
+
+def evaluate_boards_batch(boards: Sequence[Board] | np.ndarray) -> np.ndarray:
+  '''
+  Returns the scores of all boards as an int64 array. Boards may be passed as Boards or as piece ids, see encode_boards.
+  The scores equal those of evaluate_board_position.
+
+  Central squares, deductions and networks are computed for all boards at once. Networks are found by label
+  propagation over the ports of the boards (see NetworkUnionFind for ports). Longest routes are only searched per
+  board, if a square of the route type connects to more than two others.
+  '''
+  ids = boards if isinstance(boards, np.ndarray) else encode_boards(boards)
+  ids = ids.reshape(len(ids), CELL_COUNT)
+  tables = _get_tables()
+  connectors = tables.connectors[ids]
+
+  facing = _determine_facing(ids, tables)
+  central = np.count_nonzero(ids[:, tables.central], axis=1)
+
+  return (
+    central
+    + _determine_network_points(ids, connectors, facing, tables)
+    + _determine_longest_paths(ids, connectors, facing, ROAD, tables)
+    + _determine_longest_paths(ids, connectors, facing, RAILWAY, tables)
+    - _determine_deductions(ids, connectors, facing, tables)
+  ).astype(np.int64)
+
+def _determine_facing(ids: np.ndarray, tables: _BatchTables) -> np.ndarray:
+  '''
+  Returns the connectors facing every side of every square, (N, 49, 4), from the neighbour or, on the board edge,
+  from the exits.
+  '''
+  padded = np.concatenate((ids, np.zeros((len(ids), 1), dtype=ids.dtype)), axis=1)
+  facing = tables.connectors[padded[:, tables.neighbours], tables.opposite]
+
+  return np.where(tables.on_edge, tables.exits, facing)
+
+def _determine_deductions(ids: np.ndarray, connectors: np.ndarray, facing: np.ndarray, tables: _BatchTables) -> np.ndarray:
+  '''
+  Exit squares cost one point, if their piece does not continue the exit. Every other square costs one point per
+  connector, which does not meet the same connector.
+  '''
+  open_ends = (connectors != 0) & (facing != connectors)
+  deductions = np.count_nonzero(open_ends[:, tables.inner_cells], axis=(1, 2))
+
+  exit_connectors = connectors[:, tables.exit_cells, tables.exit_sides]
+  deductions += np.count_nonzero((ids[:, tables.exit_cells] != 0) & (exit_connectors != tables.exit_connectors), axis=1)
+
+  return deductions
+
+def _determine_network_points(ids: np.ndarray, connectors: np.ndarray, facing: np.ndarray, tables: _BatchTables) -> np.ndarray:
+  '''
+  Labels every port with the smallest port of its network. Ports are linked within the piece (channels) and with
+  the facing port of the neighbour.
+  '''
+  count = len(ids)
+  active = (connectors != 0).reshape(count, PORT_COUNT)
+  linked = np.concatenate((
+    tables.channels[ids].reshape(count, PORT_COUNT, 3),
+    ((connectors != 0) & (facing == connectors)).reshape(count, PORT_COUNT, 1),
+  ), axis=2)
+
+  targets = np.where(linked, tables.port_links, PORT_COUNT)
+  labels = _propagate_labels(np.where(active, np.arange(PORT_COUNT), PORT_COUNT), targets)
+
+  # An exit counts for the network of its port, if the piece continues it. Each network is counted at its first exit.
+  exit_ports = tables.exit_cells * 4 + tables.exit_sides
+  reached = connectors[:, tables.exit_cells, tables.exit_sides] == tables.exit_connectors
+  exit_labels = np.where(reached, labels[:, exit_ports], -1 - np.arange(len(exit_ports)))
+  same = exit_labels[:, :, None] == exit_labels[:, None, :]
+  sizes = same.sum(axis=2)
+  first = ~np.any(same & tables.earlier_exits, axis=2)
+
+  return np.where(reached & first, tables.network_points[sizes], 0).sum(axis=1)
+
+def _determine_longest_paths(ids: np.ndarray, connectors: np.ndarray, facing: np.ndarray, connector: int, tables: _BatchTables) -> np.ndarray:
+  '''
+  If no square connects to more than two squares of the route type, every route is a line or a loop: a line counts
+  one point per square, a loop one more, as the path ends on the square it started from. Only the other boards are
+  searched by find_longest_path.
+  '''
+  route = np.any(connectors == connector, axis=2)
+  links = (connectors == connector) & (facing == connector) & ~tables.on_edge
+  degrees = np.count_nonzero(links, axis=2)
+  simple = degrees.max(axis=1) <= 2
+
+  # Label the squares of every route with the smallest square of the route, as for the networks.
+  labels = _propagate_labels(np.where(route, np.arange(CELL_COUNT), CELL_COUNT), np.where(links, tables.neighbours, CELL_COUNT))
+  labels = np.where(route, labels, -1 - np.arange(CELL_COUNT))
+  same = labels[:, :, None] == labels[:, None, :]
+  sizes = same.sum(axis=2)
+  loops = ~np.any(same & (degrees != 2)[:, None, :], axis=2)
+  lengths = np.where(route, sizes + loops, 0).max(axis=1).astype(np.int64)
+
+  for board in np.flatnonzero(~simple):
+    lengths[board] = find_longest_path(ids[board].tobytes(), connector) # type: ignore
+
+  return lengths
+
+def _propagate_labels(initial: np.ndarray, targets: np.ndarray) -> np.ndarray:
+  '''
+  Returns for every node the smallest label of its connected component. initial holds the label of every node, i.e.
+  its own index, or the node count for inactive nodes. targets holds the (N, nodes, k) nodes each node is linked to,
+  where the node count stands for no link. Nodes take the smallest label among their links and then the label of
+  their label, until no label changes.
+  '''
+  count, size = initial.shape
+  labels = np.full((count, size + 1), size, dtype=np.int32)
+  labels[:, :size] = initial
+  flat = labels.reshape(-1)
+  offsets = (np.arange(count, dtype=np.int32) * (size + 1))[:, None]
+  targets = targets + offsets[:, :, None]
+
+  while True:
+    updated = np.minimum(labels[:, :size], flat[targets].min(axis=2))
+    updated = flat[updated + offsets]
+    if np.array_equal(updated, labels[:, :size]):
+      return updated
+    labels[:, :size] = updated
+
+
+class _BatchTables:
+  '''
+  Index and lookup arrays shared by all batches.
+  '''
+
+  def __init__(self):
+    registry = get_piece_registry()
+    self.connectors = np.array(registry.connectors_by_id, dtype=np.int8)
+    self.central = np.array(CENTRAL_CELLS)
+    self.neighbours = np.array([[_OUTSIDE if neighbour == -1 else neighbour for neighbour in row] for row in NEIGHBOURS])
+    self.opposite = np.array(OPPOSITE)
+    self.on_edge = np.array(NEIGHBOURS) == -1
+    self.exits = np.array(EXIT_CONNECTORS, dtype=np.int8)
+
+    self.exit_cells = np.array(EXIT_CELLS)
+    self.exit_sides = np.array([EXIT_SIDES[index] for index in EXIT_CELLS])
+    self.exit_connectors = np.array([EXIT_CONNECTORS[index][EXIT_SIDES[index]] for index in EXIT_CELLS], dtype=np.int8)
+    self.inner_cells = np.array([index for index in range(CELL_COUNT) if index not in EXIT_CELLS])
+    self.earlier_exits = np.tri(len(EXIT_CELLS), k=-1, dtype=bool)
+    self.network_points = np.array(NETWORK_POINTS)
+
+    # Every port may be linked to the three other ports of its square and to the facing port of its neighbour. The
+    # facing port of a side on the board edge is the padding label PORT_COUNT.
+    self.port_links = np.array([
+      [index * 4 + other for other in range(4) if other != side]
+      + [PORT_COUNT if NEIGHBOURS[index][side] == -1 else NEIGHBOURS[index][side] * 4 + OPPOSITE[side]]
+      for index in range(CELL_COUNT) for side in range(4)
+    ])
+    self.channels = np.array([
+      [[other in channels[side] for other in range(4) if other != side] for side in range(4)] if channels else [[False] * 3] * 4
+      for channels in registry.channels_by_id
+    ])
+
+
+__tables: _BatchTables | None = None
+
+def _get_tables() -> _BatchTables:
+  global __tables
+
+  if __tables is None:
+    __tables = _BatchTables()
+
+  return __tables
@@ -0,0 +1,133 @@
+from __future__ import annotations
+import functools
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Tuple, TypeVar
+from Models.board import Board
+from Services.Board.Symmetry.symmetry_service import canonicalize_cells
+
+Evaluation = TypeVar("Evaluation", bound=Callable[..., int])
+
+
+class EvaluationCache:
+  '''
+  Bounded cache of evaluation results, e.g. of evaluate_board_position and its subscores, shared by all threads.
+
+  Results are keyed on the name of the evaluation and the canonical cells of the board (see canonicalize_cells), so
+  boards reached by different placement orders and their mirror images share an entry. Scores do not change under
+  these symmetries. Once max_size results are stored, the least recently used one is evicted.
+  '''
+
+  def __init__(self, max_size: int = 1 << 16):
+    if max_size < 1:
+      raise ValueError(f"The cache has to hold at least one result, got {max_size}")
+
+    self.max_size = max_size
+    self.hits = 0
+    self.misses = 0
+    self.evictions = 0
+    self._entries: OrderedDict[Tuple[str, bytes], int] = OrderedDict()
+    self._lock = threading.Lock()
+    # The last canonicalized cells, as evaluate_board_position asks for the key of the same board once per subscore.
+    self._last_key: Tuple[bytes, bytes] = (b"", b"")
+
+  def __len__(self) -> int:
+    return len(self._entries)
+
+  def get_key(self, board: Board) -> bytes:
+    '''
+    Returns the canonical cells of the board.
+    '''
+    cells = board.to_bytes()
+    last_cells, last_key = self._last_key
+    if cells == last_cells:
+      return last_key
+
+    key = canonicalize_cells(cells)[0]
+    self._last_key = (cells, key)
+
+    return key
+
+  def evaluate(self, name: str, board: Board, evaluation: Callable[[Board], int]) -> int:
+    '''
+    Returns the cached result of the named evaluation for the board, computing and storing it on a miss. The
+    evaluation runs outside the lock, so threads evaluating different boards do not wait for each other.
+    '''
+    key = (name, self.get_key(board))
+    with self._lock:
+      result = self._entries.get(key)
+      if result is not None:
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return result
+      self.misses += 1
+
+    result = evaluation(board)
+    with self._lock:
+      self._entries[key] = result
+      self._entries.move_to_end(key)
+      if len(self._entries) > self.max_size:
+        self._entries.popitem(last=False)
+        self.evictions += 1
+
+    return result
+
+  def wrap(self, evaluation: Evaluation, board_of: Callable[[Any], Board] | None = None) -> Evaluation:
+    '''
+    Returns the evaluation with results served from this cache, e.g. cache.wrap(evaluate_board_position) or as
+    decorator @cache.wrap. board_of returns the board of the argument of evaluations, which do not take a board.
+    '''
+    name = f"{evaluation.__module__}.{evaluation.__qualname__}"
+
+    @functools.wraps(evaluation)
+    def cached(argument: Any) -> int:
+      return self.evaluate(name, board_of(argument) if board_of else argument, lambda _: evaluation(argument))
+
+    return cached # type: ignore
+
+  def get_statistics(self) -> Dict[str, int]:
+    with self._lock:
+      return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "size": len(self._entries), "max_size": self.max_size}
+
+  def clear(self) -> None:
+    with self._lock:
+      self._entries.clear()
+      self.hits = self.misses = self.evictions = 0
+      self._last_key = (b"", b"")
+
+
+__active_cache: EvaluationCache | None = None
+
+def set_evaluation_cache(cache: EvaluationCache | None) -> EvaluationCache | None:
+  '''
+  Serves all evaluations marked with memoize_evaluation, i.e. evaluate_board_position and its subscores, from the
+  cache, or from none again for None. Returns the previously active cache.
+  '''
+  global __active_cache
+
+  previous, __active_cache = __active_cache, cache
+  return previous
+
+def get_evaluation_cache() -> EvaluationCache | None:
+  return __active_cache
+
+def memoize_evaluation(evaluation: Evaluation | None = None, *, board_of: Callable[[Any], Board] | None = None) -> Any:
+  '''
+  Decorator, which serves the evaluation from the cache set by set_evaluation_cache, so existing call sites use the
+  cache, once one is set. Without a cache, the evaluation is called directly. board_of returns the board of the
+  argument of evaluations, which do not take a board.
+  '''
+  def decorate(evaluation: Evaluation) -> Evaluation:
+    name = f"{evaluation.__module__}.{evaluation.__qualname__}"
+
+    @functools.wraps(evaluation)
+    def memoized(argument: Any) -> int:
+      cache = __active_cache
+      if cache is None:
+        return evaluation(argument)
+
+      return cache.evaluate(name, board_of(argument) if board_of else argument, lambda _: evaluation(argument))
+
+    return memoized # type: ignore
+
+  return decorate(evaluation) if evaluation is not None else decorate
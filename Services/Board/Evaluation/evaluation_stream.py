@@ -0,0 +1,82 @@
+from __future__ import annotations
+from collections import deque
+from itertools import islice
+from typing import TYPE_CHECKING, Any, Deque, Dict, Iterable, Iterator, List
+from Models.board import Board
+from Services.Board.Evaluation.board_evaluation_service import evaluate_board_breakdown
+from Services.Board.Storage.board_reader import JSON, BoardPayload
+
+if TYPE_CHECKING:
+  # concurrent.futures pulls in logging and multiprocessing, which single worker runs do not need.
+  from concurrent.futures import Executor, Future
+
+# Result of a board: its source and either the breakdown of evaluate_board_breakdown or the error, e.g. of a malformed
+# line, under "error".
+Result = Dict[str, Any]
+
+
+def evaluate_payloads(
+  payloads: Iterable[BoardPayload],
+  workers: int = 1,
+  chunk_size: int = 256,
+  max_in_flight: int | None = None,
+  executor: Executor | None = None,
+) -> Iterator[Result]:
+  '''
+  Evaluates the boards read by read_board_payloads and yields their results in input order.
+
+  Boards are evaluated in chunks of chunk_size by the worker processes. At most max_in_flight chunks (by default two
+  per worker) are submitted at a time, the next chunk is only read, once the oldest one has been yielded, so memory
+  does not grow with the input. With a single worker and no executor, the boards are evaluated in this process.
+  '''
+  chunks = _chunk(payloads, chunk_size)
+  if executor is None and workers <= 1:
+    for chunk in chunks:
+      yield from evaluate_chunk(chunk)
+    return
+
+  limit = max_in_flight or 2 * workers
+  if executor is None:
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+      yield from _evaluate_bounded(pool, chunks, limit)
+  else:
+    yield from _evaluate_bounded(executor, chunks, limit)
+
+def evaluate_chunk(chunk: List[BoardPayload]) -> List[Result]:
+  '''
+  Decodes and evaluates a chunk of boards. Runs in the worker processes.
+  '''
+  results: List[Result] = []
+  for source, kind, payload in chunk:
+    try:
+      results.append({"source": source, **evaluate_board_breakdown(decode_payload(kind, payload))})
+    except (ValueError, KeyError, TypeError) as error:
+      results.append({"source": source, "error": str(error) or type(error).__name__})
+
+  return results
+
+def decode_payload(kind: int, payload: str | bytes) -> Board:
+  '''
+  Returns the board of a payload of read_board_payloads.
+  '''
+  if kind == JSON:
+    return Board.from_json(payload) # type: ignore
+
+  return Board.from_bytes(payload) # type: ignore
+
+def _evaluate_bounded(executor: Executor, chunks: Iterator[List[BoardPayload]], limit: int) -> Iterator[Result]:
+  pending: Deque[Future[List[Result]]] = deque()
+  for chunk in chunks:
+    pending.append(executor.submit(evaluate_chunk, chunk))
+    if len(pending) >= limit:
+      yield from pending.popleft().result()
+
+  while pending:
+    yield from pending.popleft().result()
+
+def _chunk(payloads: Iterable[BoardPayload], size: int) -> Iterator[List[BoardPayload]]:
+  iterator = iter(payloads)
+  while chunk := list(islice(iterator, size)):
+    yield chunk
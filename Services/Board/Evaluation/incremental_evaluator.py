@@ -0,0 +1,188 @@
+from __future__ import annotations
+from typing import Dict, List, Set, Tuple
+from Models.board import CELL_COUNT, CENTRAL_CELLS, EMPTY, EXIT_CONNECTORS, EXIT_SIDES, NEIGHBOURS, OPPOSITE, Board, BoardEvaluator, cell_index
+from Models.enums import SquareConnectorType
+from Models.piece import Piece
+from Services.Board.Evaluation.board_evaluation_service import determine_points_from_longest_railway, determine_points_from_longest_road
+from Services.Board.Evaluation.longest_path_engine import find_longest_path
+from Services.Board.Evaluation.network_engine import NetworkUnionFind
+from Services.Pieces.piece_registry import get_piece_registry
+
+ROAD = SquareConnectorType.road.value
+RAILWAY = SquareConnectorType.railway.value
+
+_CENTRAL: Set[int] = set(CENTRAL_CELLS)
+
+
+class IncrementalEvaluator(BoardEvaluator):
+  '''
+  Keeps the score of a board up to date while pieces are placed and removed, so a search does not have to rescan
+  the whole board after every placement. The evaluator attaches itself to its board (see Board.attach_evaluator), so
+  it follows every change, whether made through place and remove or on the board, e.g. by Board.place and Board.undo.
+
+  Central squares and deductions are updated from the changed square and its four neighbours. Networks are tracked
+  in a NetworkUnionFind, which is extended on every placement. Taking back the latest placement rolls it back, any
+  other removal rebuilds it. The longest road and railway are cached. A placement extending a route only searches
+  the route it joins, as all other routes are unchanged; taking back the latest placement restores the values from
+  before it. Any other removal or replacement may split a route, so the next read searches the whole board again.
+
+  The totals agree with evaluate_board_position.
+  '''
+
+  def __init__(self, board: Board):
+    registry = get_piece_registry()
+    self._board = board
+    self._cells = board.cells
+    self._connectors = registry.connectors_by_id
+    self._channels = registry.channels_by_id
+
+    self._central = 0
+    self._deductions = 0
+    self._networks = NetworkUnionFind.from_board(board)
+    self._longest: Dict[int, int] = {ROAD: 0, RAILWAY: 0}
+    self._longest_dirty: Dict[int, bool] = {ROAD: True, RAILWAY: True}
+    # Per placement since the networks were built: (cell, longest road, longest railway, their dirty flags) before it.
+    self._placements: List[Tuple[int, int, int, bool, bool]] = []
+
+    for index in range(CELL_COUNT):
+      if self._cells[index] == EMPTY:
+        continue
+
+      self._central += index in _CENTRAL
+      self._deductions += self._cell_deductions(index)
+
+    board.attach_evaluator(self)
+
+  @property
+  def board(self) -> Board:
+    return self._board
+
+  @property
+  def central(self) -> int:
+    return self._central
+
+  @property
+  def networks(self) -> int:
+    return self._networks.points
+
+  @property
+  def deductions(self) -> int:
+    return self._deductions
+
+  @property
+  def longest_road(self) -> int:
+    return self._get_longest(ROAD)
+
+  @property
+  def longest_railway(self) -> int:
+    return self._get_longest(RAILWAY)
+
+  @property
+  def total(self) -> int:
+    return self._central + self._networks.points + self.longest_road + self.longest_railway - self._deductions
+
+  def place(self, x: int, y: int, piece: Piece) -> int:
+    '''
+    Places the piece on the empty square (x, y) and returns the new total.
+    '''
+    if self._cells[cell_index(x, y)] != EMPTY:
+      raise ValueError(f"Square ({x}, {y}) is already occupied")
+
+    self._board.set_piece(x, y, piece)
+    return self.total
+
+  def remove(self, x: int, y: int) -> int:
+    '''
+    Removes the piece from the square (x, y) and returns the new total.
+    '''
+    if self._cells[cell_index(x, y)] == EMPTY:
+      raise ValueError(f"Square ({x}, {y}) is empty")
+
+    self._board.set_piece(x, y, None)
+    return self.total
+
+  def before_change(self, index: int) -> None:
+    self._deductions -= sum(self._cell_deductions(cell) for cell in self._affected_cells(index))
+
+  def after_change(self, index: int, previous_id: int) -> None:
+    piece_id = self._cells[index]
+    self._deductions += sum(self._cell_deductions(cell) for cell in self._affected_cells(index))
+    if index in _CENTRAL:
+      self._central += (piece_id != EMPTY) - (previous_id != EMPTY)
+
+    longest, dirty = self._longest, self._longest_dirty
+    if previous_id == EMPTY and piece_id != EMPTY:
+      self._placements.append((index, longest[ROAD], longest[RAILWAY], dirty[ROAD], dirty[RAILWAY]))
+      self._networks.add_piece(index)
+      self._update_longest_after_place(index)
+    elif piece_id == EMPTY and self._placements and self._placements[-1][0] == index:
+      _, longest[ROAD], longest[RAILWAY], dirty[ROAD], dirty[RAILWAY] = self._placements.pop()
+      self._networks.remove_last_piece()
+    else:
+      # The network of a removed or replaced piece may fall apart, which a union-find cannot represent.
+      self._networks = NetworkUnionFind.from_board(self._board)
+      self._placements.clear()
+      for connector in (ROAD, RAILWAY):
+        if connector in self._connectors[previous_id] or connector in self._connectors[piece_id]:
+          dirty[connector] = True
+
+  def _affected_cells(self, index: int) -> List[int]:
+    return [index] + [neighbour for neighbour in NEIGHBOURS[index] if neighbour != -1]
+
+  def _cell_deductions(self, index: int) -> int:
+    '''
+    Returns the deductions for the piece on the square, following determine_deductions_for_unconnected_pieces.
+    '''
+    piece_id = self._cells[index]
+    if piece_id == EMPTY:
+      return 0
+
+    connectors = self._connectors[piece_id]
+    side = EXIT_SIDES[index]
+    if side != -1:
+      return 0 if connectors[side] == EXIT_CONNECTORS[index][side] else 1
+
+    deductions = 0
+    for side in range(4):
+      connector = connectors[side]
+      if not connector:
+        continue
+
+      neighbour = NEIGHBOURS[index][side]
+      if neighbour == -1 or self._connectors[self._cells[neighbour]][OPPOSITE[side]] != connector:
+        deductions += 1
+
+    return deductions
+
+  def _update_longest_after_place(self, index: int) -> None:
+    '''
+    A placement merges the routes it connects to into one containing the placed piece and leaves all others as they
+    were, so the new longest route is the longer of the cached one and the longest path of that route.
+    '''
+    connectors = self._connectors[self._cells[index]]
+
+    for connector in (ROAD, RAILWAY):
+      if connector not in connectors or self._longest_dirty[connector]:
+        continue
+
+      # A piece, which does not extend an existing route, is a route of length one on its own.
+      extends_route = any(
+        connectors[side] == connector and NEIGHBOURS[index][side] != -1
+        and self._connectors[self._cells[NEIGHBOURS[index][side]]][OPPOSITE[side]] == connector
+        for side in range(4)
+      )
+      if extends_route:
+        route = find_longest_path(self._cells, connector, start=index)
+        self._longest[connector] = max(self._longest[connector], route)
+      else:
+        self._longest[connector] = max(self._longest[connector], 1)
+
+  def _get_longest(self, connector: int) -> int:
+    if self._longest_dirty[connector]:
+      if connector == ROAD:
+        self._longest[connector] = determine_points_from_longest_road(self._board)
+      else:
+        self._longest[connector] = determine_points_from_longest_railway(self._board)
+      self._longest_dirty[connector] = False
+
+    return self._longest[connector]
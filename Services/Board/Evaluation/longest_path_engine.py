@@ -0,0 +1,226 @@
+from __future__ import annotations
+from typing import Dict, List, Tuple
+from Models.board import CELL_COUNT, NEIGHBOURS, OPPOSITE
+from Services.Pieces.piece_registry import get_piece_registry
+
+
+def find_longest_path(
+  cells: bytearray, connector: int, links: List[List[Tuple[int, int]]] | None = None, start: int | None = None,
+) -> int:
+  '''
+  Returns the length of the longest road (connector = SquareConnectorType.road.value) or railway
+  (connector = SquareConnectorType.railway.value) on the board with the passed cells.
+
+  A path is a sequence of states (square, direction the square was entered in), which must not contain a state twice
+  and must not turn back the way it came. A square may therefore be passed several times, e.g. once from the south
+  and once from the west. Every state counts one point, including the square the path starts on.
+
+  The search works per connected component of the road or railway graph:
+    - Components, where no square connects to more than two neighbours, are lines or closed loops. A line counts one
+      point per square, a loop one more, as the path ends on the square it started from. Only the other components
+      are searched.
+    - Paths only start on squares which do not connect to exactly two neighbours, as a path starting in the middle of
+      a route can always be extended or rotated onto such a square. Dead ends are tried first.
+    - Visited states are kept as a bitmask.
+    - Once a path enters a dead end branch, it can never leave it again. The longest continuation of such states is
+      precomputed, so the search stops there.
+    - Branches are pruned when the unvisited states reachable from the current state, counting a dead end branch
+      once, cannot beat the longest path found so far.
+    - Results are memoized by (state, unvisited reachable states), which is shared by all paths of the board.
+
+  links may pass the (direction, neighbour) pairs of every square connected by the connector type, if they are known
+  already, e.g. from a PortGraph. start restricts the search to the component containing the square start, which
+  is 0 if its piece does not have the connector type.
+  '''
+  connectors = get_piece_registry().connectors_by_id
+  if links is None:
+    links = _determine_links(cells, connectors, connector)
+  if start is None:
+    candidates = [index for index in range(CELL_COUNT) if connector in connectors[cells[index]]]
+  else:
+    candidates = [start] if connector in connectors[cells[start]] else []
+  if not candidates:
+    return 0
+
+  longest = 1
+  branched: List[List[int]] = []
+  for component in _determine_components(candidates, links):
+    degrees = [len(links[index]) for index in component]
+    if max(degrees) > 2:
+      branched.append(component)
+    else:
+      longest = max(longest, len(component) + (min(degrees) == 2))
+  if not branched:
+    return longest
+
+  successors: Dict[int, Tuple[int, ...]] = {}
+  for component in branched:
+    for index in component:
+      for direction, neighbour in links[index]:
+        successors[neighbour * 4 + direction] = tuple(
+          next_neighbour * 4 + next_direction for next_direction, next_neighbour in links[neighbour]
+          if next_direction != OPPOSITE[direction]
+        )
+
+  tails = _determine_tails(successors)
+  search = _PathSearch(successors, tails)
+
+  for component in branched:
+    state_count = sum(len(links[index]) for index in component)
+    if 1 + state_count <= longest:
+      continue
+
+    starts = sorted((index for index in component if len(links[index]) != 2), key=lambda index: len(links[index]))
+    for start in starts:
+      for direction, neighbour in links[start]:
+        state = neighbour * 4 + direction
+        if state in tails:
+          length = 1 + tails[state]
+        else:
+          length = 2 + search.extend(state, 1 << state, longest - 2)
+        longest = max(longest, length)
+
+  return longest
+
+
+class _PathSearch:
+  '''
+  Depth first branch and bound search for the longest path, see find_longest_path.
+
+  The continuation of a path only depends on its current state and on the unvisited states it can still reach, so
+  results are memoized under that key. A result is either exact or, if the search below was cut off because it could
+  not beat the required length, an upper bound.
+  '''
+  MAX_MEMO_SIZE = 500_000
+
+  def __init__(self, successors: Dict[int, Tuple[int, ...]], tails: Dict[int, int]):
+    self.successors = successors
+    self.tails = tails
+    self.memo: Dict[Tuple[int, int], Tuple[int, bool]] = {}
+
+  def extend(self, state: int, visited: int, required: int) -> int:
+    '''
+    Returns by how many states the path, which has just entered the state, can still be extended. The result is exact,
+    if it exceeds required, otherwise it is an upper bound, which does not exceed required.
+    '''
+    reachable, longest_tail = self._reach(state, visited)
+    bound = reachable.bit_count() + longest_tail
+    if bound <= required:
+      return bound
+
+    key = (state, reachable)
+    cached = self.memo.get(key)
+    if cached is not None and (cached[1] or cached[0] <= required):
+      return cached[0]
+
+    best = 0
+    for next_state in self.successors[state]:
+      bit = 1 << next_state
+      if visited & bit:
+        continue
+
+      tail = self.tails.get(next_state)
+      length = tail if tail is not None else 1 + self.extend(next_state, visited | bit, max(required, best) - 1)
+      if length > best:
+        best = length
+        if best == bound:
+          break
+
+    if len(self.memo) >= self.MAX_MEMO_SIZE:
+      self.memo.clear()
+    # Children, which were cut off, cannot exceed the best length known when they were searched, so the result is
+    # exact as soon as it exceeds the required length.
+    self.memo[key] = (best, best > required)
+
+    return best
+
+  def _reach(self, state: int, visited: int) -> Tuple[int, int]:
+    '''
+    Returns the mask of unvisited states reachable from the state, not including dead end branches, and the length
+    of the longest reachable dead end branch. Together they bound the possible extension of the path.
+    '''
+    successors, tails = self.successors, self.tails
+    reachable = 0
+    longest_tail = 0
+    stack = [state]
+
+    while stack:
+      for next_state in successors[stack.pop()]:
+        bit = 1 << next_state
+        if visited & bit:
+          continue
+
+        tail = tails.get(next_state)
+        if tail is not None:
+          if tail > longest_tail:
+            longest_tail = tail
+          continue
+
+        visited |= bit
+        reachable |= bit
+        stack.append(next_state)
+
+    return reachable, longest_tail
+
+def _determine_tails(successors: Dict[int, Tuple[int, ...]]) -> Dict[int, int]:
+  '''
+  Returns the states, from which no loop can be reached any more, together with the length of the longest path
+  starting with them. Such states lead into a dead end branch, where the path can only move further away.
+
+  States are peeled off backwards from the dead ends: a state is a tail, once all of its successors are. States on or
+  leading to a loop are never peeled off.
+  '''
+  predecessors: Dict[int, List[int]] = {state: [] for state in successors}
+  pending: Dict[int, int] = {}
+  for state, next_states in successors.items():
+    pending[state] = len(next_states)
+    for next_state in next_states:
+      predecessors[next_state].append(state)
+
+  tails: Dict[int, int] = {}
+  stack = [state for state, count in pending.items() if not count]
+  while stack:
+    state = stack.pop()
+    tails[state] = 1 + max((tails[next_state] for next_state in successors[state]), default=0)
+    for previous in predecessors[state]:
+      pending[previous] -= 1
+      if not pending[previous]:
+        stack.append(previous)
+
+  return tails
+
+def _determine_links(cells: bytearray, connectors: Tuple[Tuple[int, ...], ...], connector: int) -> List[List[Tuple[int, int]]]:
+  '''
+  Returns for every square the (direction, neighbour) pairs it is connected to by the passed connector type.
+  '''
+  links: List[List[Tuple[int, int]]] = [[] for _ in range(CELL_COUNT)]
+  for index in range(CELL_COUNT):
+    piece_connectors = connectors[cells[index]]
+    for direction in range(4):
+      neighbour = NEIGHBOURS[index][direction]
+      if piece_connectors[direction] == connector and neighbour != -1 and connectors[cells[neighbour]][OPPOSITE[direction]] == connector:
+        links[index].append((direction, neighbour))
+
+  return links
+
+def _determine_components(candidates: List[int], links: List[List[Tuple[int, int]]]) -> List[List[int]]:
+  seen = set()
+  components: List[List[int]] = []
+
+  for index in candidates:
+    if index in seen:
+      continue
+
+    seen.add(index)
+    component = [index]
+    stack = [index]
+    while stack:
+      for _, neighbour in links[stack.pop()]:
+        if neighbour not in seen:
+          seen.add(neighbour)
+          component.append(neighbour)
+          stack.append(neighbour)
+
+    components.append(component)
+
+  return components
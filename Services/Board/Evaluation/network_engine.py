@@ -0,0 +1,143 @@
+from __future__ import annotations
+from typing import Dict, List
+from Models.board import CELL_COUNT, EMPTY, EXIT_BITS, EXIT_CONNECTORS, EXIT_SIDES, NEIGHBOURS, OPPOSITE, Board
+from Services.Pieces.piece_registry import get_piece_registry
+
+# Points for a network, indexed by the number of exits it connects.
+NETWORK_POINTS = (0, 0, 4, 8, 12, 16, 20, 24, 28, 32, 36, 40, 45)
+
+PORT_COUNT = CELL_COUNT * 4
+
+
+class NetworkUnionFind:
+  '''
+  Disjoint sets over the ports of a board, where a port is a side of a square (port = cell index * 4 + side).
+
+  Adding a piece joins the ports it connects internally, i.e. all connectors of a normal piece or station and the two
+  straight channels of an underground, and joins every connector with the matching connector of its neighbour. Each
+  set carries the exits it reaches as a bitmask (see EXIT_BITS), so the points of all networks are kept up to date
+  while pieces are added.
+
+  The latest added piece can be removed again with remove_last_piece, e.g. when a search takes back a placement: sets
+  are joined by size without path compression, and every change of add_piece is recorded, so it can be rolled back.
+  Removing other pieces is not supported, rebuild the structure with from_board instead.
+  '''
+  __slots__ = ("_cells", "_connectors", "_channels", "_parent", "_size", "_exits", "_points", "_history", "_marks")
+
+  def __init__(self, cells: bytearray):
+    registry = get_piece_registry()
+    self._cells = cells
+    self._connectors = registry.connectors_by_id
+    self._channels = registry.channels_by_id
+    self._parent: List[int] = list(range(PORT_COUNT))
+    self._size: List[int] = [1] * PORT_COUNT
+    self._exits: List[int] = [0] * PORT_COUNT
+    self._points = 0
+    # Flat records of (kept root, attached root or -1 for an added exit, previous exits of both) and, per added piece,
+    # the length of the history and the points before it was added.
+    self._history: List[int] = []
+    self._marks: List[int] = []
+
+  @classmethod
+  def from_board(cls, board: Board) -> NetworkUnionFind:
+    '''
+    Creates the structure for all pieces currently placed on the board.
+    '''
+    networks = cls(board.cells)
+    for index, piece_id in enumerate(board.cells):
+      if piece_id != EMPTY:
+        networks.add_piece(index)
+
+    return networks
+
+  @property
+  def points(self) -> int:
+    '''
+    The points of all networks, see NETWORK_POINTS.
+    '''
+    return self._points
+
+  def find(self, port: int) -> int:
+    parent = self._parent
+    while parent[port] != port:
+      port = parent[port]
+
+    return port
+
+  def union(self, first: int, second: int) -> None:
+    first, second = self.find(first), self.find(second)
+    if first == second:
+      return
+
+    size = self._size
+    if size[first] < size[second]:
+      first, second = second, first
+
+    exits = self._exits
+    merged = exits[first] | exits[second]
+    self._points += NETWORK_POINTS[merged.bit_count()] - NETWORK_POINTS[exits[first].bit_count()] - NETWORK_POINTS[exits[second].bit_count()]
+    self._history += (first, second, exits[first], exits[second])
+    self._parent[second] = first
+    size[first] += size[second]
+    exits[first] = merged
+    exits[second] = 0
+
+  def add_piece(self, index: int) -> None:
+    '''
+    Adds the piece, which has already been placed on the cell, to the networks.
+    '''
+    cells, connectors = self._cells, self._connectors
+    piece_id = cells[index]
+    piece_connectors = connectors[piece_id]
+    channels = self._channels[piece_id]
+    self._marks += (len(self._history), self._points)
+
+    for side in range(4):
+      connector = piece_connectors[side]
+      if not connector:
+        continue
+
+      port = index * 4 + side
+      for other in channels[side]:
+        if other > side:
+          self.union(port, index * 4 + other)
+
+      if EXIT_SIDES[index] == side and EXIT_CONNECTORS[index][side] == connector:
+        root = self.find(port)
+        exits = self._exits[root]
+        self._points += NETWORK_POINTS[(exits | EXIT_BITS[index]).bit_count()] - NETWORK_POINTS[exits.bit_count()]
+        self._history += (root, -1, exits, 0)
+        self._exits[root] = exits | EXIT_BITS[index]
+
+      neighbour = NEIGHBOURS[index][side]
+      if neighbour != -1 and connectors[cells[neighbour]][OPPOSITE[side]] == connector:
+        self.union(port, neighbour * 4 + OPPOSITE[side])
+
+  def remove_last_piece(self) -> None:
+    '''
+    Rolls back the latest add_piece. The piece has to be removed from the cells as well.
+    '''
+    if not self._marks:
+      raise ValueError("No piece to remove")
+
+    points = self._marks.pop()
+    length = self._marks.pop()
+    history, parent, size, exits = self._history, self._parent, self._size, self._exits
+    while len(history) > length:
+      attached_exits = history.pop()
+      kept_exits = history.pop()
+      attached = history.pop()
+      kept = history.pop()
+      exits[kept] = kept_exits
+      if attached != -1:
+        parent[attached] = attached
+        size[kept] -= size[attached]
+        exits[attached] = attached_exits
+
+    self._points = points
+
+  def get_exit_masks(self) -> Dict[int, int]:
+    '''
+    Returns the exit mask of every network reaching at least one exit, keyed by the root port of the network.
+    '''
+    return {port: exits for port, exits in enumerate(self._exits) if exits}
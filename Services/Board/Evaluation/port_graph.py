@@ -0,0 +1,138 @@
+from __future__ import annotations
+from typing import Dict, List, Tuple
+from Models.board import CELL_COUNT, CENTRAL_CELLS, EXIT_CONNECTORS, EXIT_SIDES, NEIGHBOURS, OPPOSITE
+from Models.enums import SquareConnectorType
+from Services.Board.Evaluation.longest_path_engine import find_longest_path
+from Services.Board.Evaluation.network_engine import NETWORK_POINTS, PORT_COUNT
+from Services.Pieces.piece_registry import get_piece_registry
+
+ROAD = SquareConnectorType.road.value
+RAILWAY = SquareConnectorType.railway.value
+
+# (side, neighbour, facing side of the neighbour, facing exit connector) of every cell, where the neighbour is -1 on
+# the board edge and the exit connector is that of the edge (none for all but the exit sides).
+_SIDES: Tuple[Tuple[Tuple[int, int, int, int], ...], ...] = tuple(
+  tuple((side, NEIGHBOURS[index][side], OPPOSITE[side], EXIT_CONNECTORS[index][side]) for side in range(4))
+  for index in range(CELL_COUNT)
+)
+_CENTRAL = frozenset(CENTRAL_CELLS)
+
+
+class PortGraph:
+  '''
+  The connections of a board, compiled in a single pass over its cells, from which all subscores are derived.
+
+  A port is a side of a square (port = cell index * 4 + side), see NetworkUnionFind. For every connector the pass
+  looks up the facing connector once, from the neighbour or the exit, and records:
+    - partners: the facing port of the neighbour, if both connectors match, else -1,
+    - exit_ports: the ports continuing an exit,
+    - links: per connector type and square the (direction, neighbour) pairs it is connected to, see find_longest_path,
+    - central and deductions, counted as in determine_points_from_central_squares and
+      determine_deductions_for_unconnected_pieces.
+  '''
+  __slots__ = ("cells", "central", "deductions", "partners", "exit_ports", "links")
+
+  def __init__(self, cells: bytearray | bytes):
+    registry = get_piece_registry()
+    connectors = registry.connectors_by_id
+    self.cells = cells
+    self.central = 0
+    self.deductions = 0
+    self.partners: List[int] = [-1] * PORT_COUNT
+    self.exit_ports: List[int] = []
+    road_links: List[List[Tuple[int, int]]] = [[] for _ in range(CELL_COUNT)]
+    railway_links: List[List[Tuple[int, int]]] = [[] for _ in range(CELL_COUNT)]
+    self.links: Dict[int, List[List[Tuple[int, int]]]] = {ROAD: road_links, RAILWAY: railway_links}
+
+    partners, exit_ports = self.partners, self.exit_ports
+    for index in range(CELL_COUNT):
+      piece_id = cells[index]
+      if not piece_id:
+        continue
+
+      if index in _CENTRAL:
+        self.central += 1
+      piece_connectors = connectors[piece_id]
+      exit_side = EXIT_SIDES[index]
+      # Exit squares only cost a point, if the piece does not continue the exit. Their other sides are not counted.
+      if exit_side != -1 and piece_connectors[exit_side] != EXIT_CONNECTORS[index][exit_side]:
+        self.deductions += 1
+
+      for side, neighbour, facing_side, exit_connector in _SIDES[index]:
+        connector = piece_connectors[side]
+        if not connector:
+          continue
+
+        facing = exit_connector if neighbour == -1 else connectors[cells[neighbour]][facing_side]
+        if facing != connector:
+          if exit_side == -1:
+            self.deductions += 1
+        elif neighbour == -1:
+          exit_ports.append(index * 4 + side)
+        else:
+          partners[index * 4 + side] = neighbour * 4 + facing_side
+          (road_links if connector == ROAD else railway_links)[index].append((side, neighbour))
+
+  def get_network_points(self) -> int:
+    '''
+    Returns the points of all networks, see NETWORK_POINTS. Only networks reaching an exit are traversed, from their
+    first exit port over the channels of the pieces and the partner ports.
+    '''
+    cells, partners = self.cells, self.partners
+    channels = get_piece_registry().channels_by_id
+    exit_ports = set(self.exit_ports)
+    seen = set()
+    points = 0
+
+    for start in self.exit_ports:
+      if start in seen:
+        continue
+
+      seen.add(start)
+      stack = [start]
+      exits = 0
+      while stack:
+        port = stack.pop()
+        exits += port in exit_ports
+        index, side = divmod(port, 4)
+        partner = partners[port]
+        if partner != -1 and partner not in seen:
+          seen.add(partner)
+          stack.append(partner)
+        for other in channels[cells[index]][side]:
+          other_port = index * 4 + other
+          if other_port not in seen:
+            seen.add(other_port)
+            stack.append(other_port)
+
+      points += NETWORK_POINTS[exits]
+
+    return points
+
+  def get_longest_path(self, connector: int) -> int:
+    '''
+    Returns the length of the longest road or railway, see find_longest_path.
+    '''
+    return find_longest_path(self.cells, connector, self.links[connector]) # type: ignore
+
+  def get_breakdown(self) -> Dict[str, int]:
+    '''
+    Returns the points of every scoring category and their total, see evaluate_board_breakdown.
+    '''
+    breakdown = {
+      "central": self.central,
+      "networks": self.get_network_points(),
+      "longest_road": self.get_longest_path(ROAD),
+      "longest_railway": self.get_longest_path(RAILWAY),
+      "deductions": self.deductions,
+    }
+    breakdown["score"] = (
+      breakdown["central"] + breakdown["networks"] + breakdown["longest_road"] + breakdown["longest_railway"] - breakdown["deductions"]
+    )
+
+    return breakdown
+
+  def get_score(self) -> int:
+    return (
+      self.central + self.get_network_points() + self.get_longest_path(ROAD) + self.get_longest_path(RAILWAY) - self.deductions
+    )
@@ -0,0 +1,182 @@
+from __future__ import annotations
+from heapq import nlargest
+from typing import Dict, List, Tuple
+from Models.board import CELL_COUNT, CENTRAL_CELLS, EXIT_CELLS, EXIT_CONNECTORS, EXIT_SIDES, NEIGHBOURS, OPPOSITE, Board
+from Models.enums import SquareConnectorType
+from Services.Board.Evaluation.network_engine import NETWORK_POINTS
+from Services.Dice.dice_service import ROUTE_DICE_COUNT
+from Services.Pieces.piece_registry import get_piece_registry
+
+ROAD = SquareConnectorType.road.value
+RAILWAY = SquareConnectorType.railway.value
+
+# Placements of a round at most: the route dice, the special dice and one unique tile.
+PLACEMENTS_PER_ROUND = ROUTE_DICE_COUNT + 2
+
+_CENTRAL = frozenset(CENTRAL_CELLS)
+
+
+class _PieceSides:
+  '''
+  Precomputed per cell and piece id: the exits the piece continues, the deductions for its connectors facing the board
+  edge or an exit it does not continue, and the (neighbour, facing side of the neighbour, connector) of its other
+  connectors. types holds per piece id the connector types of the piece as bitmask (road 1, railway 2).
+  '''
+  __slots__ = ("exits", "fixed_deductions", "sides", "types")
+
+  def __init__(self):
+    connectors = get_piece_registry().connectors_by_id
+    self.types: List[int] = [(ROAD in piece_connectors) | (RAILWAY in piece_connectors) << 1 for piece_connectors in connectors]
+    self.exits: List[List[int]] = []
+    self.fixed_deductions: List[List[int]] = []
+    self.sides: List[List[Tuple[Tuple[int, int, int], ...]]] = []
+    for index in range(CELL_COUNT):
+      exit_side = EXIT_SIDES[index]
+      exits, fixed_deductions, sides = [], [], []
+      for piece_connectors in connectors:
+        fits = exit_side != -1 and piece_connectors[exit_side] == EXIT_CONNECTORS[index][exit_side]
+        if exit_side != -1:
+          deductions = not fits
+        else:
+          deductions = sum(1 for side in range(4) if piece_connectors[side] and NEIGHBOURS[index][side] == -1)
+        exits.append(int(fits))
+        fixed_deductions.append(deductions)
+        sides.append(tuple(
+          (NEIGHBOURS[index][side], OPPOSITE[side], piece_connectors[side]) for side in range(4)
+          if piece_connectors[side] and NEIGHBOURS[index][side] != -1
+        ))
+      self.exits.append(exits)
+      self.fixed_deductions.append(fixed_deductions)
+      self.sides.append(sides)
+
+
+__piece_sides: _PieceSides | None = None
+
+def get_score_upper_bound(board: Board, placements: int) -> int:
+  '''
+  Returns a score, which the board cannot exceed after at most the passed number of further placements, in a single
+  pass over the connectors of its pieces. Every subscore is bounded on its own, per network, i.e. per group of
+  squares connected by roads or railways:
+    - central: every placement fills an empty central square,
+    - networks: networks without a connector facing an empty square keep their exits. A placement joins at most four
+      of the other networks, which are joined with every empty exit square a placement can fill into one network. It
+      scores at least as much as its parts (see NETWORK_POINTS),
+    - longest road and railway: a route visits every square at most once per connected side, also the sides facing
+      an empty square. A placement joins at most four open networks and adds four sides, so the longest route runs
+      over the sides of the largest networks it can join, or stays within a closed one,
+    - deductions: connectors facing the board edge or another piece stay open. Every placement closes at most the
+      connectors facing its square, the squares facing the most open connectors first. New pieces add none.
+  Without further placements central squares and deductions are exact.
+  '''
+  global __piece_sides
+
+  if __piece_sides is None:
+    __piece_sides = _PieceSides()
+  piece_exits, fixed_deductions, piece_sides = __piece_sides.exits, __piece_sides.fixed_deductions, __piece_sides.sides
+  piece_types = __piece_sides.types
+  cells = board.cells
+  connectors = get_piece_registry().connectors_by_id
+  parent = list(range(CELL_COUNT))
+  # Per square the road and railway sides connected to a neighbour and facing an empty square.
+  road_sides = [0] * CELL_COUNT
+  railway_sides = [0] * CELL_COUNT
+  open_road_sides = [0] * CELL_COUNT
+  open_railway_sides = [0] * CELL_COUNT
+  closable = [0] * CELL_COUNT
+  central = deductions = carried = 0
+
+  for index in board.occupied:
+    piece_id = cells[index]
+    central += index in _CENTRAL
+    carried |= piece_types[piece_id]
+    deductions += fixed_deductions[index][piece_id]
+    counts = EXIT_SIDES[index] == -1
+    for neighbour, facing_side, connector in piece_sides[index][piece_id]:
+      other = cells[neighbour]
+      if not other:
+        if connector == ROAD:
+          open_road_sides[index] += 1
+        else:
+          open_railway_sides[index] += 1
+        closable[neighbour] += counts
+      elif connectors[other][facing_side] == connector:
+        if connector == ROAD:
+          road_sides[index] += 1
+        else:
+          railway_sides[index] += 1
+        if neighbour > index:
+          parent[_find(parent, index)] = _find(parent, neighbour)
+      else:
+        deductions += counts
+
+  # Per network: exits, road and railway sides, open road and railway sides.
+  networks: Dict[int, List[int]] = {}
+  for index in board.occupied:
+    root = _find(parent, index)
+    network = networks.get(root)
+    if network is None:
+      network = networks[root] = [0, 0, 0, 0, 0]
+    network[0] += piece_exits[index][cells[index]]
+    network[1] += road_sides[index]
+    network[2] += railway_sides[index]
+    network[3] += open_road_sides[index]
+    network[4] += open_railway_sides[index]
+
+  empty_central = sum(1 for index in CENTRAL_CELLS if not cells[index])
+  empty_exits = sum(1 for index in EXIT_CELLS if not cells[index])
+  if placements:
+    closable.sort()
+    deductions += sum(closable[:-placements])
+  else:
+    deductions += sum(closable)
+
+  return (
+    central + min(empty_central, placements)
+    + _get_network_bound(networks, placements, min(empty_exits, placements))
+    + _get_route_bound(networks, ROAD, placements, carried)
+    + _get_route_bound(networks, RAILWAY, placements, carried)
+    - deductions
+  )
+
+def _find(parent: List[int], index: int) -> int:
+  while parent[index] != index:
+    parent[index] = parent[parent[index]]
+    index = parent[index]
+
+  return index
+
+def _get_network_bound(networks: Dict[int, List[int]], placements: int, new_exits: int) -> int:
+  '''
+  Returns the bound of the network points, see get_score_upper_bound. Every network with an exit adds at least as
+  many points to the joined network as it scores on its own, so the open networks with the most exits are joined.
+  '''
+  points = 0
+  joinable: List[int] = []
+  for exits, _, _, open_road, open_railway in networks.values():
+    if placements and (open_road or open_railway):
+      joinable.append(exits)
+    else:
+      points += NETWORK_POINTS[exits]
+  if not placements:
+    return points
+
+  joinable.sort(reverse=True)
+  joined = 4 * placements
+  points += sum(NETWORK_POINTS[exits] for exits in joinable[joined:])
+
+  return points + NETWORK_POINTS[min(sum(joinable[:joined]) + new_exits, len(NETWORK_POINTS) - 1)]
+
+def _get_route_bound(networks: Dict[int, List[int]], field: int, placements: int, carried: int) -> int:
+  '''
+  Returns the bound of the longest road (field 1) or railway (field 2), see get_score_upper_bound. carried has the
+  bit of the field set, if a piece on the board carries the connector type.
+  '''
+  routes = [network for network in networks.values() if network[field] or network[field + 2]]
+  if not placements:
+    # Squares of the type without connected or open sides still form a route of one square.
+    return max((network[field] for network in routes), default=0) + bool(routes or carried & field)
+
+  longest = max((network[field] for network in routes if not network[field + 2]), default=0)
+  joined = nlargest(4 * placements, (network[field] + network[field + 2] for network in routes if network[field + 2]))
+
+  return max(longest, sum(joined) + 4 * placements) + 1
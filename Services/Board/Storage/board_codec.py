@@ -0,0 +1,58 @@
+from __future__ import annotations
+import struct
+from typing import Tuple
+from Models.board import CELL_COUNT, Board
+from Services.Pieces.piece_registry import get_piece_registry
+
+MAGIC = b"RB"
+VERSION = 1
+FLAG_SCORE = 0x01
+
+# Magic, version and flags, followed by the piece id of every cell (see Board.cells) and, if FLAG_SCORE is set, the
+# score as little endian int16.
+HEADER = struct.Struct("<2sBB")
+SCORE = struct.Struct("<h")
+ENCODED_SIZE = HEADER.size + CELL_COUNT
+ENCODED_SIZE_WITH_SCORE = ENCODED_SIZE + SCORE.size
+
+
+def encode_board(board: Board, score: int | None = None) -> bytes:
+  '''
+  Returns the board as ENCODED_SIZE bytes, or ENCODED_SIZE_WITH_SCORE bytes, if a score is passed.
+  '''
+  if score is None:
+    return HEADER.pack(MAGIC, VERSION, 0) + board.to_bytes()
+
+  return HEADER.pack(MAGIC, VERSION, FLAG_SCORE) + board.to_bytes() + SCORE.pack(score)
+
+def decode_board(data: bytes) -> Tuple[Board, int | None]:
+  '''
+  Returns the board and the score (None, if none was stored) encoded by encode_board.
+  '''
+  if len(data) < HEADER.size:
+    raise ValueError(f"An encoded board has at least {HEADER.size} bytes, got {len(data)}")
+
+  magic, version, flags = HEADER.unpack_from(data)
+  if magic != MAGIC:
+    raise ValueError(f"Data does not start with {MAGIC!r}")
+  if version != VERSION:
+    raise ValueError(f"Unsupported board encoding version {version}")
+
+  has_score = bool(flags & FLAG_SCORE)
+  size = ENCODED_SIZE_WITH_SCORE if has_score else ENCODED_SIZE
+  if len(data) != size:
+    raise ValueError(f"An encoded board has {size} bytes, got {len(data)}")
+
+  cells = bytes(data[HEADER.size:ENCODED_SIZE])
+  validate_cells(cells)
+
+  return Board.from_bytes(cells), SCORE.unpack_from(data, ENCODED_SIZE)[0] if has_score else None
+
+def validate_cells(cells: bytes) -> None:
+  '''
+  Fails, if a cell holds an id, which belongs to no piece.
+  '''
+  piece_count = len(get_piece_registry())
+  invalid = [piece_id for piece_id in cells if piece_id > piece_count]
+  if invalid:
+    raise ValueError(f"Piece ids {invalid} do not exist")
@@ -0,0 +1,77 @@
+from __future__ import annotations
+import os
+from typing import BinaryIO, Iterator, Tuple
+from Services.Board.Storage.board_codec import ENCODED_SIZE, ENCODED_SIZE_WITH_SCORE, FLAG_SCORE, HEADER, MAGIC, VERSION
+
+# Input formats: one grid JSON document per line (jsonl), one grid JSON document per file as written by Board.to_json
+# (json), concatenated boards of encode_board (binary) and position datasets (dataset).
+FORMATS = ("jsonl", "json", "binary", "dataset")
+EXTENSIONS = {".jsonl": "jsonl", ".json": "json", ".bin": "binary", ".rids": "dataset"}
+
+# Boards are read as payloads, which are decoded by the consumer, e.g. in a worker process: the JSON text of the grid
+# (JSON) or the 49 cell bytes of Board.to_bytes (CELLS).
+JSON = 0
+CELLS = 1
+
+# (source, kind, payload), where the source names the file and the line or record of the board.
+BoardPayload = Tuple[str, int, str | bytes]
+
+
+def detect_format(path: str) -> str:
+  '''
+  Returns the format of the file by its extension, jsonl for stdin ("-") and unknown extensions.
+  '''
+  return EXTENSIONS.get(os.path.splitext(path)[1].lower(), "jsonl")
+
+def read_board_payloads(path: str, board_format: str | None = None, stdin: BinaryIO | None = None) -> Iterator[BoardPayload]:
+  '''
+  Yields the boards of a file, or of stdin for "-", one at a time, so no more than one board is held in memory
+  (apart from the JSON format, which holds one board per file anyway).
+  '''
+  board_format = board_format or detect_format(path)
+  if board_format not in FORMATS:
+    raise ValueError(f"Unknown format {board_format}, expected one of {FORMATS}")
+
+  if board_format == "dataset":
+    if path == "-":
+      raise ValueError("Datasets cannot be read from stdin")
+    # Imported here, as it needs numpy, which takes longer to import than most inputs take to score.
+    from Services.Board.Storage.position_dataset import PositionDataset
+
+    dataset = PositionDataset(path)
+    for index in range(len(dataset)):
+      yield f"{path}:{index}", CELLS, dataset.records[index]["cells"].tobytes()
+    return
+
+  if path == "-":
+    yield from _read_stream(stdin, "<stdin>", board_format) # type: ignore
+  else:
+    with open(path, "rb") as stream:
+      yield from _read_stream(stream, path, board_format)
+
+def _read_stream(stream: BinaryIO, source: str, board_format: str) -> Iterator[BoardPayload]:
+  if board_format == "json":
+    yield source, JSON, stream.read().decode()
+  elif board_format == "jsonl":
+    for number, line in enumerate(stream, 1):
+      if line.strip():
+        yield f"{source}:{number}", JSON, line.decode()
+  else:
+    yield from _read_encoded_boards(stream, source)
+
+def _read_encoded_boards(stream: BinaryIO, source: str) -> Iterator[BoardPayload]:
+  index = 0
+  while header := stream.read(HEADER.size):
+    if len(header) != HEADER.size:
+      raise ValueError(f"{source}:{index} is truncated")
+    magic, version, flags = HEADER.unpack(header)
+    if magic != MAGIC or version != VERSION:
+      raise ValueError(f"{source}:{index} is no encoded board of version {VERSION}")
+
+    size = ENCODED_SIZE_WITH_SCORE if flags & FLAG_SCORE else ENCODED_SIZE
+    body = stream.read(size - HEADER.size)
+    if len(body) != size - HEADER.size:
+      raise ValueError(f"{source}:{index} is truncated")
+
+    yield f"{source}:{index}", CELLS, body[:ENCODED_SIZE - HEADER.size]
+    index += 1
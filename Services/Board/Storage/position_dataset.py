@@ -0,0 +1,138 @@
+from __future__ import annotations
+import os
+import struct
+from typing import BinaryIO, Iterator, Sequence, Tuple
+import numpy as np
+from Models.board import BOARD_SIZE, CELL_COUNT, Board
+from Services.Board.Storage.board_codec import validate_cells
+from Services.Pieces.piece_registry import get_piece_registry
+
+MAGIC = b"RIDS"
+VERSION = 1
+
+# Magic, version, record size and 8 reserved bytes, so the records start 8 byte aligned.
+HEADER = struct.Struct("<4sHH8x")
+
+# Positions without score store NO_SCORE.
+NO_SCORE = -(1 << 15)
+RECORD_DTYPE = np.dtype([("cells", np.uint8, (CELL_COUNT,)), ("round", np.uint8), ("score", "<i2")])
+
+
+class PositionDatasetWriter:
+  '''
+  Appends positions as fixed size records (see RECORD_DTYPE) to a dataset file, which is created, if it does not
+  exist. Use as context manager or call close.
+  '''
+
+  def __init__(self, path: str | os.PathLike[str]):
+    exists = os.path.exists(path) and os.path.getsize(path) > 0
+    if exists:
+      _read_header(path)
+
+    self._file: BinaryIO = open(path, "ab")
+    if not exists:
+      self._file.write(HEADER.pack(MAGIC, VERSION, RECORD_DTYPE.itemsize))
+
+  def append(self, board: Board | bytes, score: int | None = None, round: int = 0) -> None:
+    '''
+    Appends a board, or its cells as returned by Board.to_bytes.
+    '''
+    cells = board.to_bytes() if isinstance(board, Board) else bytes(board)
+    if len(cells) != CELL_COUNT:
+      raise ValueError(f"A board consists of {CELL_COUNT} cells, got {len(cells)}")
+    validate_cells(cells)
+
+    record = np.zeros(1, dtype=RECORD_DTYPE)
+    record["cells"] = np.frombuffer(cells, dtype=np.uint8)
+    record["round"] = round
+    record["score"] = NO_SCORE if score is None else score
+    self._file.write(record.tobytes())
+
+  def extend(self, cells: np.ndarray, scores: Sequence[int] | np.ndarray | None = None, rounds: Sequence[int] | np.ndarray | None = None) -> None:
+    '''
+    Appends many positions at once, given as (N, 49) or (N, 7, 7) piece ids (see encode_boards).
+    '''
+    cells = np.asarray(cells, dtype=np.uint8).reshape(-1, CELL_COUNT)
+    if cells.size and cells.max() > _max_piece_id():
+      raise ValueError(f"Piece ids above {_max_piece_id()} do not exist")
+
+    records = np.zeros(len(cells), dtype=RECORD_DTYPE)
+    records["cells"] = cells
+    records["round"] = 0 if rounds is None else rounds
+    records["score"] = NO_SCORE if scores is None else scores
+    self._file.write(records.tobytes())
+
+  def close(self) -> None:
+    self._file.close()
+
+  def __enter__(self) -> PositionDatasetWriter:
+    return self
+
+  def __exit__(self, *_) -> None:
+    self.close()
+
+
+class PositionDataset:
+  '''
+  Read only view of a dataset file. The records are memory mapped, so opening is instant, the pages are shared by all
+  processes, which open the same file, and cells, scores and rounds are views without copies.
+  '''
+
+  def __init__(self, path: str | os.PathLike[str]):
+    self.path = path
+    _read_header(path)
+
+    count = (os.path.getsize(path) - HEADER.size) // RECORD_DTYPE.itemsize
+    if count:
+      self.records = np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=HEADER.size, shape=(count,))
+    else:
+      # Empty files cannot be mapped.
+      self.records = np.zeros(0, dtype=RECORD_DTYPE)
+
+  def __len__(self) -> int:
+    return len(self.records)
+
+  @property
+  def cells(self) -> np.ndarray:
+    '''
+    The piece ids as (N, 7, 7) array, which may be passed to evaluate_boards_batch.
+    '''
+    return self.records["cells"].reshape(-1, BOARD_SIZE, BOARD_SIZE)
+
+  @property
+  def scores(self) -> np.ndarray:
+    return self.records["score"]
+
+  @property
+  def rounds(self) -> np.ndarray:
+    return self.records["round"]
+
+  def get_board(self, index: int) -> Tuple[Board, int | None]:
+    '''
+    Returns the board and score (None, if none was stored) of a record.
+    '''
+    record = self.records[index]
+    score = int(record["score"])
+
+    return Board.from_bytes(record["cells"].tobytes()), None if score == NO_SCORE else score
+
+  def __iter__(self) -> Iterator[Tuple[Board, int | None]]:
+    for index in range(len(self)):
+      yield self.get_board(index)
+
+
+def _read_header(path: str | os.PathLike[str]) -> None:
+  with open(path, "rb") as file:
+    header = file.read(HEADER.size)
+
+  if len(header) != HEADER.size:
+    raise ValueError(f"{path} is no position dataset")
+
+  magic, version, record_size = HEADER.unpack(header)
+  if magic != MAGIC:
+    raise ValueError(f"{path} is no position dataset")
+  if version != VERSION or record_size != RECORD_DTYPE.itemsize:
+    raise ValueError(f"{path} has unsupported version {version} with records of {record_size} bytes")
+
+def _max_piece_id() -> int:
+  return len(get_piece_registry())
@@ -0,0 +1,123 @@
+from operator import itemgetter
+from typing import Callable, List, Tuple
+from Models.board import BOARD_SIZE, CELL_COUNT, ZOBRIST_KEYS, Board, cell_coordinates, cell_index
+from Services.Moves.move_generator import Placement
+from Services.Pieces.piece_registry import get_piece_registry
+
+# The exits mirror each other left to right and top to bottom, so the board's symmetry group consists of the identity,
+# both reflections and their composition, the rotation by 180 degrees. Every transformation is its own inverse.
+IDENTITY, LEFT_RIGHT, TOP_BOTTOM, ROTATE_180 = 0, 1, 2, 3
+SYMMETRIES: Tuple[str, ...] = ("identity", "left_right", "top_bottom", "rotate_180")
+
+# Piece id of pieces without an image under a transformation, e.g. curved stations under reflections.
+NO_IMAGE = 0xFF
+
+_LAST = BOARD_SIZE - 1
+_COORDINATES: Tuple[Callable[[int, int], Tuple[int, int]], ...] = (
+  lambda x, y: (x, y),
+  lambda x, y: (_LAST - x, y),
+  lambda x, y: (x, _LAST - y),
+  lambda x, y: (_LAST - x, _LAST - y),
+)
+# (north, east, south, west) of the image are taken from these sides of the piece.
+_SIDES: Tuple[Tuple[int, int, int, int], ...] = ((0, 1, 2, 3), (0, 3, 2, 1), (2, 1, 0, 3), (2, 3, 0, 1))
+
+
+def _create_piece_images() -> Tuple[bytes, ...]:
+  '''
+  Returns for every transformation a 256 byte translation table from piece id to the id of its image, which is the
+  piece of the same dice with the transformed connectors. Stations keep their station, as the dice is kept.
+  '''
+  registry = get_piece_registry()
+  images: List[bytes] = []
+
+  for sides in _SIDES:
+    table = bytearray([NO_IMAGE]) * 256
+    table[0] = 0
+    for piece in registry.pieces:
+      connectors = tuple(piece.connectors[side] for side in sides)
+      candidates = [other for other in registry.get_for_dice(piece.dice) if other.connectors == connectors]
+      if candidates:
+        table[piece.id] = candidates[0].id
+    images.append(bytes(table))
+
+  return tuple(images)
+
+def _create_cell_permutations() -> Tuple[Callable[[bytes], Tuple[int, ...]], ...]:
+  '''
+  Returns for every transformation a function picking the cells of a board in the order of the transformed board.
+  '''
+  permutations = []
+  for transform in _COORDINATES:
+    sources = [cell_index(*transform(*cell_coordinates(index))) for index in range(CELL_COUNT)]
+    permutations.append(itemgetter(*sources))
+
+  return tuple(permutations)
+
+__piece_images: Tuple[bytes, ...] | None = None
+_CELL_PERMUTATIONS = _create_cell_permutations()
+
+def _get_piece_images() -> Tuple[bytes, ...]:
+  global __piece_images
+
+  if __piece_images is None:
+    __piece_images = _create_piece_images()
+
+  return __piece_images
+
+def transform_cells(cells: bytes, symmetry: int) -> bytes | None:
+  '''
+  Returns the cells (see Board.cells) of the board transformed by the symmetry, or None, if a piece on the board has no
+  image under it.
+  '''
+  transformed = bytes(_CELL_PERMUTATIONS[symmetry](cells)).translate(_get_piece_images()[symmetry])
+  return None if NO_IMAGE in transformed else transformed
+
+def transform_board(board: Board, symmetry: int) -> Board | None:
+  '''
+  Returns the board transformed by the symmetry, see transform_cells.
+  '''
+  cells = transform_cells(board.to_bytes(), symmetry)
+  return None if cells is None else Board.from_bytes(cells)
+
+def transform_placement(placement: Placement, symmetry: int) -> Placement:
+  '''
+  Returns the placement transformed by the symmetry. As every transformation is its own inverse, this also maps a
+  placement on a canonical board back to the original board.
+  '''
+  index, piece_id = placement
+  return cell_index(*_COORDINATES[symmetry](*cell_coordinates(index))), _get_piece_images()[symmetry][piece_id]
+
+def canonicalize_cells(cells: bytes) -> Tuple[bytes, int]:
+  '''
+  Returns the canonical representative of the cells, the lexicographically smallest transformation, together with the
+  symmetry leading to it. Symmetric boards have the same representative.
+  '''
+  cells = bytes(cells)
+  best, best_symmetry = cells, IDENTITY
+
+  for symmetry in (LEFT_RIGHT, TOP_BOTTOM, ROTATE_180):
+    transformed = transform_cells(cells, symmetry)
+    if transformed is not None and transformed < best:
+      best, best_symmetry = transformed, symmetry
+
+  return best, best_symmetry
+
+def canonicalize(board: Board) -> Tuple[Board, int]:
+  '''
+  Returns the canonical representative of the board and the symmetry leading to it, see canonicalize_cells.
+  '''
+  cells, symmetry = canonicalize_cells(board.to_bytes())
+  return Board.from_bytes(cells), symmetry
+
+def get_canonical_hash(board: Board) -> int:
+  '''
+  Returns the Zobrist hash (see Board.zobrist_hash) of the canonical representative of the board, e.g. as key of a
+  TranspositionTable shared by symmetric boards.
+  '''
+  cells, _ = canonicalize_cells(board.to_bytes())
+  canonical_hash = 0
+  for index, piece_id in enumerate(cells):
+    canonical_hash ^= ZOBRIST_KEYS[index][piece_id]
+
+  return canonical_hash
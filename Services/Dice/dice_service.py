@@ -0,0 +1,103 @@
+from __future__ import annotations
+from itertools import combinations_with_replacement
+from math import factorial
+from random import Random
+from typing import List, Sequence, Tuple
+from Models.enums import BasicDice, SpecialDice
+from Services.Pieces.piece_registry import Dice
+
+ROUTE_DICE_COUNT = 3
+BASIC_FACES = tuple(BasicDice)
+SPECIAL_FACES = tuple(SpecialDice)
+# Number of distinct roll ids, see encode_roll.
+ROLL_ID_COUNT = len(BASIC_FACES) ** ROUTE_DICE_COUNT * len(SPECIAL_FACES)
+
+# A distinct roll of a round, with the route dice in ascending order, and its probability.
+RollOutcome = Tuple[Tuple[Dice, ...], float]
+
+
+def roll_dice(rng: Random) -> List[Dice]:
+  '''
+  Rolls the dice of one round: three route dice, which show a BasicDice face each, and the special dice.
+  '''
+  roll: List[Dice] = [rng.choice(BASIC_FACES) for _ in range(ROUTE_DICE_COUNT)]
+  roll.append(rng.choice(SPECIAL_FACES))
+
+  return roll
+
+def encode_roll(roll: Sequence[Dice]) -> int:
+  '''
+  Returns an id for the roll, which does not depend on the order of the route dice. Rolls with the same faces share
+  an id.
+  '''
+  basic = sorted(dice.value for dice in roll if isinstance(dice, BasicDice))
+  special = [dice.value for dice in roll if isinstance(dice, SpecialDice)]
+  if len(basic) != ROUTE_DICE_COUNT or len(special) != 1:
+    raise ValueError(f"A roll consists of {ROUTE_DICE_COUNT} route dice and one special dice, got {list(roll)}")
+
+  roll_id = 0
+  for value in basic:
+    roll_id = roll_id * len(BASIC_FACES) + value
+
+  return roll_id * len(SPECIAL_FACES) + special[0]
+
+def encode_dice(dice: Sequence[Dice]) -> bytes:
+  '''
+  Returns the dice faces as one byte each, route dice as their BasicDice value, the special dice as 6 + its
+  SpecialDice value.
+  '''
+  return bytes(face.value if isinstance(face, BasicDice) else len(BASIC_FACES) + face.value for face in dice)
+
+def decode_dice(data: bytes) -> List[Dice]:
+  '''
+  Returns the dice faces encoded by encode_dice.
+  '''
+  return [BASIC_FACES[value] if value < len(BASIC_FACES) else SPECIAL_FACES[value - len(BASIC_FACES)] for value in data]
+
+__roll_outcomes: Tuple[RollOutcome, ...] | None = None
+
+def get_roll_outcomes() -> Tuple[RollOutcome, ...]:
+  '''
+  Returns every distinct roll of a round once, i.e. every multiset of route dice faces with every special dice face,
+  ordered by encode_roll, with the probability of rolling it. The probabilities sum to 1.
+  '''
+  global __roll_outcomes
+
+  if __roll_outcomes is None:
+    outcomes: List[RollOutcome] = []
+    rolls = len(BASIC_FACES) ** ROUTE_DICE_COUNT * len(SPECIAL_FACES)
+    for basic in combinations_with_replacement(BASIC_FACES, ROUTE_DICE_COUNT):
+      orders = factorial(ROUTE_DICE_COUNT)
+      for face in set(basic):
+        orders //= factorial(basic.count(face))
+      outcomes.extend((basic + (special,), orders / rolls) for special in SPECIAL_FACES)
+    __roll_outcomes = tuple(outcomes)
+
+  return __roll_outcomes
+
+__roll_probabilities: List[float] | None = None
+
+def get_roll_probability(roll: Sequence[Dice]) -> float:
+  '''
+  Returns the probability of rolling the faces of the roll in any order, looked up by its id (see encode_roll).
+  '''
+  global __roll_probabilities
+
+  if __roll_probabilities is None:
+    probabilities = [0.0] * ROLL_ID_COUNT
+    for outcome, probability in get_roll_outcomes():
+      probabilities[encode_roll(outcome)] = probability
+    __roll_probabilities = probabilities
+
+  return __roll_probabilities[encode_roll(roll)]
+
+def encode_dice_multiset(dice: Sequence[Dice]) -> int:
+  '''
+  Returns an id for the faces of the dice, which does not depend on their order, e.g. to key the dice remaining in a
+  round. Every face takes two bits for its count, which holds the faces of one roll.
+  '''
+  multiset = 0
+  for face in dice:
+    multiset += 1 << 2 * (face.value if isinstance(face, BasicDice) else len(BASIC_FACES) + face.value)
+
+  return multiset
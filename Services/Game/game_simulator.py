@@ -0,0 +1,176 @@
+from __future__ import annotations
+from random import Random
+from typing import List, Sequence, Tuple
+from Models.board import CELL_COUNT, EXIT_CELLS, EXIT_CONNECTORS, NEIGHBOURS, OPPOSITE
+from Models.enums import BasicDice, SpecialDice, UniqueTiles
+from Models.game import MAX_UNIQUE_TILES, ROUNDS
+from Services.Moves.move_generator import FACING_COUNT, Placement, facing_index, get_cell_facing, get_placement_tables
+from Services.Pieces.piece_registry import Dice, get_piece_registry
+
+# Dice are plain ints in the simulator: route dice 0-5 (BasicDice values), the special dice 6-8 (6 + SpecialDice
+# value), as in encode_dice.
+SPECIAL_DICE_OFFSET = len(BasicDice)
+
+
+class _SimulatorTables:
+  '''
+  Lookup tables of the simulator, which replace all piece and board objects by ints.
+
+  dice_tables[mask][facing] holds the legal piece ids (see PlacementTables) of all dice in the bitmask of dice, built
+  on first use. unique_tables[mask][facing] holds those of the unique tiles, which are not set in the bitmask of
+  used tiles. piece_dice[piece id] is the dice of a piece and -1 for unique tiles, piece_tiles[piece id] the unique
+  tile of a piece or -1. facing_deltas[cell][piece id] are the (neighbour, facing change) pairs caused by placing the
+  piece on the cell.
+  '''
+
+  def __init__(self):
+    registry = get_piece_registry()
+    tables = get_placement_tables()
+    faces = list(BasicDice) + list(SpecialDice)
+    tiles = list(UniqueTiles)
+
+    self._face_tables = tuple(tables.get_table(face) for face in faces)
+    self.dice_tables: List[Tuple[Tuple[int, ...], ...] | None] = [None] * (1 << len(faces))
+    self.unique_tables = tuple(
+      _combine_tables([tables.get_table(tile) for tile in tiles if not used & 1 << tile.value]) for used in range(1 << len(tiles))
+    )
+    self.piece_dice: Tuple[int, ...] = (-1,) + tuple(faces.index(piece.dice) if not isinstance(piece.dice, UniqueTiles) else -1 for piece in registry.pieces)
+    self.piece_tiles: Tuple[int, ...] = (-1,) + tuple(piece.dice.value if isinstance(piece.dice, UniqueTiles) else -1 for piece in registry.pieces)
+    self.initial_facing: Tuple[int, ...] = tuple(facing_index(*EXIT_CONNECTORS[index]) for index in range(CELL_COUNT))
+
+    weights = (1, 3, 9, 27)
+    self.facing_deltas: Tuple[Tuple[Tuple[Tuple[int, int], ...], ...], ...] = tuple(
+      tuple(
+        tuple(
+          (NEIGHBOURS[index][side], connectors[side] * weights[OPPOSITE[side]])
+          for side in range(4) if connectors[side] and NEIGHBOURS[index][side] != -1
+        )
+        for connectors in registry.connectors_by_id
+      )
+      for index in range(CELL_COUNT)
+    )
+
+  def build_dice_table(self, mask: int) -> Tuple[Tuple[int, ...], ...]:
+    table = _combine_tables([self._face_tables[face] for face in range(len(self._face_tables)) if mask & 1 << face])
+    self.dice_tables[mask] = table
+
+    return table
+
+
+def _combine_tables(tables: List[Tuple[Tuple[int, ...], ...]]) -> Tuple[Tuple[int, ...], ...]:
+  return tuple(tuple(piece_id for table in tables for piece_id in table[facing]) for facing in range(FACING_COUNT))
+
+
+__tables: _SimulatorTables | None = None
+
+def _get_tables() -> _SimulatorTables:
+  global __tables
+
+  if __tables is None:
+    __tables = _SimulatorTables()
+
+  return __tables
+
+def play_random_game(seed: int | None = None, rounds: int = ROUNDS) -> bytearray:
+  '''
+  Plays a game with uniformly random legal placements and returns the final cells (see Board.cells), e.g. to be
+  scored with Board.from_bytes and evaluate_board_position or in bulk with evaluate_boards_batch.
+
+  The game follows the rules of Game: every round rolls the three route dice and the special dice, which are placed
+  until none of them fits any more. The placements of the allowed unique tiles are offered throughout the round, also
+  once the dice are placed, together with ending the round (see get_legal_moves).
+
+  This is the hot path for rollouts and allocates nothing per placement. It only works on ints: the board is the
+  cell array, every cell carries its facing index (see facing_index), which is updated per placement together with
+  the frontier. The placements are not listed, but counted from precomputed tables per facing and the chosen one is
+  looked up in a second pass.
+  '''
+  tables = _get_tables()
+  dice_tables, unique_tables = tables.dice_tables, tables.unique_tables
+  piece_dice, piece_tiles, facing_deltas = tables.piece_dice, tables.piece_tiles, tables.facing_deltas
+  randrange = Random(seed).randrange
+
+  cells = bytearray(CELL_COUNT)
+  facing: List[int] = list(tables.initial_facing)
+  frontier = set(EXIT_CELLS)
+  dice = [0, 0, 0, 0]
+  used_tiles = 0
+  tile_count = 0
+
+  for _ in range(rounds):
+    dice[0], dice[1], dice[2] = randrange(SPECIAL_DICE_OFFSET), randrange(SPECIAL_DICE_OFFSET), randrange(SPECIAL_DICE_OFFSET)
+    dice[3] = SPECIAL_DICE_OFFSET + randrange(len(SpecialDice))
+    remaining = 4
+    tile_allowed = tile_count < MAX_UNIQUE_TILES
+
+    while True:
+      count = 0
+      if remaining:
+        mask = 0
+        for position in range(remaining):
+          mask |= 1 << dice[position]
+        table = dice_tables[mask] or tables.build_dice_table(mask)
+        for index in frontier:
+          count += len(table[facing[index]])
+
+      tile_table = unique_tables[used_tiles]
+      tile_placements = 0
+      if tile_allowed:
+        for index in frontier:
+          tile_placements += len(tile_table[facing[index]])
+
+      # Once no dice can be placed, ending the round is one more move.
+      chosen = randrange(count + tile_placements + (not count))
+      if chosen >= count + tile_placements:
+        break
+      is_tile = chosen >= count
+      if is_tile:
+        table, chosen = tile_table, chosen - count
+
+      for index in frontier:
+        options = table[facing[index]]
+        if chosen < len(options):
+          piece_id = options[chosen]
+          break
+        chosen -= len(options)
+
+      cells[index] = piece_id
+      frontier.discard(index)
+      for neighbour, delta in facing_deltas[index][piece_id]:
+        facing[neighbour] += delta
+        if not cells[neighbour]:
+          frontier.add(neighbour)
+
+      if is_tile:
+        used_tiles |= 1 << piece_tiles[piece_id]
+        tile_count += 1
+        tile_allowed = False
+      else:
+        remaining -= 1
+        position = dice.index(piece_dice[piece_id], 0, remaining + 1)
+        dice[position], dice[remaining] = dice[remaining], dice[position]
+
+  return cells
+
+def get_legal_moves(cells: bytes, dice: Sequence[Dice], used_unique_tiles: int, unique_tile_allowed: bool) -> List[Placement]:
+  '''
+  Returns the placements play_random_game chooses from for the remaining dice on the cells, from the same tables:
+  those of the dice and, if a unique tile is allowed, those of the unique tiles, which are not set in the bitmask of
+  used tiles. If no dice can be placed, play_random_game may end the round as well.
+  '''
+  tables = _get_tables()
+  faces = list(BasicDice) + list(SpecialDice)
+  mask = 0
+  for face in dice:
+    mask |= 1 << faces.index(face)
+  table = (tables.dice_tables[mask] or tables.build_dice_table(mask)) if mask else None
+
+  board_cells = bytearray(cells)
+  facing = [get_cell_facing(board_cells, index) for index in range(CELL_COUNT)]
+  frontier = sorted(index for index in range(CELL_COUNT) if not cells[index] and facing[index])
+  placements = [(index, piece_id) for index in frontier for piece_id in table[facing[index]]] if table else []
+  if unique_tile_allowed:
+    tile_table = tables.unique_tables[used_unique_tiles]
+    placements.extend((index, piece_id) for index in frontier for piece_id in tile_table[facing[index]])
+
+  return placements
@@ -0,0 +1,216 @@
+from __future__ import annotations
+import json
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from random import Random
+from typing import Callable, Dict, Iterator, List, Tuple
+import numpy as np
+from Models.board import CELL_COUNT, Board
+from Models.enums import UniqueTiles
+from Models.game import ROUNDS
+from Services.Board.Evaluation.board_evaluation_service import evaluate_board_breakdown
+from Services.Dice.dice_service import roll_dice
+from Services.Pieces.piece_registry import get_piece_registry
+from Services.Search.rollout_policies import RolloutPolicy, random_rollout
+
+# The subscores stored per position, as returned by evaluate_board_breakdown for the final board.
+SUBSCORES = ("central", "networks", "longest_road", "longest_railway", "deductions", "score")
+
+# Every shard holds the positions of games_per_shard consecutive game seeds, shard k starting at seed + k *
+# games_per_shard. Shards are written under a temporary name and renamed, once complete, so a shard file is either
+# complete or missing, and missing shards are played again on resume.
+SHARD_NAME = "shard-{:06d}.npz"
+MANIFEST_NAME = "manifest.json"
+# The rules the games follow, kept in the manifest, as shards of games without unique tiles (before the rules of Game
+# were followed) must not be mixed with those of games with them.
+RULES = "unique_tiles"
+
+# Called with the report after every shard written.
+Progress = Callable[["SelfPlayReport"], None]
+
+
+class SelfPlayReport:
+  '''
+  Counts of generate_self_play: the games and positions played by this call, the shards written and those, which
+  already existed and were skipped, and the seconds elapsed.
+  '''
+  __slots__ = ("games", "positions", "shards", "skipped", "elapsed")
+
+  def __init__(self):
+    self.games = 0
+    self.positions = 0
+    self.shards = 0
+    self.skipped = 0
+    self.elapsed = 0.0
+
+  @property
+  def games_per_second(self) -> float:
+    return self.games / self.elapsed if self.elapsed else 0.0
+
+  @property
+  def positions_per_second(self) -> float:
+    return self.positions / self.elapsed if self.elapsed else 0.0
+
+  def __repr__(self) -> str:
+    return (
+      f"SelfPlayReport(games={self.games}, positions={self.positions}, shards={self.shards}, skipped={self.skipped}, "
+      f"{self.games_per_second:.0f} games/s, {self.positions_per_second:.0f} positions/s)"
+    )
+
+
+def play_policy_game(policy: RolloutPolicy, seed: int, rounds: int = ROUNDS) -> Tuple[Board, List[int]]:
+  '''
+  Plays a game with the policy, one round per call with no remaining rounds, and returns the final board, whose
+  placement_history lists the placements in order, and the round of every placement. The policy follows the rules of
+  Game, unique tiles included, as the used unique tiles are passed from round to round.
+
+  The dice are rolled from their own stream, so every policy sees the same dice for a seed, as long as it does not
+  roll dice itself.
+  '''
+  board = Board()
+  dice_rng, policy_rng = Random(2 * seed), Random(2 * seed + 1)
+  placement_rounds: List[int] = []
+  used_unique_tiles = 0
+  for round in range(1, rounds + 1):
+    used_unique_tiles = policy(board, roll_dice(dice_rng), 0, policy_rng, used_unique_tiles, True)
+    placement_rounds.extend([round] * (board.undo_depth - len(placement_rounds)))
+
+  return board, placement_rounds
+
+def play_shard(policy: RolloutPolicy, first_seed: int, games: int) -> Dict[str, np.ndarray]:
+  '''
+  Plays the games with the seeds from first_seed on and returns the arrays of a shard: per position after every
+  placement its cells, round, bitmask of the used unique tiles (see Game), game seed and the subscores of the final
+  board (see SUBSCORES).
+  '''
+  piece_tiles = [1 << piece.dice.value if piece and isinstance(piece.dice, UniqueTiles) else 0 for piece in get_piece_registry().pieces_by_id]
+  cells: List[np.ndarray] = []
+  rounds: List[int] = []
+  unique_tiles: List[int] = []
+  seeds: List[int] = []
+  subscores: Dict[str, List[int]] = {name: [] for name in SUBSCORES}
+  for seed in range(first_seed, first_seed + games):
+    board, placement_rounds = play_policy_game(policy, seed)
+    history = board.placement_history
+    final = np.frombuffer(bytes(board.cells), dtype=np.uint8)
+    # Position k holds the pieces of the first k + 1 placements.
+    order = np.full(CELL_COUNT, len(history), dtype=np.int32)
+    order[list(history)] = np.arange(len(history))
+    cells.append(np.where(order[None, :] <= np.arange(len(history))[:, None], final[None, :], 0).astype(np.uint8))
+
+    rounds.extend(placement_rounds)
+    used = 0
+    for index in history:
+      used |= piece_tiles[board.cells[index]]
+      unique_tiles.append(used)
+    seeds.extend([seed] * len(history))
+    breakdown = evaluate_board_breakdown(board)
+    for name in SUBSCORES:
+      subscores[name].extend([breakdown[name]] * len(history))
+
+  return {
+    "cells": np.concatenate(cells) if cells else np.zeros((0, CELL_COUNT), dtype=np.uint8),
+    "round": np.array(rounds, dtype=np.uint8),
+    "unique_tiles": np.array(unique_tiles, dtype=np.uint8),
+    "seed": np.array(seeds, dtype=np.int64),
+    **{name: np.array(values, dtype=np.int16) for name, values in subscores.items()},
+  }
+
+def generate_self_play(
+  directory: str | os.PathLike[str],
+  games: int,
+  policy: RolloutPolicy = random_rollout,
+  seed: int = 0,
+  games_per_shard: int = 1000,
+  workers: int = 1,
+  executor: Executor | None = None,
+  progress: Progress | None = None,
+) -> SelfPlayReport:
+  '''
+  Plays the games with the seeds from seed on with the policy and writes their positions as compressed npz shards
+  (see play_shard) into the directory. Every worker process plays and writes whole shards, so only their counts pass
+  through this process.
+
+  Runs are resumable: shards, which exist already, are skipped, so a run interrupted or extended to more games only
+  plays the missing shards and the last shard again, if it was not full. The directory keeps the seed, shard size,
+  policy and rules in a manifest and rejects runs, which would mix other games in. Policies have to be module level functions,
+  so they can be pickled by reference.
+  '''
+  os.makedirs(directory, exist_ok=True)
+  _check_manifest(directory, {"seed": seed, "games_per_shard": games_per_shard, "policy": _policy_name(policy), "rules": RULES})
+
+  start = time.perf_counter()
+  report = SelfPlayReport()
+  tasks = []
+  for shard in range((games + games_per_shard - 1) // games_per_shard):
+    path = os.path.join(directory, SHARD_NAME.format(shard))
+    first_seed, shard_games = seed + shard * games_per_shard, min(games_per_shard, games - shard * games_per_shard)
+    if os.path.exists(path) and _count_games(path, first_seed) >= shard_games:
+      report.skipped += 1
+    else:
+      tasks.append((policy, first_seed, shard_games, path))
+
+  if executor is None and workers <= 1:
+    results: Iterator[Tuple[int, int]] = (write_shard(*task) for task in tasks)
+    _record(results, report, start, progress)
+  elif executor is None:
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+      _record(pool.map(write_shard, *zip(*tasks)) if tasks else iter(()), report, start, progress)
+  else:
+    _record(executor.map(write_shard, *zip(*tasks)) if tasks else iter(()), report, start, progress)
+
+  report.elapsed = time.perf_counter() - start
+  return report
+
+def write_shard(policy: RolloutPolicy, first_seed: int, games: int, path: str) -> Tuple[int, int]:
+  '''
+  Plays the games of a shard and writes it to the path. Returns the games and positions played. Runs in the worker
+  processes.
+  '''
+  arrays = play_shard(policy, first_seed, games)
+  temporary = f"{path}.tmp"
+  with open(temporary, "wb") as file:
+    np.savez_compressed(file, **arrays)
+  os.replace(temporary, path)
+
+  return games, len(arrays["round"])
+
+def read_shards(directory: str | os.PathLike[str]) -> Iterator[Dict[str, np.ndarray]]:
+  '''
+  Yields the arrays of every shard in the directory in shard order, see play_shard.
+  '''
+  for name in sorted(os.listdir(directory)):
+    if name.startswith("shard-") and name.endswith(".npz"):
+      with np.load(os.path.join(directory, name)) as shard:
+        yield {key: shard[key] for key in shard.files}
+
+
+def _record(results: Iterator[Tuple[int, int]], report: SelfPlayReport, start: float, progress: Progress | None) -> None:
+  for games, positions in results:
+    report.games += games
+    report.positions += positions
+    report.shards += 1
+    report.elapsed = time.perf_counter() - start
+    if progress is not None:
+      progress(report)
+
+def _count_games(path: str, first_seed: int) -> int:
+  with np.load(path) as shard:
+    seeds = shard["seed"]
+
+  return int(seeds[-1]) - first_seed + 1 if len(seeds) else 0
+
+def _policy_name(policy: RolloutPolicy) -> str:
+  return f"{policy.__module__}.{policy.__qualname__}"
+
+def _check_manifest(directory: str | os.PathLike[str], manifest: Dict[str, int | str]) -> None:
+  path = os.path.join(directory, MANIFEST_NAME)
+  if os.path.exists(path):
+    with open(path) as file:
+      existing = json.load(file)
+    if existing != manifest:
+      raise ValueError(f"{directory} holds games of {existing}, cannot add games of {manifest}")
+  else:
+    with open(path, "w") as file:
+      json.dump(manifest, file)
@@ -0,0 +1,158 @@
+from __future__ import annotations
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from statistics import NormalDist
+from typing import Dict, List, Sequence, Tuple
+import numpy as np
+from Services.Board.Evaluation.board_evaluation_service import evaluate_board_breakdown
+from Services.Game.self_play import SUBSCORES, play_policy_game
+from Services.Search.rollout_policies import RolloutPolicy
+
+SCORE = SUBSCORES.index("score")
+
+
+class PairedDifference:
+  '''
+  The mean difference of the final scores of two policies over the same seeds, with its confidence interval, using the
+  normal approximation of the mean.
+  '''
+  __slots__ = ("mean", "low", "high", "confidence")
+
+  def __init__(self, mean: float, low: float, high: float, confidence: float):
+    self.mean = mean
+    self.low = low
+    self.high = high
+    self.confidence = confidence
+
+  @property
+  def significant(self) -> bool:
+    '''
+    Whether the interval excludes no difference.
+    '''
+    return self.low > 0 or self.high < 0
+
+  def __repr__(self) -> str:
+    return f"PairedDifference(mean={self.mean:.3f}, {self.confidence:.0%} interval=[{self.low:.3f}, {self.high:.3f}])"
+
+
+class TournamentReport:
+  '''
+  The result of play_tournament: scores[game, policy, subscore] holds the subscores of the final boards (see
+  SUBSCORES) of every game per policy, in the order the policies were passed.
+  '''
+  __slots__ = ("names", "seeds", "scores", "elapsed")
+
+  def __init__(self, names: List[str], seeds: np.ndarray, scores: np.ndarray, elapsed: float):
+    self.names = names
+    self.seeds = seeds
+    self.scores = scores
+    self.elapsed = elapsed
+
+  @property
+  def games(self) -> int:
+    return len(self.scores)
+
+  @property
+  def games_per_second(self) -> float:
+    '''
+    Games played per second, counting every policy's game of a seed.
+    '''
+    return self.games * len(self.names) / self.elapsed if self.elapsed else 0.0
+
+  def get_mean(self, name: str) -> float:
+    return float(self._final_scores(name).mean())
+
+  def get_variance(self, name: str) -> float:
+    '''
+    The sample variance of the final scores.
+    '''
+    return float(self._final_scores(name).var(ddof=1)) if self.games > 1 else 0.0
+
+  def get_breakdown(self, name: str) -> Dict[str, float]:
+    '''
+    The mean points of every scoring category, see evaluate_board_breakdown.
+    '''
+    means = self.scores[:, self.names.index(name)].mean(axis=0)
+    return {subscore: float(mean) for subscore, mean in zip(SUBSCORES, means)}
+
+  def get_paired_difference(self, name: str, baseline: str, confidence: float = 0.95) -> PairedDifference:
+    '''
+    Returns the mean difference of the final scores of the policy and the baseline, game by game on the same seeds.
+    Pairing removes the variance the dice cause for both policies alike, so the interval is narrower than that of the
+    difference of the means.
+    '''
+    differences = self._final_scores(name).astype(np.float64) - self._final_scores(baseline)
+    mean = float(differences.mean())
+    if self.games < 2:
+      return PairedDifference(mean, float("-inf"), float("inf"), confidence)
+
+    margin = NormalDist().inv_cdf((1 + confidence) / 2) * float(differences.std(ddof=1)) / np.sqrt(self.games)
+    return PairedDifference(mean, mean - margin, mean + margin, confidence)
+
+  def _final_scores(self, name: str) -> np.ndarray:
+    return self.scores[:, self.names.index(name), SCORE]
+
+
+def play_tournament(
+  policies: Dict[str, RolloutPolicy],
+  games: int,
+  seed: int = 0,
+  workers: int = 1,
+  chunk_size: int = 100,
+  executor: Executor | None = None,
+) -> TournamentReport:
+  '''
+  Plays the games with the seeds from seed on with every policy (see play_policy_game), so all policies play the same
+  dice stream per seed, as all players of a game share the dice. The games follow the rules of Game, so the policies
+  are compared on placing the unique tiles as well. The seeds are played in chunks of chunk_size by the
+  worker processes, every chunk by all policies. With a single worker and no executor, they are played in this
+  process. Policies have to be module level functions, so they can be pickled by reference.
+  '''
+  if not policies:
+    raise ValueError("A tournament needs at least one policy")
+
+  start = time.perf_counter()
+  names = list(policies)
+  chunks = [(list(policies.values()), first_seed, min(chunk_size, seed + games - first_seed)) for first_seed in range(seed, seed + games, chunk_size)]
+
+  if executor is None and workers <= 1:
+    results = [play_games(*chunk) for chunk in chunks]
+  elif executor is None:
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+      results = list(pool.map(play_games, *zip(*chunks))) if chunks else []
+  else:
+    results = list(executor.map(play_games, *zip(*chunks))) if chunks else []
+
+  scores = np.concatenate(results) if results else np.zeros((0, len(names), len(SUBSCORES)), dtype=np.int16)
+  return TournamentReport(names, np.arange(seed, seed + games), scores, time.perf_counter() - start)
+
+def play_games(policies: Sequence[RolloutPolicy], first_seed: int, games: int) -> np.ndarray:
+  '''
+  Plays the games with the seeds from first_seed on with every policy and returns the subscores of the final boards
+  as (games, policies, subscores) array. Runs in the worker processes.
+  '''
+  scores = np.zeros((games, len(policies), len(SUBSCORES)), dtype=np.int16)
+  for game in range(games):
+    for column, policy in enumerate(policies):
+      board, _ = play_policy_game(policy, first_seed + game)
+      breakdown = evaluate_board_breakdown(board)
+      scores[game, column] = [breakdown[subscore] for subscore in SUBSCORES]
+
+  return scores
+
+def summarize(report: TournamentReport, baseline: str | None = None, confidence: float = 0.95) -> List[Tuple[str, Dict[str, float]]]:
+  '''
+  Returns a row per policy with its mean, variance and breakdown and, for all but the baseline (by default the first
+  policy), the paired difference to the baseline and its confidence interval.
+  '''
+  baseline = baseline if baseline is not None else report.names[0]
+  rows = []
+  for name in report.names:
+    row = {"mean": report.get_mean(name), "variance": report.get_variance(name), **report.get_breakdown(name)}
+    del row["score"]
+    if name != baseline:
+      difference = report.get_paired_difference(name, baseline, confidence)
+      row.update({"difference": difference.mean, "difference_low": difference.low, "difference_high": difference.high})
+    rows.append((name, row))
+
+  return rows
@@ -0,0 +1,162 @@
+from __future__ import annotations
+from typing import Dict, List, Sequence, Tuple
+from Models.board import BOARD_SIZE, Board, get_facing_connectors
+from Models.enums import UniqueTiles
+from Models.piece import Piece
+from Services.Pieces.piece_registry import Dice, PieceRegistry, get_piece_registry
+
+# A placement is a (cell index, piece id) pair, see Models.board.cell_index.
+Placement = Tuple[int, int]
+
+# Placements are encoded as a single int, e.g. for search trees, see encode_placement. Piece ids are below 64.
+PIECE_ID_BITS = 6
+
+# Number of distinct facings of a cell: every side is faced by none, a road or a railway.
+FACING_COUNT = 3 ** 4
+
+
+def facing_index(north: int, east: int, south: int, west: int) -> int:
+  '''
+  Returns the index of the passed facing connectors (SquareConnectorType values) in the placement tables.
+  '''
+  return north + 3 * east + 9 * south + 27 * west
+
+def encode_placement(placement: Placement) -> int:
+  '''
+  Returns the placement as a single int (cell index << 6 | piece id).
+  '''
+  return placement[0] << PIECE_ID_BITS | placement[1]
+
+def decode_placement(move: int) -> Placement:
+  '''
+  Returns the (cell index, piece id) of an encoded placement, see encode_placement.
+  '''
+  return move >> PIECE_ID_BITS, move & ((1 << PIECE_ID_BITS) - 1)
+
+def is_legal_facing(connectors: Tuple[int, ...], facing: Tuple[int, ...]) -> bool:
+  '''
+  Returns, whether a piece with the passed connectors may be placed on a cell with the passed facing connectors.
+
+  Railroad Ink requires a new piece to continue at least one route, i.e. one of its connectors has to meet the same
+  connector of a neighbour or an exit. A road must never meet a railway. Connectors facing an empty square, the board
+  edge or a side without connector are allowed.
+  '''
+  connected = False
+  for connector, facing_connector in zip(connectors, facing):
+    if not connector or not facing_connector:
+      continue
+    if connector != facing_connector:
+      return False
+    connected = True
+
+  return connected
+
+
+class PlacementTables:
+  '''
+  Precomputed legal piece ids for every facing of a cell (see facing_index), in total and per dice face or unique tile.
+  '''
+  __slots__ = ("_legal", "_legal_by_dice")
+
+  def __init__(self, registry: PieceRegistry):
+    connectors = registry.connectors_by_id
+    facings = [(index % 3, index // 3 % 3, index // 9 % 3, index // 27) for index in range(FACING_COUNT)]
+
+    self._legal: Tuple[Tuple[int, ...], ...] = tuple(
+      tuple(piece.id for piece in registry.pieces if is_legal_facing(connectors[piece.id], facing)) for facing in facings
+    )
+
+    self._legal_by_dice: Dict[Dice, Tuple[Tuple[int, ...], ...]] = {}
+    for piece in registry.pieces:
+      if piece.dice in self._legal_by_dice:
+        continue
+
+      ids = {other.id for other in registry.get_for_dice(piece.dice)}
+      self._legal_by_dice[piece.dice] = tuple(tuple(piece_id for piece_id in legal if piece_id in ids) for legal in self._legal)
+
+  def get_legal_piece_ids(self, facing: int, dice: Dice | None = None) -> Tuple[int, ...]:
+    '''
+    Returns the ids of all pieces, which may be placed on a cell with the passed facing index. If a dice face or
+    unique tile is passed, only its pieces are returned.
+    '''
+    if dice is None:
+      return self._legal[facing]
+
+    return self._legal_by_dice[dice][facing]
+
+  def get_table(self, dice: Dice | None = None) -> Tuple[Tuple[int, ...], ...]:
+    '''
+    Returns the legal piece ids indexed by facing index, for all pieces or for the pieces of the passed dice.
+    '''
+    if dice is None:
+      return self._legal
+
+    return self._legal_by_dice[dice]
+
+
+__tables: PlacementTables | None = None
+
+def get_placement_tables() -> PlacementTables:
+  '''
+  Returns the process wide placement tables. They are computed on the first call only.
+  '''
+  global __tables
+
+  if __tables is None:
+    __tables = PlacementTables(get_piece_registry())
+
+  return __tables
+
+def get_cell_facing(cells: bytearray, index: int) -> int:
+  '''
+  Returns the facing index of the cell, see Models.board.get_facing_connectors.
+  '''
+  return facing_index(*get_facing_connectors(cells, index))
+
+def generate_placements(board: Board, dice: Dice | None = None) -> List[Placement]:
+  '''
+  Returns all legal placements on the board for the passed dice face or unique tile, or for all pieces, if no dice is
+  passed. Only the frontier of the board is visited, every other empty cell faces no connector and cannot take a piece.
+  The placements are ordered by cell index.
+  '''
+  table = get_placement_tables().get_table(dice)
+  cells = board.cells
+  placements: List[Placement] = []
+
+  for index in sorted(board.frontier):
+    for piece_id in table[get_cell_facing(cells, index)]:
+      placements.append((index, piece_id))
+
+  return placements
+
+def is_legal_placement(board: Board, x: int, y: int, piece: Piece) -> bool:
+  '''
+  Returns, whether the piece may be placed on the square (x, y) of the board.
+  '''
+  index = x * BOARD_SIZE + y
+  if board.cells[index]:
+    return False
+
+  return piece.id in get_placement_tables().get_legal_piece_ids(get_cell_facing(board.cells, index))
+
+def generate_round_placements(board: Board, dice: Sequence[Dice]) -> List[Placement]:
+  '''
+  Returns all legal placements for any of the remaining dice of a round, without duplicates for dice showing the same
+  face. The dice a placement uses is the dice of its piece.
+  '''
+  placements: List[Placement] = []
+  for face in dict.fromkeys(dice):
+    placements.extend(generate_placements(board, face))
+
+  return placements
+
+def generate_unique_tile_placements(board: Board, used_unique_tiles: int) -> List[Placement]:
+  '''
+  Returns all legal placements of the unique tiles, which are not set in the bitmask of used unique tiles (see Game).
+  '''
+  placements: List[Placement] = []
+  for tile in UniqueTiles:
+    if not used_unique_tiles & 1 << tile.value:
+      placements.extend(generate_placements(board, tile))
+
+  return placements
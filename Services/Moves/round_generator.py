@@ -0,0 +1,68 @@
+from __future__ import annotations
+from typing import Iterator, List, Sequence, Set
+from Models.board import Board
+from Models.enums import UniqueTiles
+from Models.game import MAX_UNIQUE_TILES
+from Services.Moves.move_generator import Placement, encode_placement, generate_placements, generate_round_placements
+from Services.Pieces.piece_registry import Dice, get_piece_registry
+
+
+def generate_round_moves(board: Board, dice: Sequence[Dice], used_unique_tiles: int | None = None) -> Iterator[List[Placement]]:
+  '''
+  Yields the placements of every way to play the remaining dice of a round, following the rules of Game, exactly once
+  per distinct resulting board: dice have to be placed, while one of them can be placed. If used_unique_tiles is
+  passed, the bitmask of the used unique tiles (see Game), one of the other unique tiles may be placed as well, unless
+  all allowed unique tiles have been used. Pass None, once a unique tile has been placed in the round.
+
+  Placements of a round commute, whenever the later one was legal before the earlier one, so only canonical orders
+  are followed: a placement may only follow a placement with a higher encoding (see encode_placement), if it was not
+  legal before. Every resulting board is reached by a canonical order, as swapping such a pair keeps both placements
+  legal. Different canonical orders can still reach the same board, so resulting boards are deduplicated by their
+  cells, which unlike the board hash cannot collide. The board is not modified.
+  '''
+  if used_unique_tiles is not None and used_unique_tiles.bit_count() >= MAX_UNIQUE_TILES:
+    used_unique_tiles = None
+  registry = get_piece_registry()
+  piece_dice = [piece.dice if piece else None for piece in registry.pieces_by_id]
+  yield from _generate(board.copy(), list(dice), used_unique_tiles, -1, frozenset(), [], set(), piece_dice)
+
+def _generate(
+  board: Board,
+  dice: List[Dice],
+  used_unique_tiles: int | None,
+  previous: int,
+  legal_before: frozenset,
+  sequence: List[Placement],
+  seen: Set[bytes],
+  piece_dice: List[Dice | None],
+) -> Iterator[List[Placement]]:
+  placements = generate_round_placements(board, dice)
+  if used_unique_tiles is not None:
+    for tile in UniqueTiles:
+      if not used_unique_tiles & 1 << tile.value:
+        placements.extend(generate_placements(board, tile))
+
+  moves = [encode_placement(placement) for placement in placements]
+  if not any(not isinstance(piece_dice[piece_id], UniqueTiles) for _, piece_id in placements):
+    # No dice can be placed any more, so the round may end here.
+    cells = board.to_bytes()
+    if cells not in seen:
+      seen.add(cells)
+      yield list(sequence)
+
+  legal = frozenset(moves)
+  for placement, move in zip(placements, moves):
+    if move < previous and move in legal_before:
+      continue
+
+    face = piece_dice[placement[1]]
+    board.place_id(*placement)
+    sequence.append(placement)
+    if isinstance(face, UniqueTiles):
+      yield from _generate(board, dice, None, move, legal, sequence, seen, piece_dice)
+    else:
+      remaining = list(dice)
+      remaining.remove(face) # type: ignore
+      yield from _generate(board, remaining, used_unique_tiles, move, legal, sequence, seen, piece_dice)
+    sequence.pop()
+    board.undo()
@@ -0,0 +1,226 @@
+from __future__ import annotations
+import json
+import marshal
+import os
+from typing import Any, Dict, List, Tuple
+from Models.enums import BasicDice, SpecialDice, SquareConnectorType, UniqueTiles
+from Models.piece import Piece
+
+# The piece files are resolved relative to this package, so pieces load from every working directory.
+PIECES_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+BASIC_PIECES_PATH = os.path.join(PIECES_DIRECTORY, "basic_pieces.json")
+SPECIAL_PIECES_PATH = os.path.join(PIECES_DIRECTORY, "special_pieces.json")
+UNIQUE_PIECES_PATH = os.path.join(PIECES_DIRECTORY, "unique_pieces.json")
+PIECE_FILES = (BASIC_PIECES_PATH, SPECIAL_PIECES_PATH, UNIQUE_PIECES_PATH)
+
+
+Dice = BasicDice | SpecialDice | UniqueTiles
+Signature = Tuple[int, int, int, int]
+
+
+class PieceRegistry:
+  '''
+  Immutable registry of all pieces of the game. Every piece exists exactly once and is shared by all boards.
+
+  Ids are assigned in the order basic, special, unique pieces, starting with 1. Id 0 is reserved for an empty square,
+  so pieces_by_id[0] is None.
+  '''
+  __slots__ = ("_pieces_by_id", "_basic", "_special", "_unique", "_by_name", "_by_dice", "_by_signature", "_connectors_by_id", "_channels_by_id")
+
+  def __init__(self, basic: List[Dict[str, Any]], special: List[Dict[str, Any]], unique: List[Dict[str, Any]]):
+    pieces: List[Piece | None] = [None]
+    groups: List[Tuple[Piece, ...]] = []
+
+    for group in (basic, special, unique):
+      created = tuple(_create_piece(data, len(pieces) + offset) for offset, data in enumerate(group))
+      pieces.extend(created)
+      groups.append(created)
+
+    by_dice: Dict[Dice, List[Piece]] = {}
+    by_signature: Dict[Signature, List[Piece]] = {}
+    for piece in groups[0] + groups[1] + groups[2]:
+      by_dice.setdefault(piece.dice, []).append(piece)
+      by_signature.setdefault(piece.connectors, []).append(piece)
+
+    self._pieces_by_id: Tuple[Piece | None, ...] = tuple(pieces)
+    self._basic, self._special, self._unique = groups
+    self._by_name: Dict[str, Piece] = {piece.name: piece for piece in groups[0] + groups[1] + groups[2]}
+    self._by_dice: Dict[Dice, Tuple[Piece, ...]] = {dice: tuple(group) for dice, group in by_dice.items()}
+    self._by_signature: Dict[Signature, Tuple[Piece, ...]] = {signature: tuple(group) for signature, group in by_signature.items()}
+    self._connectors_by_id: Tuple[Signature, ...] = ((0, 0, 0, 0),) + tuple(piece.connectors for piece in self.pieces)
+    self._channels_by_id: Tuple[Tuple[Tuple[int, ...], ...], ...] = ((), ) + tuple(_determine_channels(piece) for piece in self.pieces)
+
+  @property
+  def pieces_by_id(self) -> Tuple[Piece | None, ...]:
+    return self._pieces_by_id
+
+  @property
+  def basic_pieces(self) -> Tuple[Piece, ...]:
+    return self._basic
+
+  @property
+  def special_pieces(self) -> Tuple[Piece, ...]:
+    return self._special
+
+  @property
+  def unique_pieces(self) -> Tuple[Piece, ...]:
+    return self._unique
+
+  @property
+  def pieces(self) -> Tuple[Piece, ...]:
+    return self._basic + self._special + self._unique
+
+  @property
+  def connectors_by_id(self) -> Tuple[Signature, ...]:
+    '''
+    The (north, east, south, west) connectors of every piece id, (0, 0, 0, 0) for id 0.
+    '''
+    return self._connectors_by_id
+
+  @property
+  def channels_by_id(self) -> Tuple[Tuple[Tuple[int, ...], ...], ...]:
+    '''
+    For every piece id and side (0 = north, 1 = east, 2 = south, 3 = west) the other sides, which are connected to that
+    side within the piece. Undergrounds only connect opposite sides, all other pieces connect all of their connectors.
+    '''
+    return self._channels_by_id
+
+  def __len__(self) -> int:
+    return len(self._pieces_by_id) - 1
+
+  def get_by_id(self, piece_id: int) -> Piece | None:
+    '''
+    Returns the piece with the passed id, None for id 0.
+    '''
+    return self._pieces_by_id[piece_id]
+
+  def get_by_name(self, name: str) -> Piece:
+    '''
+    Returns the piece with the passed name.
+    '''
+    piece = self._by_name.get(name)
+    if piece is None:
+      raise ValueError(f"Piece with name {name} not found")
+
+    return piece
+
+  def get_for_dice(self, dice: Dice) -> Tuple[Piece, ...]:
+    '''
+    Returns all pieces, which may be placed for the passed dice face or unique tile.
+    '''
+    return self._by_dice.get(dice, ())
+
+  def get_by_signature(self, north: int, east: int, south: int, west: int) -> Tuple[Piece, ...]:
+    '''
+    Returns all pieces with the passed connectors (SquareConnectorType values). Several pieces may share a signature,
+    e.g. an underground and the matching unique tile.
+    '''
+    return self._by_signature.get((north, east, south, west), ())
+
+
+__registry: PieceRegistry | None = None
+__cache_path: str | None = None
+
+def get_piece_registry() -> PieceRegistry:
+  '''
+  Returns the process wide piece registry. The piece files are read on the first call only, from the piece cache, if
+  one was set by use_piece_cache.
+  '''
+  global __registry
+
+  if __registry is None:
+    __registry = PieceRegistry(*load_piece_data(__cache_path))
+
+  return __registry
+
+def use_piece_cache(cache_path: str | None) -> None:
+  '''
+  Makes get_piece_registry read the pieces from the cache at cache_path (see build_piece_cache), e.g. in short-lived
+  processes. Has to be called before the registry is first used. None parses the piece files again.
+  '''
+  global __cache_path
+
+  __cache_path = cache_path
+
+def get_user_cache_path() -> str:
+  '''
+  Returns the path of the piece cache in the cache directory of the user ($XDG_CACHE_HOME or ~/.cache).
+  '''
+  cache_directory = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+  return os.path.join(cache_directory, "railroad_ink", "pieces.marshal")
+
+def load_piece_data(cache_path: str | None = None) -> Tuple[List[Dict[str, Any]], ...]:
+  '''
+  Returns the contents of the basic, special and unique piece files.
+
+  If a cache_path is passed, they are read from the cache there (see build_piece_cache), as long as it matches the
+  size and modification time of every file. Otherwise, or if the cache is missing or outdated, they are parsed from
+  JSON. Nothing is written.
+  '''
+  if cache_path:
+    try:
+      with open(cache_path, "rb") as file:
+        cached_stamps, data = marshal.load(file)
+      if cached_stamps == _get_stamps():
+        return data
+    except (OSError, EOFError, ValueError, TypeError):
+      pass
+
+  return tuple(_load_piece_file(path) for path in PIECE_FILES)
+
+def build_piece_cache(cache_path: str | None = None) -> str:
+  '''
+  Writes the parsed piece files marshalled, together with the size and modification time of every file, to
+  cache_path, by default the user cache path (see get_user_cache_path), and returns the path. Loading the cache takes
+  a fraction of parsing the JSON, which matters for short-lived processes.
+  '''
+  cache_path = cache_path or get_user_cache_path()
+  stamps = _get_stamps()
+  data = tuple(_load_piece_file(path) for path in PIECE_FILES)
+
+  os.makedirs(os.path.dirname(os.path.abspath(cache_path)), exist_ok=True)
+  # Written to a temporary file first, so concurrently starting processes never read a partial cache.
+  temporary_path = f"{cache_path}.{os.getpid()}"
+  with open(temporary_path, "wb") as file:
+    marshal.dump((stamps, data), file)
+  os.replace(temporary_path, cache_path)
+
+  return cache_path
+
+def _get_stamps() -> Tuple[Tuple[int, int], ...]:
+  return tuple((stat.st_size, stat.st_mtime_ns) for stat in map(os.stat, PIECE_FILES))
+
+def _load_piece_file(path: str) -> List[Dict[str, Any]]:
+  with open(path) as file:
+    return json.load(file)
+
+def _determine_channels(piece: Piece) -> Tuple[Tuple[int, ...], ...]:
+  connectors = piece.connectors
+  if piece.is_underground:
+    return tuple(((side + 2) % 4,) if connectors[side] and connectors[(side + 2) % 4] else () for side in range(4))
+
+  return tuple(
+    tuple(other for other in range(4) if other != side and connectors[other]) if connectors[side] else ()
+    for side in range(4)
+  )
+
+def _create_piece(data: Dict[str, Any], piece_id: int) -> Piece:
+  '''
+  Returns a piece for the passed JSON representation. Ensures that Enums are properly parsed.
+  '''
+  data = data.copy()
+
+  for direction in ["north", "east", "south", "west"]:
+    data[direction] = SquareConnectorType[data[direction]]
+
+  dice = data["dice"]
+  if dice in BasicDice.__members__:
+    data["dice"] = BasicDice[dice]
+  elif dice in SpecialDice.__members__:
+    data["dice"] = SpecialDice[dice]
+  elif dice in UniqueTiles.__members__:
+    data["dice"] = UniqueTiles[dice]
+  else:
+    raise ValueError(f"Piece {data['name']} has unknown dice {dice}")
+
+  return Piece(**data, id=piece_id)
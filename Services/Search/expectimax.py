@@ -0,0 +1,199 @@
+from __future__ import annotations
+import random
+import time
+from typing import Callable, Dict, List, Sequence, Tuple
+from Models.board import Board
+from Models.enums import UniqueTiles
+from Models.game import MAX_UNIQUE_TILES, ROUNDS, Game
+from Services.Board.Evaluation.board_evaluation_service import evaluate_board_position
+from Services.Board.Evaluation.score_bound import get_score_upper_bound
+from Services.Dice.dice_service import ROUTE_DICE_COUNT, encode_dice_multiset, get_roll_outcomes
+from Services.Moves.move_generator import Placement
+from Services.Moves.round_generator import generate_round_moves
+from Services.Pieces.piece_registry import Dice, get_piece_registry
+from Services.Search.transposition_table import TranspositionTable
+
+# A bound returns an optimistic final score of the board, after at most the passed number of further placements.
+ScoreBound = Callable[[Board, int], int]
+
+# Random keys, which are combined with the board hash to key chance nodes by the used unique tiles and the remaining
+# rounds as well. Generated from a fixed seed like Models.board.ZOBRIST_KEYS.
+_key_random = random.Random(0xD1CE)
+_USED_KEYS: Tuple[int, ...] = tuple(_key_random.getrandbits(64) for _ in range(1 << len(UniqueTiles)))
+_ROUND_KEYS: Tuple[int, ...] = tuple(_key_random.getrandbits(64) for _ in range(ROUNDS + 1))
+
+
+class _SearchTimeout(Exception):
+  pass
+
+
+class ExpectimaxResult:
+  '''
+  The result of ExpectimaxSolver.solve: the placements of the round in the order they should be made and the expected
+  final score of playing them. If the time limit expired, complete is False and the placements and value are those of
+  the best way to play the round searched to its end, or none, if none has been searched.
+  '''
+  __slots__ = ("placements", "value", "complete", "nodes", "elapsed")
+
+  def __init__(self, placements: List[Placement], value: float, complete: bool, nodes: int, elapsed: float):
+    self.placements = placements
+    self.value = value
+    self.complete = complete
+    self.nodes = nodes
+    self.elapsed = elapsed
+
+  def __repr__(self) -> str:
+    return f"ExpectimaxResult(placements={self.placements}, value={self.value:.3f}, complete={self.complete}, nodes={self.nodes})"
+
+
+class ExpectimaxSolver:
+  '''
+  Exact expectimax over the placements and dice rolls of the last rounds of a game, following the rules of Game.
+
+  Decision nodes play the remaining dice of a round, and possibly a unique tile, which may still be placed, in every
+  way, which results in a distinct board (see generate_round_moves), so placement orders reaching the same board are
+  searched once. Chance nodes roll the dice of the next round, every distinct roll once with its probability (see
+  get_roll_outcomes). The value of a node is the expected final score (evaluate_board_position) under best play.
+
+  - Decision values are memoized by the cells of the board, the remaining dice and the unique tile state. Once
+    max_decisions values are stored, they are dropped.
+  - Chance values are stored in a TranspositionTable keyed by the board hash, the used unique tiles and the remaining
+    rounds, and checked by a hash of the cells, the used unique tiles and the remaining rounds. They are shared by all
+    searches of the solver.
+  - The resulting boards of a decision node are searched in the order of an optimistic bound of their final score, by
+    default get_score_upper_bound. Once the bound of a board cannot beat the best value found, it and all remaining
+    boards are dropped.
+
+  Only completely searched values are stored, so the caches stay exact, even if a search runs out of time.
+  '''
+
+  def __init__(self, bound: ScoreBound | None = None, table_bytes: int = 16 << 20, max_decisions: int = 1 << 20):
+    self.bound = bound if bound is not None else get_score_upper_bound
+    self.table = TranspositionTable(table_bytes)
+    self.max_decisions = max_decisions
+    self.nodes = 0
+    self._decisions: Dict[Tuple[bytes, int, int, bool, int], Tuple[float, List[Placement]]] = {}
+    self._deadline = 0.0
+    self._root_best: Tuple[float, List[Placement]] | None = None
+    registry = get_piece_registry()
+    self._piece_dice: Tuple[Dice | None, ...] = tuple(piece.dice if piece else None for piece in registry.pieces_by_id)
+
+  def solve(
+    self,
+    board: Board,
+    dice: Sequence[Dice],
+    round: int = ROUNDS,
+    used_unique_tiles: int = 0,
+    unique_tile_placed: bool = False,
+    time_limit: float | None = None,
+  ) -> ExpectimaxResult:
+    '''
+    Returns the best placements for the remaining dice of the round with the passed number (1 to 7), given the bitmask
+    of the unique tiles used so far (see Game) and whether one has been placed in this round. All later rounds are
+    searched as well, which is only feasible for the last one or two rounds. The board is not modified.
+    '''
+    start = time.perf_counter()
+    self.nodes = 0
+    self._deadline = start + time_limit if time_limit is not None else 0.0
+    self._root_best = None
+    work = board.copy()
+
+    try:
+      value, placements = self._decide(work, list(dice), used_unique_tiles, unique_tile_placed, ROUNDS - round, root=True)
+    except _SearchTimeout:
+      if self._root_best is None:
+        return ExpectimaxResult([], 0.0, False, self.nodes, time.perf_counter() - start)
+
+      value, placements = self._root_best
+      return ExpectimaxResult(list(placements), value, False, self.nodes, time.perf_counter() - start)
+
+    self._deadline = 0.0
+    return ExpectimaxResult(list(placements), value, True, self.nodes, time.perf_counter() - start)
+
+  def solve_game(self, game: Game, time_limit: float | None = None) -> ExpectimaxResult:
+    '''
+    Returns the best placements for the remaining dice of the current round of the game, see solve.
+    '''
+    if not game.in_round:
+      raise ValueError("No round has been started")
+
+    return self.solve(game.board, game.dice, game.round, game.used_unique_tiles, game.unique_tile_placed, time_limit)
+
+  def clear(self) -> None:
+    self.table.clear()
+    self._decisions.clear()
+
+  def _decide(self, board: Board, dice: List[Dice], used: int, placed: bool, rounds: int, root: bool = False) -> Tuple[float, List[Placement]]:
+    '''
+    Returns the value of the decision node and the placements of its best resulting board.
+    '''
+    key = (board.to_bytes(), encode_dice_multiset(dice), used, placed, rounds)
+    entry = self._decisions.get(key)
+    if entry is not None:
+      return entry
+
+    best: Tuple[float, List[Placement]] = (float("-inf"), [])
+    for bound, placements, after in self._order_moves(board, dice, used, placed, rounds):
+      if bound <= best[0]:
+        break
+
+      self._count_node()
+      for placement in placements:
+        board.place_id(*placement)
+      value = self._roll(board, after, rounds) if rounds else float(evaluate_board_position(board))
+      board.undo_to(board.undo_depth - len(placements))
+
+      if value > best[0]:
+        best = (value, placements)
+        if root:
+          self._root_best = best
+
+    if len(self._decisions) >= self.max_decisions:
+      self._decisions.clear()
+    self._decisions[key] = best
+
+    return best
+
+  def _roll(self, board: Board, used: int, rounds: int) -> float:
+    '''
+    Returns the value of the chance node before the next of the remaining rounds.
+    '''
+    key = board.zobrist_hash ^ _USED_KEYS[used] ^ _ROUND_KEYS[rounds]
+    check = hash((board.to_bytes(), used, rounds))
+    entry = self.table.probe(key, check)
+    if entry is not None:
+      return entry[0]
+
+    value = 0.0
+    for roll, probability in get_roll_outcomes():
+      value += probability * self._decide(board, list(roll), used, False, rounds - 1)[0]
+    self.table.store(key, value, rounds, check)
+
+    return value
+
+  def _order_moves(self, board: Board, dice: List[Dice], used: int, placed: bool, rounds: int) -> List[Tuple[int, List[Placement], int]]:
+    '''
+    Returns the (bound, placements, used unique tiles) of every resulting board of the decision node, the highest bound
+    first.
+    '''
+    moves: List[Tuple[int, List[Placement], int]] = []
+    for placements in generate_round_moves(board, dice, None if placed else used):
+      self._count_node()
+      after = used
+      for placement in placements:
+        board.place_id(*placement)
+        face = self._piece_dice[placement[1]]
+        if isinstance(face, UniqueTiles):
+          after |= 1 << face.value
+      # Placements after the round: the dice of all later rounds and a unique tile per round, while allowed.
+      later = rounds * (ROUTE_DICE_COUNT + 1) + min(MAX_UNIQUE_TILES - after.bit_count(), rounds)
+      moves.append((self.bound(board, later), placements, after))
+      board.undo_to(board.undo_depth - len(placements))
+    moves.sort(key=lambda move: move[0], reverse=True)
+
+    return moves
+
+  def _count_node(self) -> None:
+    self.nodes += 1
+    if self._deadline and not self.nodes & 255 and time.perf_counter() > self._deadline:
+      raise _SearchTimeout()
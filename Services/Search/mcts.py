@@ -0,0 +1,261 @@
+from __future__ import annotations
+from math import log, sqrt
+from random import Random
+from typing import Dict, List, Sequence, Tuple
+from Models.board import Board
+from Models.enums import UniqueTiles
+from Models.game import MAX_UNIQUE_TILES
+from Services.Board.Evaluation.board_evaluation_service import evaluate_board_position
+from Services.Dice.dice_service import encode_roll, roll_dice
+from Services.Moves.move_generator import Placement, decode_placement, encode_placement, generate_round_placements, generate_unique_tile_placements
+from Services.Pieces.piece_registry import Dice, get_piece_registry
+from Services.Search.node_pool import CHANCE, DECISION, NO_NODE, TERMINAL, UNEXPANDED, NodePool
+from Services.Search.rollout_policies import RolloutPolicy, random_rollout
+
+ROOT = 0
+# Move of a decision node's child, which ends the round, once no dice can be placed, instead of placing a unique tile.
+# No placement is encoded as 0, as piece ids start at 1.
+END_ROUND = 0
+
+
+class MonteCarloTreeSearch:
+  '''
+  Monte Carlo Tree Search over the placements of a Railroad Ink game, with the nodes kept in a NodePool.
+
+  Decision nodes choose the next placement for one of the remaining dice of the round or, following the rules of Game,
+  for one of the unique tiles, which may still be placed. Once no remaining dice can be placed, the round may end
+  (END_ROUND) instead of placing a unique tile. The round ends in a chance node, whose children are the possible rolls
+  of the next round (see encode_roll), or, after the last round, in a terminal node. Children of decision nodes are selected by UCT, children of chance
+  nodes by rolling the dice.
+
+  Every iteration descends to an unexpanded node, expands it, plays the game to its end with the rollout policy and
+  adds the final score (evaluate_board_position) to all nodes on the way. Scores are normalized to [0, 1] by the
+  lowest and highest score seen so far for UCT.
+  '''
+
+  def __init__(self, rollout: RolloutPolicy = random_rollout, exploration: float = 1.0, seed: int | None = None, capacity: int = 1 << 16):
+    self.rollout = rollout
+    self.exploration = exploration
+    self.rng = Random(seed)
+    self.pool = NodePool(capacity)
+    self._lowest = 0.0
+    self._highest = 0.0
+
+  def search(
+    self, board: Board, roll: Sequence[Dice], budget: int, remaining_rounds: int = 0, used_unique_tiles: int = 0, unique_tile_placed: bool = False,
+  ) -> List[Placement]:
+    '''
+    Runs budget iterations from the board with the rolled dice, followed by remaining_rounds further rounds, and
+    returns the best placements for the roll as (cell index, piece id) pairs in the order they should be made, given
+    the bitmask of the unique tiles used so far (see Game) and whether one has been placed in this round. The
+    placements may include a unique tile. The board is not modified.
+    '''
+    self._reset()
+    # All iterations play on one copy of the board and take their placements back afterwards.
+    working = board.copy()
+    for _ in range(budget):
+      self._iterate(working, roll, remaining_rounds, used_unique_tiles, not unique_tile_placed)
+
+    return self._best_sequence(board, roll)
+
+  def _reset(self) -> None:
+    self.pool.clear()
+    self.pool.add(NO_NODE, 0)
+    self._lowest = float("inf")
+    self._highest = float("-inf")
+
+  def _iterate(self, board: Board, roll: Sequence[Dice], remaining_rounds: int, used_unique_tiles: int, unique_tile_allowed: bool) -> None:
+    depth = board.undo_depth
+    path, dice, remaining_rounds, used_unique_tiles, unique_tile_allowed = self._descend(board, roll, remaining_rounds, used_unique_tiles, unique_tile_allowed)
+    node = path[-1]
+
+    if self.pool.kind[node] != TERMINAL:
+      self.rollout(board, dice, remaining_rounds, self.rng, used_unique_tiles, unique_tile_allowed)
+
+    self._backpropagate(path, float(evaluate_board_position(board)))
+    board.undo_to(depth)
+
+  def _descend(
+    self, board: Board, roll: Sequence[Dice], remaining_rounds: int, used_unique_tiles: int, unique_tile_allowed: bool,
+  ) -> Tuple[List[int], List[Dice], int, int, bool]:
+    '''
+    Selects a path from the root to an unexpanded or terminal node and expands it. The placements on the way are made
+    on the board, the caller takes them back with Board.undo_to. Returns the path together with the remaining dice of
+    the round, the remaining rounds, the used unique tiles and whether one may still be placed at its last node.
+    '''
+    pool = self.pool
+    dice = list(roll)
+    node = ROOT
+    path = [ROOT]
+
+    while pool.kind[node] != UNEXPANDED:
+      kind = pool.kind[node]
+      if kind == TERMINAL:
+        break
+
+      if kind == DECISION:
+        node = self._select(node)
+        if pool.move[node] == END_ROUND:
+          dice, unique_tile_allowed = [], False
+        else:
+          tile = place(board, dice, decode_placement(pool.move[node]))
+          if tile:
+            used_unique_tiles |= tile
+            unique_tile_allowed = False
+      else:
+        dice = roll_dice(self.rng)
+        remaining_rounds -= 1
+        unique_tile_allowed = True
+        roll_id = encode_roll(dice)
+        child = pool.find_child(node, roll_id)
+        node = child if child != NO_NODE else pool.add(node, roll_id)
+
+      path.append(node)
+
+    if pool.kind[node] == UNEXPANDED:
+      self._expand(node, board, dice, remaining_rounds, used_unique_tiles, unique_tile_allowed)
+    if pool.kind[node] != DECISION:
+      dice, unique_tile_allowed = [], False
+
+    return path, dice, remaining_rounds, used_unique_tiles, unique_tile_allowed
+
+  def _backpropagate(self, path: List[int], value: float) -> None:
+    pool = self.pool
+    self._lowest = min(self._lowest, value)
+    self._highest = max(self._highest, value)
+
+    for node in path:
+      pool.visits[node] += 1
+      pool.value_sum[node] += value
+
+  def _expand(self, node: int, board: Board, dice: List[Dice], remaining_rounds: int, used_unique_tiles: int, unique_tile_allowed: bool) -> None:
+    pool = self.pool
+    placements = generate_round_placements(board, dice) if dice else []
+    can_end = not placements
+    if unique_tile_allowed and used_unique_tiles.bit_count() < MAX_UNIQUE_TILES:
+      placements.extend(generate_unique_tile_placements(board, used_unique_tiles))
+
+    if placements:
+      pool.kind[node] = DECISION
+      for placement in placements:
+        pool.add(node, encode_placement(placement))
+      if can_end:
+        pool.add(node, END_ROUND)
+    elif remaining_rounds > 0:
+      pool.kind[node] = CHANCE
+    else:
+      pool.kind[node] = TERMINAL
+
+  def _select(self, node: int) -> int:
+    '''
+    Returns the child with the highest UCT value. Unvisited children are selected first.
+    '''
+    pool = self.pool
+    visits, value_sum = pool.visits, pool.value_sum
+    # Before the first score is known, only virtual visits (see LeafParallelSearch) can have been counted.
+    lowest = self._lowest if self._lowest <= self._highest else 0.0
+    spread = self._highest - lowest if self._lowest < self._highest else 1.0
+    log_visits = log(visits[node])
+
+    best, best_value = NO_NODE, float("-inf")
+    for child in pool.children(node):
+      if visits[child] == 0:
+        return child
+
+      mean = (value_sum[child] / visits[child] - lowest) / spread
+      value = mean + self.exploration * sqrt(log_visits / visits[child])
+      if value > best_value:
+        best, best_value = child, value
+
+    return best
+
+  def get_round_statistics(self) -> Dict[Tuple[int, ...], Tuple[int, float]]:
+    '''
+    Returns the visits and value sum of every visited node of the first round, keyed by the encoded placements leading
+    to it from the root (see encode_placement). Statistics of several searches can be summed per key.
+    '''
+    pool = self.pool
+    statistics: Dict[Tuple[int, ...], Tuple[int, float]] = {}
+    stack: List[Tuple[int, Tuple[int, ...]]] = [(ROOT, ())]
+
+    while stack:
+      node, moves = stack.pop()
+      statistics[moves] = (pool.visits[node], pool.value_sum[node])
+      if pool.kind[node] == DECISION:
+        stack.extend((child, moves + (pool.move[child],)) for child in pool.children(node) if pool.visits[child])
+
+    return statistics
+
+  def _best_sequence(self, root: Board, roll: Sequence[Dice]) -> List[Placement]:
+    return select_sequence(self.get_round_statistics(), root, roll)
+
+
+def place(board: Board, dice: List[Dice], placement: Placement) -> int:
+  '''
+  Makes the placement on the board, so it can be taken back with Board.undo, and removes the dice it uses from the
+  remaining dice. Returns the bit of the unique tile it places (see Game) or 0 for a dice.
+  '''
+  index, piece_id = placement
+  board.place_id(index, piece_id)
+  face = get_piece_registry().get_by_id(piece_id).dice # type: ignore
+  if isinstance(face, UniqueTiles):
+    return 1 << face.value
+
+  dice.remove(face)
+  return 0
+
+def select_sequence(statistics: Dict[Tuple[int, ...], Tuple[int, float]], root: Board, roll: Sequence[Dice]) -> List[Placement]:
+  '''
+  Follows the most visited placements of the round in the passed statistics (see get_round_statistics), until the
+  round ends. If they do not cover the whole round, the remaining dice are placed greedily by score.
+  '''
+  children: Dict[Tuple[int, ...], List[Tuple[int, ...]]] = {}
+  for moves in statistics:
+    if moves:
+      children.setdefault(moves[:-1], []).append(moves)
+
+  board = root.copy()
+  dice = list(roll)
+  sequence: List[Placement] = []
+  moves: Tuple[int, ...] = ()
+
+  while moves in children:
+    moves = max(sorted(children[moves]), key=lambda child: statistics[child][0])
+    if moves[-1] == END_ROUND:
+      break
+    placement = decode_placement(moves[-1])
+    place(board, dice, placement)
+    sequence.append(placement)
+
+  while dice:
+    placements = generate_round_placements(board, dice)
+    if not placements:
+      break
+
+    placement = max(placements, key=lambda placement: _score_after(board, placement))
+    place(board, dice, placement)
+    sequence.append(placement)
+
+  return sequence
+
+def _score_after(board: Board, placement: Placement) -> int:
+  board.place_id(*placement)
+  score = evaluate_board_position(board)
+  board.undo()
+
+  return score
+
+def search(
+  board: Board,
+  roll: Sequence[Dice],
+  budget: int,
+  remaining_rounds: int = 0,
+  rollout: RolloutPolicy = random_rollout,
+  seed: int | None = None,
+  used_unique_tiles: int = 0,
+  unique_tile_placed: bool = False,
+) -> List[Placement]:
+  '''
+  Returns the best placements for the rolled dice on the board, unique tiles included, see MonteCarloTreeSearch.search.
+  '''
+  return MonteCarloTreeSearch(rollout=rollout, seed=seed).search(board, roll, budget, remaining_rounds, used_unique_tiles, unique_tile_placed)
@@ -0,0 +1,99 @@
+from array import array
+
+NO_NODE = -1
+
+# Kinds of nodes. A node is unexpanded until it is visited for the first time, then its kind is known.
+UNEXPANDED = 0
+DECISION = 1
+CHANCE = 2
+TERMINAL = 3
+
+
+class NodePool:
+  '''
+  Array backed storage for the nodes of a search tree. A node is an index into the arrays, so the tree needs no Python
+  object per node and a pool of a million nodes takes about 30 MB.
+
+  Children are kept as a linked list: first_child points to the first child of a node, next_sibling to the next child
+  of the same parent. move holds the placement (for children of decision nodes) or the roll id (for children of
+  chance nodes), which leads from the parent to the node.
+
+  The arrays are preallocated for the passed capacity and doubled, when the pool runs full.
+  '''
+  __slots__ = ("parent", "first_child", "next_sibling", "move", "kind", "visits", "value_sum", "size", "capacity")
+
+  def __init__(self, capacity: int = 1 << 16):
+    self.parent = array("i", [NO_NODE]) * capacity
+    self.first_child = array("i", [NO_NODE]) * capacity
+    self.next_sibling = array("i", [NO_NODE]) * capacity
+    self.move = array("i", [0]) * capacity
+    self.kind = array("b", [UNEXPANDED]) * capacity
+    self.visits = array("i", [0]) * capacity
+    self.value_sum = array("d", [0.0]) * capacity
+    self.size = 0
+    self.capacity = capacity
+
+  def __len__(self) -> int:
+    return self.size
+
+  def add(self, parent: int, move: int) -> int:
+    '''
+    Adds an unexpanded node as first child of the parent (NO_NODE for the root) and returns its index.
+    '''
+    if self.size == self.capacity:
+      self._grow()
+
+    node = self.size
+    self.size += 1
+    self.parent[node] = parent
+    self.move[node] = move
+
+    if parent != NO_NODE:
+      self.next_sibling[node] = self.first_child[parent]
+      self.first_child[parent] = node
+
+    return node
+
+  def children(self, node: int):
+    '''
+    Yields the children of the node.
+    '''
+    child = self.first_child[node]
+    while child != NO_NODE:
+      yield child
+      child = self.next_sibling[child]
+
+  def find_child(self, node: int, move: int) -> int:
+    '''
+    Returns the child of the node reached by the passed move or NO_NODE.
+    '''
+    child = self.first_child[node]
+    while child != NO_NODE and self.move[child] != move:
+      child = self.next_sibling[child]
+
+    return child
+
+  def clear(self) -> None:
+    '''
+    Removes all nodes, while keeping the allocated memory.
+    '''
+    size = self.size
+    self.parent[:size] = array("i", [NO_NODE]) * size
+    self.first_child[:size] = array("i", [NO_NODE]) * size
+    self.next_sibling[:size] = array("i", [NO_NODE]) * size
+    self.move[:size] = array("i", [0]) * size
+    self.kind[:size] = array("b", [UNEXPANDED]) * size
+    self.visits[:size] = array("i", [0]) * size
+    self.value_sum[:size] = array("d", [0.0]) * size
+    self.size = 0
+
+  def _grow(self) -> None:
+    extra = self.capacity
+    self.parent.extend(array("i", [NO_NODE]) * extra)
+    self.first_child.extend(array("i", [NO_NODE]) * extra)
+    self.next_sibling.extend(array("i", [NO_NODE]) * extra)
+    self.move.extend(array("i", [0]) * extra)
+    self.kind.extend(array("b", [UNEXPANDED]) * extra)
+    self.visits.extend(array("i", [0]) * extra)
+    self.value_sum.extend(array("d", [0.0]) * extra)
+    self.capacity += extra
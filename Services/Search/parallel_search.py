@@ -0,0 +1,175 @@
+from __future__ import annotations
+from concurrent.futures import Executor, ProcessPoolExecutor
+from random import Random
+from typing import Dict, List, Sequence, Tuple
+from Models.board import Board
+from Services.Board.Evaluation.board_evaluation_service import evaluate_board_position
+from Services.Dice.dice_service import decode_dice, encode_dice
+from Services.Moves.move_generator import Placement
+from Services.Pieces.piece_registry import Dice
+from Services.Search.mcts import MonteCarloTreeSearch, select_sequence
+from Services.Search.node_pool import TERMINAL
+from Services.Search.rollout_policies import RolloutPolicy, random_rollout
+
+# Boards cross process boundaries as the 49 bytes of Board.to_bytes and dice as the bytes of encode_dice. Rollout
+# policies have to be module level functions, so they can be pickled by reference.
+
+Statistics = Dict[Tuple[int, ...], Tuple[int, float]]
+
+
+def get_worker_seed(seed: int | None, worker: int) -> int | None:
+  '''
+  Returns the seed of a worker, which is derived from the seed of the whole search. No seed stays no seed.
+  '''
+  return None if seed is None else (seed << 16) + worker
+
+def root_parallel_search(
+  board: Board,
+  roll: Sequence[Dice],
+  budget: int,
+  workers: int,
+  remaining_rounds: int = 0,
+  rollout: RolloutPolicy = random_rollout,
+  seed: int | None = None,
+  executor: Executor | None = None,
+  used_unique_tiles: int = 0,
+  unique_tile_placed: bool = False,
+) -> List[Placement]:
+  '''
+  Runs an independent search tree in each of the worker processes and returns the best placements for the roll
+  according to their merged statistics (see MonteCarloTreeSearch.get_round_statistics). The budget is split evenly
+  among the workers.
+
+  If no executor is passed, a ProcessPoolExecutor with the passed number of workers is created for the call.
+  '''
+  cells, dice = board.to_bytes(), encode_dice(roll)
+  tasks = [
+    (
+      cells, dice, budget // workers + (worker < budget % workers), remaining_rounds, used_unique_tiles, unique_tile_placed, rollout,
+      get_worker_seed(seed, worker),
+    )
+    for worker in range(workers)
+  ]
+
+  if executor is None:
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+      results = list(pool.map(_run_search, *zip(*tasks)))
+  else:
+    results = list(executor.map(_run_search, *zip(*tasks)))
+
+  return select_sequence(merge_statistics(results), board, roll)
+
+def merge_statistics(results: Sequence[Statistics]) -> Statistics:
+  '''
+  Sums the visits and value sums of several searches per node.
+  '''
+  merged: Statistics = {}
+  for statistics in results:
+    for moves, (visits, value_sum) in statistics.items():
+      merged_visits, merged_value_sum = merged.get(moves, (0, 0.0))
+      merged[moves] = (merged_visits + visits, merged_value_sum + value_sum)
+
+  return merged
+
+def _run_search(
+  cells: bytes, dice: bytes, budget: int, remaining_rounds: int, used_unique_tiles: int, unique_tile_placed: bool, rollout: RolloutPolicy, seed: int | None,
+) -> Statistics:
+  search = MonteCarloTreeSearch(rollout=rollout, seed=seed)
+  search.search(Board.from_bytes(cells), decode_dice(dice), budget, remaining_rounds, used_unique_tiles, unique_tile_placed)
+
+  return search.get_round_statistics()
+
+def _run_rollout(
+  cells: bytes, dice: bytes, remaining_rounds: int, used_unique_tiles: int, unique_tile_allowed: bool, rollout: RolloutPolicy, seed: int,
+) -> float:
+  board = Board.from_bytes(cells)
+  rollout(board, decode_dice(dice), remaining_rounds, Random(seed), used_unique_tiles, unique_tile_allowed)
+
+  return float(evaluate_board_position(board))
+
+
+class LeafParallelSearch(MonteCarloTreeSearch):
+  '''
+  A single search tree, whose rollouts are run in batches by the worker processes of an executor.
+
+  Each batch descends batch_size times before any rollout finishes. Every descent adds a virtual visit without value
+  to its path, which makes UCT spread the descents of a batch over different branches. The virtual visits are replaced
+  by the rollout results, once the batch returns. Every rollout gets its own seed drawn from the search, so the result
+  only depends on the seed and the batch size, not on the number of workers.
+  '''
+
+  def __init__(self, executor: Executor, batch_size: int, chunksize: int = 1, rollout: RolloutPolicy = random_rollout, exploration: float = 1.0, seed: int | None = None, capacity: int = 1 << 16):
+    super().__init__(rollout=rollout, exploration=exploration, seed=seed, capacity=capacity)
+    self.executor = executor
+    self.batch_size = batch_size
+    self.chunksize = chunksize
+
+  def search(
+    self, board: Board, roll: Sequence[Dice], budget: int, remaining_rounds: int = 0, used_unique_tiles: int = 0, unique_tile_placed: bool = False,
+  ) -> List[Placement]:
+    '''
+    See MonteCarloTreeSearch.search, budget is the total number of rollouts.
+    '''
+    self._reset()
+
+    done = 0
+    while done < budget:
+      size = min(self.batch_size, budget - done)
+      self._run_batch(board, roll, remaining_rounds, used_unique_tiles, not unique_tile_placed, size)
+      done += size
+
+    return self._best_sequence(board, roll)
+
+  def _run_batch(self, root: Board, roll: Sequence[Dice], remaining_rounds: int, used_unique_tiles: int, unique_tile_allowed: bool, size: int) -> None:
+    pool = self.pool
+    paths: List[List[int]] = []
+    values: List[float | None] = []
+    tasks: List[Tuple[bytes, bytes, int, int, bool, RolloutPolicy, int]] = []
+
+    board = root.copy()
+    for _ in range(size):
+      path, dice, rounds, used, allowed = self._descend(board, roll, remaining_rounds, used_unique_tiles, unique_tile_allowed)
+      for node in path:
+        pool.visits[node] += 1
+
+      paths.append(path)
+      if pool.kind[path[-1]] == TERMINAL:
+        values.append(float(evaluate_board_position(board)))
+      else:
+        values.append(None)
+        tasks.append((board.to_bytes(), encode_dice(dice), rounds, used, allowed, self.rollout, self.rng.getrandbits(64)))
+      board.undo_to(0)
+
+    results = iter(self.executor.map(_run_rollout, *zip(*tasks), chunksize=self.chunksize)) if tasks else iter(())
+    for path, value in zip(paths, values):
+      for node in path:
+        pool.visits[node] -= 1
+      self._backpropagate(path, value if value is not None else next(results))
+
+
+def leaf_parallel_search(
+  board: Board,
+  roll: Sequence[Dice],
+  budget: int,
+  workers: int,
+  remaining_rounds: int = 0,
+  batch_size: int | None = None,
+  rollout: RolloutPolicy = random_rollout,
+  seed: int | None = None,
+  executor: Executor | None = None,
+  used_unique_tiles: int = 0,
+  unique_tile_placed: bool = False,
+) -> List[Placement]:
+  '''
+  Returns the best placements for the roll, see LeafParallelSearch. The batch size defaults to eight rollouts per
+  worker, which are sent to each worker in one chunk.
+  '''
+  batch_size = batch_size or 8 * workers
+  chunksize = max(1, batch_size // workers)
+  if executor is None:
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+      search = LeafParallelSearch(pool, batch_size, chunksize, rollout=rollout, seed=seed)
+      return search.search(board, roll, budget, remaining_rounds, used_unique_tiles, unique_tile_placed)
+
+  search = LeafParallelSearch(executor, batch_size, chunksize, rollout=rollout, seed=seed)
+  return search.search(board, roll, budget, remaining_rounds, used_unique_tiles, unique_tile_placed)
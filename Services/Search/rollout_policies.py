@@ -0,0 +1,96 @@
+from random import Random
+from typing import Callable, Dict, List, Sequence
+from Models.board import CENTRAL_CELLS, Board
+from Models.enums import UniqueTiles
+from Models.game import MAX_UNIQUE_TILES
+from Services.Dice.dice_service import roll_dice
+from Services.Moves.move_generator import Placement, generate_round_placements, generate_unique_tile_placements
+from Services.Pieces.piece_registry import Dice, get_piece_registry
+
+# A rollout policy plays the game on the board to its end, starting with the remaining dice of the current round and
+# followed by the passed number of rounds with freshly rolled dice. It follows the rules of Game, given the bitmask of
+# the unique tiles used so far and whether one may still be placed in the current round, and returns the bitmask of
+# the used unique tiles after its placements. It has to place through Board.place or place_id, so the search can take
+# the placements back.
+RolloutPolicy = Callable[[Board, Sequence[Dice], int, Random, int, bool], int]
+
+_CENTRAL = frozenset(CENTRAL_CELLS)
+
+
+def play_round(
+  board: Board,
+  dice: Sequence[Dice],
+  rng: Random,
+  choose: Callable[[Board, List[Placement], Random], int],
+  used_unique_tiles: int = 0,
+  unique_tile_allowed: bool = True,
+) -> int:
+  '''
+  Places the dice of a round one after another, until none of the remaining dice can be placed legally. While allowed,
+  the placements of the unique tiles, which are not set in the bitmask of used unique tiles, are offered as well. Once
+  no dice can be placed, ending the round is one more option, which is taken with the chance of a single placement, as
+  in play_random_game. choose returns the index of the placement to make. Returns the bitmask of the used unique tiles
+  after the round.
+  '''
+  registry = get_piece_registry()
+  dice = list(dice)
+  tile_allowed = unique_tile_allowed and used_unique_tiles.bit_count() < MAX_UNIQUE_TILES
+
+  while True:
+    placements = generate_round_placements(board, dice) if dice else []
+    can_end = not placements
+    if tile_allowed:
+      placements.extend(generate_unique_tile_placements(board, used_unique_tiles))
+    if not placements or can_end and rng.randrange(len(placements) + 1) == len(placements):
+      return used_unique_tiles
+
+    index, piece_id = placements[choose(board, placements, rng)]
+    board.place_id(index, piece_id)
+    face = registry.get_by_id(piece_id).dice # type: ignore
+    if isinstance(face, UniqueTiles):
+      used_unique_tiles |= 1 << face.value
+      tile_allowed = False
+    else:
+      dice.remove(face)
+
+def random_rollout(
+  board: Board, dice: Sequence[Dice], remaining_rounds: int, rng: Random, used_unique_tiles: int = 0, unique_tile_allowed: bool = True,
+) -> int:
+  '''
+  Plays every round with uniformly random legal placements.
+  '''
+  return _play_rounds(board, dice, remaining_rounds, rng, _choose_random, used_unique_tiles, unique_tile_allowed)
+
+def central_rollout(
+  board: Board, dice: Sequence[Dice], remaining_rounds: int, rng: Random, used_unique_tiles: int = 0, unique_tile_allowed: bool = True,
+) -> int:
+  '''
+  Plays every round with random legal placements, preferring placements on the central squares.
+  '''
+  return _play_rounds(board, dice, remaining_rounds, rng, _choose_central, used_unique_tiles, unique_tile_allowed)
+
+def _play_rounds(
+  board: Board,
+  dice: Sequence[Dice],
+  remaining_rounds: int,
+  rng: Random,
+  choose: Callable[[Board, List[Placement], Random], int],
+  used_unique_tiles: int,
+  unique_tile_allowed: bool,
+) -> int:
+  used_unique_tiles = play_round(board, dice, rng, choose, used_unique_tiles, unique_tile_allowed)
+  for _ in range(remaining_rounds):
+    used_unique_tiles = play_round(board, roll_dice(rng), rng, choose, used_unique_tiles)
+
+  return used_unique_tiles
+
+def _choose_random(board: Board, placements: List[Placement], rng: Random) -> int:
+  return rng.randrange(len(placements))
+
+def _choose_central(board: Board, placements: List[Placement], rng: Random) -> int:
+  central = [position for position, (index, _) in enumerate(placements) if index in _CENTRAL]
+  return rng.choice(central) if central else rng.randrange(len(placements))
+
+
+# The policies by name, e.g. for command line options.
+ROLLOUT_POLICIES: Dict[str, RolloutPolicy] = {"random": random_rollout, "central": central_rollout}
@@ -0,0 +1,103 @@
+from array import array
+from typing import Tuple
+
+# Bytes per entry: key (8), check (8), value (8), priority (4) and the used flag (1).
+ENTRY_SIZE = 29
+BUCKET_SIZE = 2
+
+_KEY_MASK = (1 << 64) - 1
+
+
+class TranspositionTable:
+  '''
+  Fixed size table of values keyed by a 64 bit hash, e.g. Board.zobrist_hash, so work done for a board can be reused,
+  when the same board is reached by another placement order.
+
+  The table holds as many entries as fit into memory_bytes (rounded down to a power of two) in buckets of two slots.
+  The first slot of a bucket keeps the entry with the highest priority, e.g. search depth or visit count, and is only
+  replaced by an entry of at least the same priority. The second slot takes every other entry.
+
+  Every entry also stores a check, a second 64 bit hash independent of the key, e.g. hash(board.to_bytes()). Keys and
+  checks are compared in full, so a lookup only returns the value of another board, if both hashes collide.
+  '''
+  __slots__ = ("_keys", "_checks", "_values", "_priorities", "_used", "_bucket_mask", "size", "hits", "misses")
+
+  def __init__(self, memory_bytes: int = 16 << 20):
+    buckets = 1
+    while buckets * 2 * BUCKET_SIZE * ENTRY_SIZE <= memory_bytes:
+      buckets *= 2
+
+    capacity = buckets * BUCKET_SIZE
+    self._keys = array("Q", [0]) * capacity
+    self._checks = array("Q", [0]) * capacity
+    self._values = array("d", [0.0]) * capacity
+    self._priorities = array("i", [0]) * capacity
+    self._used = array("b", [0]) * capacity
+    self._bucket_mask = buckets - 1
+    self.size = 0
+    self.hits = 0
+    self.misses = 0
+
+  @property
+  def capacity(self) -> int:
+    return len(self._keys)
+
+  def __len__(self) -> int:
+    return self.size
+
+  def probe(self, key: int, check: int = 0) -> Tuple[float, int] | None:
+    '''
+    Returns the (value, priority) stored for the key and check or None.
+    '''
+    key &= _KEY_MASK
+    check &= _KEY_MASK
+    slot = (key & self._bucket_mask) * BUCKET_SIZE
+    for slot in (slot, slot + 1):
+      if self._used[slot] and self._keys[slot] == key and self._checks[slot] == check:
+        self.hits += 1
+        return self._values[slot], self._priorities[slot]
+
+    self.misses += 1
+    return None
+
+  def store(self, key: int, value: float, priority: int = 0, check: int = 0) -> None:
+    '''
+    Stores the value for the key and check. An existing entry for both is updated in place, otherwise the entry
+    replaces the preferred slot, if its priority is at least that of the stored entry, or else the second slot.
+    '''
+    key &= _KEY_MASK
+    check &= _KEY_MASK
+    preferred = (key & self._bucket_mask) * BUCKET_SIZE
+    other = preferred + 1
+    used, keys, checks, priorities = self._used, self._keys, self._checks, self._priorities
+
+    if used[preferred] and keys[preferred] == key and checks[preferred] == check:
+      slot = preferred
+    elif used[other] and keys[other] == key and checks[other] == check:
+      slot = other
+      if priority >= priorities[preferred] or not used[preferred]:
+        # Promote the entry, the former preferred entry takes the second slot.
+        self._write(other, keys[preferred], checks[preferred], self._values[preferred], priorities[preferred], used[preferred])
+        slot = preferred
+    elif not used[preferred] or priority >= priorities[preferred]:
+      if used[preferred]:
+        self._write(other, keys[preferred], checks[preferred], self._values[preferred], priorities[preferred], 1)
+      slot = preferred
+    else:
+      slot = other
+
+    self._write(slot, key, check, value, priority, 1)
+
+  def clear(self) -> None:
+    self._used = array("b", [0]) * self.capacity
+    self.size = 0
+    self.hits = 0
+    self.misses = 0
+
+  def _write(self, slot: int, key: int, check: int, value: float, priority: int, used: int) -> None:
+    self.size += used - self._used[slot]
+    self._keys[slot] = key
+    self._checks[slot] = check
+    self._values[slot] = value
+    self._priorities[slot] = priority
+    self._used[slot] = used
@@ -0,0 +1,74 @@
+import glob
+import os
+import random
+from Models.board import Board, cell_coordinates
+from Services.Board.Evaluation.batch_evaluation_service import encode_boards, evaluate_boards_batch
+from Services.Board.Evaluation.board_evaluation_service import evaluate_board_position
+from Services.Dice.dice_service import roll_dice
+from Services.Pieces.piece_registry import get_piece_registry
+from Services.Pieces.piece_service import get_piece_by_name
+from Services.Search.rollout_policies import random_rollout
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+
+def _assert_matches_scalar(boards):
+  scores = evaluate_boards_batch(boards)
+
+  assert scores.shape == (len(boards),)
+  assert scores.tolist() == [evaluate_board_position(board) for board in boards]
+
+def test_fixture_boards():
+  '''
+  Tests, whether the batch evaluator matches the scalar evaluator on all fixture boards.
+  '''
+  boards = []
+  for path in sorted(glob.glob(os.path.join(current_dir, "Boards", "*.json"))):
+    with open(path) as f:
+      boards.append(Board.from_json(f.read()))
+
+  _assert_matches_scalar(boards)
+
+def test_random_boards():
+  '''
+  Tests, whether the batch evaluator matches the scalar evaluator on random and played boards.
+  '''
+  rng = random.Random(0)
+  pieces = get_piece_registry().pieces
+  boards = []
+
+  for _ in range(150):
+    board = Board()
+    for index in rng.sample(range(49), rng.randint(0, 49)):
+      board.set_piece(*cell_coordinates(index), rng.choice(pieces))
+    boards.append(board)
+
+  for _ in range(50):
+    board = Board()
+    random_rollout(board, roll_dice(rng), 6, rng)
+    boards.append(board)
+
+  _assert_matches_scalar(boards)
+
+def test_lines_and_loops():
+  '''
+  Tests the routes, which are scored without a search: a loop of four curves and a line leaving an exit.
+  '''
+  board = Board()
+  for x, y, name in ((2, 2, "curved_road_east_south"), (3, 2, "curved_road_south_west"), (3, 3, "curved_road_west_north"), (2, 3, "curved_road_north_east")):
+    board.set_piece(x, y, get_piece_by_name(name))
+  for y in (0, 1, 6):
+    board.set_piece(3, y, get_piece_by_name("straight_rail_north_south"))
+
+  _assert_matches_scalar([board, Board()])
+
+def test_encoded_boards():
+  '''
+  Tests, whether boards can be passed as an (N, 7, 7) array of piece ids.
+  '''
+  board = Board()
+  board.set_piece(1, 0, get_piece_by_name("straight_road_north_south"))
+  ids = encode_boards([board, Board()])
+
+  assert ids.shape == (2, 7, 7)
+  assert ids[0, 1, 0] == get_piece_by_name("straight_road_north_south").id
+  assert evaluate_boards_batch(ids).tolist() == [evaluate_board_position(board), 0]
@@ -0,0 +1,90 @@
+import numpy as np
+from Models.board import Board
+from Services.Board.Evaluation.batch_evaluation_service import evaluate_boards_batch
+from Services.Board.Evaluation.board_evaluation_service import evaluate_board_position
+from Services.Board.Storage.board_codec import ENCODED_SIZE, ENCODED_SIZE_WITH_SCORE, decode_board, encode_board
+from Services.Board.Storage.position_dataset import PositionDataset, PositionDatasetWriter
+from Services.Game.game_simulator import play_random_game
+import pytest
+
+def test_codec_round_trip():
+  '''
+  Tests, whether boards are decoded as encoded, with and without score.
+  '''
+  board = Board.from_bytes(bytes(play_random_game(3)))
+
+  data = encode_board(board)
+  assert len(data) == ENCODED_SIZE
+  assert decode_board(data) == (board, None)
+
+  data = encode_board(board, -12)
+  assert len(data) == ENCODED_SIZE_WITH_SCORE
+  decoded, score = decode_board(data)
+  assert decoded.cells == board.cells
+  assert decoded.zobrist_hash == board.zobrist_hash
+  assert score == -12
+
+def test_codec_rejects_invalid_data():
+  '''
+  Tests, whether foreign, truncated or newer data and unknown piece ids are rejected.
+  '''
+  data = encode_board(Board())
+
+  with pytest.raises(ValueError):
+    decode_board(b"XX" + data[2:])
+  with pytest.raises(ValueError):
+    decode_board(data[:-1])
+  with pytest.raises(ValueError):
+    decode_board(data[:2] + bytes([2]) + data[3:])
+  with pytest.raises(ValueError):
+    decode_board(data[:-1] + bytes([60]))
+
+def test_to_json_without_file(tmp_path):
+  '''
+  Tests, whether to_json returns the JSON and only writes the passed path.
+  '''
+  board = Board.from_bytes(bytes(play_random_game(4, 2)))
+  path = tmp_path / "exported.json"
+
+  data = board.to_json(str(path))
+  assert path.read_text() == data
+  assert Board.from_json(board.to_json(None)) == board
+
+def test_dataset_round_trip(tmp_path):
+  '''
+  Tests, whether a dataset written in two sessions is read back as written and can be scored without copies.
+  '''
+  path = tmp_path / "positions.rids"
+  boards = [Board.from_bytes(bytes(play_random_game(seed))) for seed in range(6)]
+
+  with PositionDatasetWriter(path) as writer:
+    writer.append(boards[0], evaluate_board_position(boards[0]), 7)
+    writer.append(boards[1].to_bytes())
+  with PositionDatasetWriter(path) as writer:
+    cells = np.frombuffer(b"".join(board.to_bytes() for board in boards[2:]), dtype=np.uint8).reshape(-1, 49)
+    writer.extend(cells, [1, 2, 3, 4])
+
+  dataset = PositionDataset(path)
+  assert len(dataset) == 6
+  assert [board for board, _ in dataset] == boards
+  assert [score for _, score in dataset] == [evaluate_board_position(boards[0]), None, 1, 2, 3, 4]
+  assert dataset.rounds[0] == 7
+
+  assert isinstance(dataset.records, np.memmap)
+  assert list(evaluate_boards_batch(dataset.cells)) == [evaluate_board_position(board) for board in boards]
+
+def test_dataset_rejects_other_files(tmp_path):
+  '''
+  Tests, whether files of other formats are not opened as datasets and empty datasets can be read.
+  '''
+  path = tmp_path / "other.bin"
+  path.write_bytes(b"not a dataset at all")
+
+  with pytest.raises(ValueError):
+    PositionDataset(path)
+  with pytest.raises(ValueError):
+    PositionDatasetWriter(path)
+
+  empty = tmp_path / "empty.rids"
+  PositionDatasetWriter(empty).close()
+  assert len(PositionDataset(empty)) == 0
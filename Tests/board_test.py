@@ -1,3 +1,4 @@
+import json
 import os
 from Models.board import Board
 from Models.enums import SquareConnectorType
@@ -5,6 +6,7 @@ from Models.square import Square
 from Services.Board.Evaluation.board_evaluation_service import determine_deductions_for_unconnected_pieces, determine_points_from_longest_railway, determine_points_from_longest_road, evaluate_board_position # type: ignore
 from Services.Board.Evaluation.board_evaluation_service import determine_points_from_networks # type: ignore
 from Services.Board.Evaluation.board_evaluation_service import determine_points_from_central_squares # type: ignore
+from Services.Pieces.piece_service import get_piece_by_name
 import pytest
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -129,4 +131,35 @@ def test_board_evaluation_penalties_edge_piece_non_fitting(board_name: str, expe
   with open(os.path.join(current_dir, "Boards/" + board_name)) as f:
     board = Board.from_json(f.read())
     deductions = determine_deductions_for_unconnected_pieces(board)
-    assert deductions == expected_deductions
\ No newline at end of file
+    assert deductions == expected_deductions
+
+def test_board_copy_is_independent():
+  '''
+  Tests, whether a copied board shares no state with the original and the Square views reflect the cell array.
+  '''
+  with open(os.path.join(current_dir, "Boards/two_networks_board.json")) as f:
+    board = Board.from_json(f.read())
+
+  copy = board.copy()
+  assert copy.cells == board.cells
+
+  copy.grid[3][3].piece = board.grid[5][0].piece
+  assert copy.get_piece(3, 3) is board.get_piece(5, 0)
+  assert board.grid[3][3].piece is None
+  assert evaluate_board_position(copy) != evaluate_board_position(board)
+
+@pytest.mark.parametrize("x, y", [(0, 8), (0, -1), (7, 0), (-1, 3)])
+def test_board_rejects_squares_off_the_board(x: int, y: int):
+  '''
+  Tests, whether coordinates off the board raise instead of addressing another cell.
+  '''
+  board = Board()
+  piece = get_piece_by_name("four_road")
+
+  with pytest.raises(ValueError):
+    board.set_piece(x, y, piece)
+  with pytest.raises(ValueError):
+    board.place(x, y, piece)
+  with pytest.raises(ValueError):
+    Board.from_json(json.dumps([[{"x": x, "y": y, "piece": "four_road"}]]))
+  assert not board.cells.count(piece.id)
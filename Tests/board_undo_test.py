@@ -0,0 +1,86 @@
+import random
+from Models.board import Board
+from Services.Board.Evaluation.board_evaluation_service import evaluate_board_position
+from Services.Board.Evaluation.incremental_evaluator import IncrementalEvaluator
+from Services.Board.Evaluation.network_engine import NetworkUnionFind
+from Services.Game.game_simulator import play_random_game
+from Services.Pieces.piece_service import get_piece_by_name
+import pytest
+
+def _state(board: Board):
+  return bytes(board.cells), board.zobrist_hash, sorted(board.frontier), sorted(board.occupied)
+
+def _placements(seed: int):
+  cells = play_random_game(seed)
+  placements = [(index, piece_id) for index, piece_id in enumerate(cells) if piece_id]
+  random.Random(seed).shuffle(placements)
+  return placements
+
+def test_undo_restores_board():
+  '''
+  Tests, whether taking back placements restores cells, hash, frontier and occupied squares of every earlier state.
+  '''
+  board = Board()
+  states = [_state(board)]
+  for index, piece_id in _placements(1):
+    board.place_id(index, piece_id)
+    states.append(_state(board))
+
+  assert board.undo_depth == len(states) - 1
+  while board.undo_depth:
+    states.pop()
+    board.undo()
+    assert _state(board) == states[-1]
+
+def test_place_and_undo_errors():
+  '''
+  Tests, whether placing on an occupied square and undoing without placements are refused.
+  '''
+  board = Board()
+  piece = get_piece_by_name("straight_rail_north_south")
+  board.place(3, 0, piece)
+
+  with pytest.raises(ValueError):
+    board.place(3, 0, piece)
+  assert board.undo() == 3 * 7
+  with pytest.raises(ValueError):
+    board.undo()
+
+@pytest.mark.parametrize("seed", range(5))
+def test_attached_evaluator_follows_undo(seed: int):
+  '''
+  Tests, whether an attached incremental evaluator matches the full evaluation through random placements and undos.
+  '''
+  rng = random.Random(seed)
+  board = Board()
+  evaluator = IncrementalEvaluator(board)
+  for index, piece_id in _placements(seed):
+    board.place_id(index, piece_id)
+    assert evaluator.total == evaluate_board_position(board)
+    if rng.random() < 0.4:
+      board.undo_to(rng.randrange(board.undo_depth + 1))
+      assert evaluator.total == evaluate_board_position(board)
+
+  board.undo_to(0)
+  assert evaluator.total == 0
+
+def test_networks_remove_last_piece():
+  '''
+  Tests, whether removing the latest pieces from the networks restores their earlier points.
+  '''
+  board = Board()
+  networks = NetworkUnionFind(board.cells)
+  points = [networks.points]
+  for index, piece_id in _placements(3):
+    board.place_id(index, piece_id)
+    networks.add_piece(index)
+    points.append(networks.points)
+
+  while board.undo_depth:
+    board.undo()
+    networks.remove_last_piece()
+    points.pop()
+    assert networks.points == points[-1]
+
+  with pytest.raises(ValueError):
+    networks.remove_last_piece()
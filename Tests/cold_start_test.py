@@ -0,0 +1,59 @@
+import marshal
+import os
+import subprocess
+import sys
+from Services.Pieces.piece_registry import PIECE_FILES, PIECES_DIRECTORY, build_piece_cache, load_piece_data
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_evaluation_path_from_other_directory(tmp_path):
+  '''
+  Tests, whether boards are evaluated outside of the repository root without importing matplotlib or numpy.
+  '''
+  script = (
+    "import sys\n"
+    "from Models.board import Board\n"
+    "from Services.Board.Evaluation.board_evaluation_service import evaluate_board_position\n"
+    "from Services.Pieces.piece_service import get_piece_by_name\n"
+    "board = Board()\n"
+    "board.set_piece(3, 0, get_piece_by_name('straight_rail_north_south'))\n"
+    "print(evaluate_board_position(board), 'matplotlib' in sys.modules, 'numpy' in sys.modules)\n"
+  )
+  output = subprocess.run(
+    [sys.executable, "-c", script], cwd=tmp_path, env=dict(os.environ, PYTHONPATH=root_dir), check=True, capture_output=True, text=True,
+  ).stdout
+
+  assert output.split()[1:] == ["False", "False"]
+
+def test_piece_cache(tmp_path):
+  '''
+  Tests, whether the piece cache is only written by build_piece_cache, served while it matches the piece files and
+  ignored afterwards.
+  '''
+  cache_path = str(tmp_path / "pieces.marshal")
+  data = load_piece_data()
+  assert load_piece_data(cache_path) == data
+  assert not os.path.exists(cache_path)
+
+  assert build_piece_cache(cache_path) == cache_path
+  assert load_piece_data(cache_path) == data
+
+  with open(cache_path, "wb") as file:
+    marshal.dump((((0, 0),) * len(PIECE_FILES), ([], [], [])), file)
+  assert load_piece_data(cache_path) == data
+
+def test_no_cache_written_on_import(tmp_path):
+  '''
+  Tests, whether loading the pieces in a fresh process writes no file into the package directory or the user cache.
+  '''
+  def list_files():
+    return {os.path.join(directory, name) for directory, _, names in os.walk(PIECES_DIRECTORY) for name in names}
+
+  before = list_files()
+  subprocess.run(
+    [sys.executable, "-c", "from Services.Pieces.piece_registry import get_piece_registry; get_piece_registry()"],
+    cwd=tmp_path, env=dict(os.environ, PYTHONPATH=root_dir, PYTHONDONTWRITEBYTECODE="1", XDG_CACHE_HOME=str(tmp_path / "cache")), check=True,
+  )
+
+  assert list_files() <= before
+  assert not os.path.exists(tmp_path / "cache")
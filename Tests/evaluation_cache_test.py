@@ -0,0 +1,84 @@
+import threading
+from Models.board import Board
+from Services.Board.Evaluation.board_evaluation_service import determine_points_from_central_squares, determine_points_from_longest_road, evaluate_board_position
+from Services.Board.Evaluation.evaluation_cache import EvaluationCache, set_evaluation_cache
+from Services.Board.Symmetry.symmetry_service import LEFT_RIGHT, transform_board
+from Services.Game.game_simulator import play_random_game
+import pytest
+
+def _boards(count: int, rounds: int = 7):
+  return [Board.from_bytes(bytes(play_random_game(seed, rounds))) for seed in range(count)]
+
+@pytest.fixture
+def cache():
+  cache = EvaluationCache(max_size=100)
+  previous = set_evaluation_cache(cache)
+  yield cache
+  set_evaluation_cache(previous)
+
+def test_cached_scores_match(cache):
+  '''
+  Tests, whether scores and subscores are unchanged with the cache and served from it on repeated calls.
+  '''
+  boards = _boards(10)
+  set_evaluation_cache(None)
+  expected = [(evaluate_board_position(board), determine_points_from_central_squares(board.grid)) for board in boards]
+  set_evaluation_cache(cache)
+
+  assert [(evaluate_board_position(board), determine_points_from_central_squares(board.grid)) for board in boards] == expected
+  misses = cache.misses
+  assert [(evaluate_board_position(board), determine_points_from_central_squares(board.grid)) for board in boards] == expected
+  assert cache.misses == misses
+  assert cache.hits >= len(boards) * 2
+
+def test_symmetric_boards_share_entries(cache):
+  '''
+  Tests, whether the mirror image of a board is served from the entry of the board.
+  '''
+  board = next(board for board in _boards(20, 1) if transform_board(board, LEFT_RIGHT) is not None)
+  score = evaluate_board_position(board)
+  hits = cache.hits
+
+  assert evaluate_board_position(transform_board(board, LEFT_RIGHT)) == score # type: ignore
+  assert cache.hits == hits + 1
+
+def test_least_recently_used_is_evicted():
+  '''
+  Tests, whether the cache stays bounded and evicts the least recently used board.
+  '''
+  cache = EvaluationCache(max_size=2)
+  longest_road = cache.wrap(determine_points_from_longest_road.__wrapped__) # type: ignore
+  first, second, third = _boards(3)
+
+  longest_road(first)
+  longest_road(second)
+  longest_road(first)
+  longest_road(third)
+  assert cache.get_statistics() == {"hits": 1, "misses": 3, "evictions": 1, "size": 2, "max_size": 2}
+
+  longest_road(first)
+  longest_road(second)
+  assert cache.hits == 2
+  assert cache.misses == 4
+
+def test_threads_share_the_cache():
+  '''
+  Tests, whether threads evaluating the same boards get the same scores and keep the statistics consistent.
+  '''
+  cache = EvaluationCache(max_size=1000)
+  evaluate = cache.wrap(evaluate_board_position.__wrapped__) # type: ignore
+  boards = _boards(8)
+  expected = [evaluate_board_position(board) for board in boards]
+  results = []
+
+  def work():
+    results.append([evaluate(board) for board in boards * 5])
+
+  threads = [threading.Thread(target=work) for _ in range(4)]
+  for thread in threads:
+    thread.start()
+  for thread in threads:
+    thread.join()
+
+  assert all(result == expected * 5 for result in results)
+  assert cache.hits + cache.misses == 4 * 5 * len(boards)
@@ -0,0 +1,72 @@
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+from Models.board import Board
+from Services.Board.Evaluation.board_evaluation_service import evaluate_board_breakdown, evaluate_board_position
+from Services.Board.Evaluation.evaluation_stream import evaluate_payloads
+from Services.Board.Storage.board_codec import encode_board
+from Services.Board.Storage.board_reader import read_board_payloads
+from Services.Board.Storage.position_dataset import PositionDatasetWriter
+from Services.Game.game_simulator import play_random_game
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+
+def _boards(count: int):
+  return [Board.from_bytes(bytes(play_random_game(seed))) for seed in range(count)]
+
+def test_breakdown_adds_up():
+  '''
+  Tests, whether the breakdown totals the score of evaluate_board_position.
+  '''
+  for board in _boards(10):
+    breakdown = evaluate_board_breakdown(board)
+    assert breakdown["score"] == evaluate_board_position(board)
+    assert breakdown["score"] == breakdown["central"] + breakdown["networks"] + breakdown["longest_road"] + breakdown["longest_railway"] - breakdown["deductions"]
+
+def test_formats_are_read_alike(tmp_path):
+  '''
+  Tests, whether the same boards are read from JSON lines, encoded boards and datasets.
+  '''
+  boards = _boards(5)
+  lines = "".join(board.to_json(None).replace("\n", "") + "\n\n" for board in boards).encode()
+  (tmp_path / "boards.bin").write_bytes(b"".join(encode_board(board, seed) for seed, board in enumerate(boards)))
+  with PositionDatasetWriter(tmp_path / "boards.rids") as writer:
+    for board in boards:
+      writer.append(board)
+
+  expected = [evaluate_board_position(board) for board in boards]
+  for payloads in (
+    read_board_payloads("-", stdin=io.BytesIO(lines)),
+    read_board_payloads(str(tmp_path / "boards.bin")),
+    read_board_payloads(str(tmp_path / "boards.rids")),
+  ):
+    assert [result["score"] for result in evaluate_payloads(payloads)] == expected
+
+def test_pool_keeps_input_order():
+  '''
+  Tests, whether results of many small chunks come back in input order with errors of malformed boards in place.
+  '''
+  boards = _boards(12)
+  payloads = list(read_board_payloads("-", stdin=io.BytesIO(b"".join(board.to_json(None).replace("\n", "").encode() + b"\n" for board in boards))))
+  payloads.insert(5, ("broken", 0, "[[{\"x\": 0}]]"))
+  payloads.insert(8, ("off the board", 0, "[[{\"x\": 9, \"y\": 0, \"piece\": \"four_road\"}]]"))
+  payloads.insert(10, ("unknown id", 1, bytes([200]) + bytes(48)))
+
+  with ThreadPoolExecutor(max_workers=3) as executor:
+    results = list(evaluate_payloads(payloads, chunk_size=2, max_in_flight=2, executor=executor))
+
+  assert [result["source"] for result in results] == [source for source, _, _ in payloads]
+  assert all("error" in results[index] for index in (5, 8, 10))
+  assert [result["score"] for index, result in enumerate(results) if index not in (5, 8, 10)] == [evaluate_board_position(board) for board in boards]
+
+def test_grid_json_file():
+  '''
+  Tests, whether a grid JSON fixture is read as one board.
+  '''
+  path = os.path.join(current_dir, "Boards", "complex_road_network_board.json")
+  with open(path) as f:
+    board = Board.from_json(f.read())
+
+  results = list(evaluate_payloads(read_board_payloads(path)))
+  assert len(results) == 1
+  assert results[0]["score"] == evaluate_board_position(board)
@@ -0,0 +1,101 @@
+from random import Random
+from Models.board import Board
+from Models.game import ROUNDS, Game
+from Services.Board.Evaluation.board_evaluation_service import evaluate_board_position
+from Services.Dice.dice_service import encode_roll, get_roll_outcomes, roll_dice
+from Services.Game.game_simulator import play_random_game
+from Services.Search.expectimax import ExpectimaxSolver
+import pytest
+
+ALL_UNIQUE_TILES_USED = 0b111
+
+def _last_round(seed: int):
+  return Board.from_bytes(bytes(play_random_game(seed, ROUNDS - 1))), roll_dice(Random(seed))
+
+def _nearly_full_board(seed: int, free: int = 1):
+  '''
+  The final board of a random game, with all but free empty frontier squares filled, so only those can be played.
+  '''
+  board = Board.from_bytes(bytes(play_random_game(seed)))
+  frontier = sorted(board.frontier)
+  cells = bytearray(board.to_bytes())
+  for index in range(len(cells)):
+    if not cells[index] and index not in frontier[:free]:
+      cells[index] = 1
+
+  return Board.from_bytes(bytes(cells))
+
+def test_roll_outcomes():
+  '''
+  Tests, whether every distinct roll is listed once with the probability of rolling any of its orders.
+  '''
+  rng = Random(3)
+  outcomes = get_roll_outcomes()
+  probabilities = {encode_roll(roll): probability for roll, probability in outcomes}
+
+  assert len(outcomes) == len(probabilities) == 168
+  assert sum(probabilities.values()) == pytest.approx(1.0)
+  assert probabilities[encode_roll(roll_dice(rng))] in (1 / 648, 3 / 648, 6 / 648)
+
+@pytest.mark.parametrize("seed", range(3))
+def test_pruning_keeps_exact_values(seed: int):
+  '''
+  Tests, whether the pruned search finds the value of the unpruned one and its placements reach that score.
+  '''
+  board, roll = _last_round(seed)
+  result = ExpectimaxSolver().solve(board, roll, ROUNDS, ALL_UNIQUE_TILES_USED)
+  unpruned = ExpectimaxSolver(bound=lambda board, placements: 1 << 20).solve(board, roll, ROUNDS, ALL_UNIQUE_TILES_USED)
+
+  assert result.complete and unpruned.complete
+  assert result.value == unpruned.value
+  assert result.nodes <= unpruned.nodes
+
+  game = Game(board=board.copy())
+  game.round, game.used_unique_tiles, game.unique_tile_count = ROUNDS - 1, ALL_UNIQUE_TILES_USED, 3
+  game.roll(roll)
+  for placement in result.placements:
+    game.place(placement)
+  game.end_round()
+  assert game.score() == result.value
+  assert board.to_bytes() == Board.from_bytes(bytes(play_random_game(seed, ROUNDS - 1))).to_bytes()
+
+def test_chance_node_averages_rolls():
+  '''
+  Tests, whether the value before the last roll is the probability weighted value of every roll.
+  '''
+  board = _nearly_full_board(2)
+  solver = ExpectimaxSolver()
+  expected = sum(probability * solver.solve(board, roll).value for roll, probability in get_roll_outcomes())
+
+  assert ExpectimaxSolver().solve(board, [], ROUNDS - 1).value == pytest.approx(expected)
+
+def test_colliding_hashes_keep_exact_values(monkeypatch):
+  '''
+  Tests, whether boards sharing a Zobrist hash do not share memoized values.
+  '''
+  board, roll = _nearly_full_board(2, 3), roll_dice(Random(2))
+  expected = ExpectimaxSolver().solve(board, roll, ROUNDS - 1, ALL_UNIQUE_TILES_USED)
+
+  monkeypatch.setattr(Board, "zobrist_hash", property(lambda board: 0))
+  result = ExpectimaxSolver().solve(board, roll, ROUNDS - 1, ALL_UNIQUE_TILES_USED)
+  assert result.value == pytest.approx(expected.value)
+  assert result.placements == expected.placements
+
+def test_time_limit():
+  '''
+  Tests, whether an expired time limit returns an incomplete result with legal placements of a whole round and the
+  score they reach. An expired limit stops the search at the first check after 256 nodes.
+  '''
+  board, roll = _nearly_full_board(1, 5), roll_dice(Random(1))
+  result = ExpectimaxSolver().solve(board, roll, ROUNDS, ALL_UNIQUE_TILES_USED, time_limit=0.0)
+
+  assert not result.complete and result.placements
+
+  game = Game(board=board.copy())
+  game.round, game.used_unique_tiles, game.unique_tile_count = ROUNDS - 1, ALL_UNIQUE_TILES_USED, 3
+  game.roll(roll)
+  for placement in result.placements:
+    assert placement in game.get_legal_placements()
+    game.place(placement)
+  game.end_round()
+  assert game.score() == result.value == evaluate_board_position(game.board)
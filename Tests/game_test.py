@@ -0,0 +1,120 @@
+import random
+from Models.board import CELL_COUNT, Board, get_facing_connectors
+from Models.enums import BasicDice, SpecialDice, UniqueTiles
+from Models.game import MAX_UNIQUE_TILES, ROUNDS, Game
+from Services.Game.game_simulator import get_legal_moves, play_random_game
+from Services.Moves.move_generator import generate_round_placements
+from Services.Pieces.piece_registry import get_piece_registry
+from Services.Pieces.piece_service import get_piece_by_name
+import pytest
+
+ROLL = [BasicDice.straight_rail, BasicDice.straight_road, BasicDice.curved_road, SpecialDice.underground]
+
+def _assert_legally_connected(cells: bytes):
+  '''
+  Every piece continues at least one route and no road meets a railway, as later placements cannot undo either.
+  '''
+  registry = get_piece_registry()
+  for index in range(CELL_COUNT):
+    if not cells[index]:
+      continue
+
+    pairs = [(connector, other) for connector, other in zip(registry.connectors_by_id[cells[index]], get_facing_connectors(bytearray(cells), index)) if connector and other]
+    assert pairs and all(connector == other for connector, other in pairs)
+
+def test_round_rules():
+  '''
+  Tests, whether rounds have to be ended before the next roll and only once no dice can be placed any more.
+  '''
+  game = Game(seed=1)
+  game.roll(ROLL)
+
+  with pytest.raises(ValueError):
+    game.roll()
+  with pytest.raises(ValueError):
+    game.end_round()
+  with pytest.raises(ValueError):
+    game.place((0, get_piece_by_name("curved_rail_north_east").id))
+
+  while game.dice and game.get_legal_placements():
+    game.place(game.get_legal_placements()[0])
+  game.end_round()
+
+  assert not game.in_round
+  assert game.round == 1
+
+def test_unique_tile_limits():
+  '''
+  Tests, whether only one unique tile per round, every unique tile once and at most three per game may be placed.
+  '''
+  game = Game(seed=1)
+  game.roll(ROLL)
+  game.place((21, get_piece_by_name("four_railway").id))
+  assert not game.can_place_unique_tile(UniqueTiles.four_road)
+  with pytest.raises(ValueError):
+    game.place((7, get_piece_by_name("four_road").id))
+
+  game.dice = []
+  game.end_round()
+  game.roll(ROLL)
+  assert not game.can_place_unique_tile(UniqueTiles.four_rail)
+  assert game.can_place_unique_tile(UniqueTiles.four_road)
+
+  game.used_unique_tiles, game.unique_tile_count = 0b11, MAX_UNIQUE_TILES
+  assert not any(game.can_place_unique_tile(tile) for tile in UniqueTiles)
+
+def test_full_game():
+  '''
+  Tests, whether a game played through the Game API ends after seven rounds with a legal board.
+  '''
+  rng = random.Random(4)
+  game = Game(seed=4)
+
+  while not game.is_finished:
+    game.roll()
+    while True:
+      placements = game.get_legal_placements()
+      if not game.dice or not placements:
+        break
+      game.place(rng.choice(placements))
+    game.end_round()
+
+  assert game.round == ROUNDS
+  assert game.unique_tile_count <= MAX_UNIQUE_TILES
+  _assert_legally_connected(game.board.to_bytes())
+  assert isinstance(game.score(), int)
+
+@pytest.mark.parametrize("seed", range(3))
+def test_simulator_follows_game_rules(seed: int):
+  '''
+  Tests, whether the simulator offers the legal placements of Game in every position of a game, also once the dice
+  of a round are placed and only unique tiles are left.
+  '''
+  rng = random.Random(seed)
+  game = Game(seed=seed)
+  while not game.is_finished:
+    game.roll()
+    while True:
+      placements = game.get_legal_placements()
+      unique_tile_allowed = not game.unique_tile_placed and game.unique_tile_count < MAX_UNIQUE_TILES
+      assert sorted(get_legal_moves(game.board.to_bytes(), game.dice, game.used_unique_tiles, unique_tile_allowed)) == sorted(placements)
+      if not placements or (not generate_round_placements(game.board, game.dice) and rng.random() < 0.5):
+        break
+      game.place(rng.choice(placements))
+    game.end_round()
+
+@pytest.mark.parametrize("seed", range(10))
+def test_random_games(seed: int):
+  '''
+  Tests, whether simulated games are reproducible, legal and respect the unique tile limits.
+  '''
+  cells = play_random_game(seed)
+  registry = get_piece_registry()
+  tiles = [registry.get_by_id(piece_id).dice for piece_id in cells if piece_id and isinstance(registry.get_by_id(piece_id).dice, UniqueTiles)]
+
+  assert cells == play_random_game(seed)
+  assert len(tiles) <= MAX_UNIQUE_TILES
+  assert len(set(tiles)) == len(tiles)
+  assert 0 < sum(1 for piece_id in cells if piece_id) <= 4 * ROUNDS + MAX_UNIQUE_TILES
+  _assert_legally_connected(bytes(cells))
+  assert Board.from_bytes(bytes(cells)).cells == cells
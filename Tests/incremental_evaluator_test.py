@@ -0,0 +1,60 @@
+import os
+import random
+from Models.board import Board, cell_coordinates
+from Services.Board.Evaluation.board_evaluation_service import evaluate_board_position
+from Services.Board.Evaluation.incremental_evaluator import IncrementalEvaluator
+from Services.Pieces.piece_registry import get_piece_registry
+import pytest
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+board_files = sorted(os.listdir(os.path.join(current_dir, "Boards")))
+
+@pytest.mark.parametrize("board_name", board_files)
+def test_incremental_evaluator_matches_fixtures(board_name: str):
+  '''
+  Tests, whether rebuilding a fixture piece by piece through the incremental evaluator yields the full evaluation after every step.
+  '''
+  with open(os.path.join(current_dir, "Boards", board_name)) as f:
+    fixture = Board.from_json(f.read())
+
+  board = Board()
+  evaluator = IncrementalEvaluator(board)
+  for index, piece_id in enumerate(fixture.cells):
+    if piece_id:
+      x, y = cell_coordinates(index)
+      total = evaluator.place(x, y, fixture.get_piece(x, y))
+      assert total == evaluate_board_position(board)
+
+  assert evaluator.total == evaluate_board_position(fixture)
+  assert IncrementalEvaluator(fixture).total == evaluate_board_position(fixture)
+
+def test_incremental_evaluator_place_and_remove():
+  '''
+  Tests, whether random placements and removals keep the incremental totals equal to the full evaluation.
+  '''
+  rng = random.Random(7)
+  pieces = get_piece_registry().pieces
+
+  for _ in range(30):
+    board = Board()
+    evaluator = IncrementalEvaluator(board)
+    cells = rng.sample(range(49), rng.randint(1, 30))
+
+    for index in cells:
+      x, y = cell_coordinates(index)
+      assert evaluator.place(x, y, rng.choice(pieces)) == evaluate_board_position(board)
+
+    for index in rng.sample(cells, len(cells) // 2):
+      x, y = cell_coordinates(index)
+      assert evaluator.remove(x, y) == evaluate_board_position(board)
+
+def test_incremental_evaluator_rejects_invalid_changes():
+  board = Board()
+  evaluator = IncrementalEvaluator(board)
+  piece = get_piece_registry().get_by_name("four_road")
+
+  evaluator.place(3, 3, piece)
+  with pytest.raises(ValueError):
+    evaluator.place(3, 3, piece)
+  with pytest.raises(ValueError):
+    evaluator.remove(0, 0)
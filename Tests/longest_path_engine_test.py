@@ -0,0 +1,77 @@
+from Benchmarks.board_generators import create_dense_road_board, create_four_road_board
+from Models.board import Board, cell_coordinates, cell_index
+from Models.enums import SquareConnectorType
+from Services.Board.Evaluation.longest_path_engine import find_longest_path
+from Services.Pieces.piece_registry import get_piece_registry
+from Services.Pieces.piece_service import get_piece_by_name
+from Tests.longest_path_helpers import exhaustive_longest_path
+import pytest
+import random
+
+def test_empty_board_has_no_path():
+  '''
+  Tests, whether an empty board has neither a road nor a railway.
+  '''
+  board = Board()
+
+  assert find_longest_path(board.cells, SquareConnectorType.road.value) == 0
+  assert find_longest_path(board.cells, SquareConnectorType.railway.value) == 0
+
+def test_straight_railway():
+  '''
+  Tests, whether a straight railway counts every square once.
+  '''
+  board = Board()
+  for y in range(5):
+    board.set_piece(3, y, get_piece_by_name("straight_rail_north_south"))
+
+  assert find_longest_path(board.cells, SquareConnectorType.railway.value) == 5
+  assert find_longest_path(board.cells, SquareConnectorType.road.value) == 0
+
+def test_start_restricts_to_component():
+  '''
+  Tests, whether a start square only measures the railway it belongs to.
+  '''
+  board = Board()
+  for y in range(5):
+    board.set_piece(1, y, get_piece_by_name("straight_rail_north_south"))
+  for y in range(2):
+    board.set_piece(5, y, get_piece_by_name("straight_rail_north_south"))
+
+  assert find_longest_path(board.cells, SquareConnectorType.railway.value, start=cell_index(1, 0)) == 5
+  assert find_longest_path(board.cells, SquareConnectorType.railway.value, start=cell_index(5, 1)) == 2
+  assert find_longest_path(board.cells, SquareConnectorType.railway.value, start=cell_index(3, 3)) == 0
+
+@pytest.mark.parametrize("width, height, expected", [
+  (2, 2, 5),
+  (2, 3, 15),
+  (3, 3, 25),
+  (3, 4, 35),
+])
+def test_four_road_blocks(width: int, height: int, expected: int):
+  '''
+  Tests blocks of four way road junctions, where a path passes every junction several times.
+  '''
+  board = create_four_road_board(width, height)
+
+  assert find_longest_path(board.cells, SquareConnectorType.road.value) == expected
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_exhaustive_search_on_random_boards(seed: int):
+  '''
+  Tests, whether the engine finds the same lengths as an exhaustive search over all paths.
+  '''
+  rng = random.Random(seed)
+  pieces = get_piece_registry().pieces
+
+  for _ in range(20):
+    board = Board()
+    for index in rng.sample(range(49), rng.randint(0, 35)):
+      board.set_piece(*cell_coordinates(index), rng.choice(pieces))
+
+    for connector in (SquareConnectorType.road, SquareConnectorType.railway):
+      assert find_longest_path(board.cells, connector.value) == exhaustive_longest_path(board, connector)
+
+  for _ in range(5):
+    board = create_dense_road_board(rng, 3, 4)
+    assert find_longest_path(board.cells, SquareConnectorType.road.value) == exhaustive_longest_path(board, SquareConnectorType.road)
@@ -0,0 +1,66 @@
+'''
+The exhaustive longest path search, which the longest path engine replaced, as oracle of the longest path tests.
+'''
+from typing import Set, Tuple
+from Models.board import Board
+from Models.enums import SquareConnectorType
+from Models.square import Square
+
+
+def exhaustive_longest_path(board: Board, connector: SquareConnectorType) -> int:
+  '''
+  The exhaustive search, which determine_points_from_longest_road and determine_points_from_longest_railway used
+  before the longest path engine. Starts a depth first search copying the visited states from every occupied square.
+  '''
+  longest = 0
+  for square in board.get_squares_with_pieces():
+    assert square.piece is not None
+
+    if connector not in (square.piece.north, square.piece.east, square.piece.south, square.piece.west):
+      continue
+
+    longest = max(longest, _find_longest_path_from_node(square, "", set(), board, connector))
+
+  return longest
+
+def _find_longest_path_from_node(node: Square, incoming_orientation: str, visited: Set[Tuple[Square, str]], board: Board, connector: SquareConnectorType) -> int:
+  if (node, incoming_orientation) in visited:
+    return 0
+
+  visited = visited.copy()
+  visited.add((node, incoming_orientation))
+
+  best = 1
+  for neighbor, orientation in _get_neighbors(node, board, incoming_orientation, connector):
+    length = 1 + _find_longest_path_from_node(neighbor, orientation, visited, board, connector)
+    if length > best:
+      best = length
+
+  return best
+
+def _get_neighbors(node: Square, board: Board, incoming_orientation: str, connector: SquareConnectorType) -> Set[Tuple[Square, str]]:
+  piece = node.piece
+  assert piece is not None
+  neighbors: Set[Tuple[Square, str]] = set()
+
+  if piece.north == connector and node.y > 0 and incoming_orientation != "south":
+    adjacent = board.grid[node.x][node.y - 1]
+    if adjacent.piece and adjacent.piece.south == connector:
+      neighbors.add((adjacent, "north"))
+
+  if piece.east == connector and node.x < 6 and incoming_orientation != "west":
+    adjacent = board.grid[node.x + 1][node.y]
+    if adjacent.piece and adjacent.piece.west == connector:
+      neighbors.add((adjacent, "east"))
+
+  if piece.south == connector and node.y < 6 and incoming_orientation != "north":
+    adjacent = board.grid[node.x][node.y + 1]
+    if adjacent.piece and adjacent.piece.north == connector:
+      neighbors.add((adjacent, "south"))
+
+  if piece.west == connector and node.x > 0 and incoming_orientation != "east":
+    adjacent = board.grid[node.x - 1][node.y]
+    if adjacent.piece and adjacent.piece.east == connector:
+      neighbors.add((adjacent, "west"))
+
+  return neighbors
@@ -0,0 +1,74 @@
+from Models.board import Board
+from Models.enums import BasicDice, SpecialDice, UniqueTiles
+from Models.game import Game
+from Services.Dice.dice_service import ROLL_ID_COUNT, encode_roll
+from Services.Moves.move_generator import decode_placement
+from Services.Pieces.piece_service import get_piece_by_id
+from Services.Search.mcts import ROOT, MonteCarloTreeSearch, search
+from Services.Search.node_pool import NO_NODE, NodePool
+from Services.Search.rollout_policies import central_rollout
+import pytest
+
+ROLL = [BasicDice.straight_rail, BasicDice.curved_road, BasicDice.straight_rail, SpecialDice.underground]
+
+def test_node_pool_grows_and_links_children():
+  '''
+  Tests, whether the pool keeps its nodes and child links, when it has to grow.
+  '''
+  pool = NodePool(capacity=2)
+  root = pool.add(NO_NODE, 0)
+  children = [pool.add(root, move) for move in range(1, 6)]
+
+  assert len(pool) == 6
+  assert pool.capacity >= 6
+  assert sorted(pool.children(root)) == children
+  assert pool.find_child(root, 4) == children[3]
+  assert pool.find_child(root, 9) == NO_NODE
+
+  pool.clear()
+  assert len(pool) == 0
+
+def test_roll_id_ignores_dice_order():
+  '''
+  Tests, whether rolls with the same faces share an id.
+  '''
+  assert encode_roll(ROLL) == encode_roll(list(reversed(ROLL[:3])) + ROLL[3:])
+  assert 0 <= encode_roll(ROLL) < ROLL_ID_COUNT
+
+def test_search_returns_legal_round():
+  '''
+  Tests, whether the search places every dice of the round and at most one unique tile by the rules of Game and leaves
+  the passed board untouched.
+  '''
+  board = Board()
+  placements = search(board, ROLL, budget=150, remaining_rounds=1, seed=3, used_unique_tiles=0b1)
+
+  assert board.cells == Board().cells
+  game = Game(board=board.copy())
+  game.used_unique_tiles, game.unique_tile_count = 0b1, 1
+  game.roll(ROLL)
+  for placement in placements:
+    game.place(placement)
+  assert not game.dice
+  game.end_round()
+
+@pytest.mark.parametrize("used_unique_tiles, unique_tile_placed, expected", [(0, False, True), (0, True, False), (0b111, False, False)])
+def test_search_offers_unique_tiles(used_unique_tiles: int, unique_tile_placed: bool, expected: bool):
+  '''
+  Tests, whether the root offers the unique tiles only while one may be placed in the round.
+  '''
+  tree = MonteCarloTreeSearch(seed=1)
+  tree.search(Board(), ROLL, 10, 0, used_unique_tiles, unique_tile_placed)
+
+  tiles = {get_piece_by_id(decode_placement(tree.pool.move[child])[1]).dice for child in tree.pool.children(ROOT)}
+  assert any(isinstance(tile, UniqueTiles) for tile in tiles) == expected
+
+def test_search_is_deterministic_for_a_seed():
+  '''
+  Tests, whether the same seed yields the same placements and tree, also with a different rollout policy.
+  '''
+  first = MonteCarloTreeSearch(rollout=central_rollout, seed=7)
+  second = MonteCarloTreeSearch(rollout=central_rollout, seed=7)
+
+  assert first.search(Board(), ROLL, budget=80) == second.search(Board(), ROLL, budget=80)
+  assert len(first.pool) == len(second.pool)
@@ -0,0 +1,75 @@
+from typing import List
+from Models.board import CELL_COUNT, Board, cell_coordinates, get_facing_connectors
+from Models.enums import BasicDice, SpecialDice, UniqueTiles
+from Services.Moves.move_generator import Placement, generate_placements, is_legal_placement
+from Services.Pieces.piece_registry import Dice, get_piece_registry
+from Services.Pieces.piece_service import get_piece_by_name
+import pytest
+import random
+
+def _brute_force_placements(board: Board, dice: Dice) -> List[Placement]:
+  '''
+  Checks every piece of the dice against every empty square by comparing the connectors of the squares directly.
+  '''
+  placements = []
+  for index in range(CELL_COUNT):
+    if board.cells[index]:
+      continue
+
+    x, y = cell_coordinates(index)
+    facing = get_facing_connectors(board.cells, index)
+    for piece in get_piece_registry().get_for_dice(dice):
+      connectors = (piece.north.value, piece.east.value, piece.south.value, piece.west.value)
+      pairs = [(connector, other) for connector, other in zip(connectors, facing) if connector and other]
+      if pairs and all(connector == other for connector, other in pairs):
+        placements.append((index, piece.id))
+
+  return sorted(placements)
+
+def test_empty_board_only_allows_exits():
+  '''
+  Tests, whether a straight railway can only be placed on the railway exits of an empty board.
+  '''
+  placements = generate_placements(Board(), BasicDice.straight_rail)
+  names = {(cell_coordinates(index), get_piece_registry().get_by_id(piece_id).name) for index, piece_id in placements}
+
+  assert names == {
+    ((3, 0), "straight_rail_north_south"),
+    ((3, 6), "straight_rail_north_south"),
+    ((0, 1), "straight_rail_east_west"),
+    ((0, 5), "straight_rail_east_west"),
+    ((6, 1), "straight_rail_east_west"),
+    ((6, 5), "straight_rail_east_west"),
+  }
+
+def test_road_must_not_meet_railway():
+  '''
+  Tests, whether a piece is rejected, if it would connect a road to a railway.
+  '''
+  board = Board()
+  board.set_piece(3, 0, get_piece_by_name("straight_rail_north_south"))
+
+  assert is_legal_placement(board, 3, 1, get_piece_by_name("straight_rail_north_south"))
+  assert not is_legal_placement(board, 3, 1, get_piece_by_name("straight_road_north_south"))
+  assert not is_legal_placement(board, 3, 0, get_piece_by_name("straight_rail_north_south"))
+  assert not is_legal_placement(board, 2, 2, get_piece_by_name("straight_rail_north_south"))
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_brute_force(seed: int):
+  '''
+  Tests, whether the generator and the maintained frontier agree with checking every square against every piece.
+  '''
+  rng = random.Random(seed)
+  pieces = get_piece_registry().pieces
+  board = Board()
+
+  for _ in range(40):
+    x, y = cell_coordinates(rng.randrange(CELL_COUNT))
+    board.set_piece(x, y, None if rng.random() < 0.2 else rng.choice(pieces))
+
+    for dice in (rng.choice(list(BasicDice)), rng.choice(list(SpecialDice)), rng.choice(list(UniqueTiles))):
+      assert generate_placements(board, dice) == _brute_force_placements(board, dice)
+
+    copy = board.copy()
+    assert copy.frontier == board.frontier
+    assert copy.frontier is not board.frontier
@@ -0,0 +1,50 @@
+from Models.board import Board, cell_coordinates
+from Services.Board.Evaluation.board_evaluation_service import determine_points_from_networks
+from Services.Board.Evaluation.network_engine import NetworkUnionFind
+from Services.Pieces.piece_service import get_piece_by_name
+import pytest
+
+def _create_crossing_board(crossing: str) -> Board:
+  '''
+  Creates a board with a road from the west to the east exit and a railway from the north to the south exit,
+  which cross on the central square.
+  '''
+  board = Board()
+  for x in (0, 1, 2, 4, 5, 6):
+    board.set_piece(x, 3, get_piece_by_name("straight_road_east_west"))
+  for y in (0, 1, 2, 4, 5, 6):
+    board.set_piece(3, y, get_piece_by_name("straight_rail_north_south"))
+  board.set_piece(3, 3, get_piece_by_name(crossing))
+
+  return board
+
+@pytest.mark.parametrize("crossing, expected_points, expected_networks", [
+  ("underpass_east_west", 8, 2),
+  ("two_road_two_rail_straight_north_south", 12, 1),
+], ids=["underground", "station"])
+def test_crossing_networks(crossing: str, expected_points: int, expected_networks: int):
+  '''
+  Tests, whether an underground keeps both channels apart, while a station merges road and railway.
+  '''
+  board = _create_crossing_board(crossing)
+  networks = NetworkUnionFind.from_board(board)
+
+  assert networks.points == expected_points
+  assert determine_points_from_networks(board) == expected_points
+  assert len(networks.get_exit_masks()) == expected_networks
+
+def test_networks_grow_with_added_pieces():
+  '''
+  Tests, whether adding pieces one by one yields the same points as building the structure at once.
+  '''
+  board = _create_crossing_board("two_road_two_rail_straight_north_south")
+  empty = Board()
+  networks = NetworkUnionFind(empty.cells)
+
+  for index, piece_id in enumerate(board.cells):
+    if piece_id:
+      x, y = cell_coordinates(index)
+      empty.set_piece(x, y, board.get_piece(x, y))
+      networks.add_piece(index)
+
+  assert networks.points == 12
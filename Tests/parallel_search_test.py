@@ -0,0 +1,61 @@
+from concurrent.futures import ProcessPoolExecutor
+from Models.board import Board
+from Models.enums import BasicDice, SpecialDice
+from Models.game import Game
+from Services.Dice.dice_service import decode_dice, encode_dice
+from Services.Pieces.piece_service import get_piece_by_name
+from Services.Search.parallel_search import leaf_parallel_search, merge_statistics, root_parallel_search
+import pytest
+
+ROLL = [BasicDice.curved_rail, BasicDice.straight_road, BasicDice.road_t_junction, SpecialDice.curved_train_station]
+
+@pytest.fixture(scope="module")
+def executor():
+  with ProcessPoolExecutor(max_workers=2) as pool:
+    yield pool
+
+def _assert_uses_roll(placements):
+  game = Game()
+  game.roll(ROLL)
+  for placement in placements:
+    game.place(placement)
+  assert not game.dice
+
+def test_board_and_dice_encoding():
+  '''
+  Tests, whether boards and dice survive the compact encoding used between processes.
+  '''
+  board = Board()
+  board.set_piece(3, 0, get_piece_by_name("straight_rail_north_south"))
+  decoded = Board.from_bytes(board.to_bytes())
+
+  assert len(board.to_bytes()) == 49
+  assert decoded.cells == board.cells
+  assert decoded.frontier == board.frontier
+  assert decode_dice(encode_dice(ROLL)) == ROLL
+
+def test_merge_statistics():
+  merged = merge_statistics([{(): (3, 30.0), (5,): (2, 20.0)}, {(): (1, 5.0), (7,): (1, 5.0)}])
+
+  assert merged == {(): (4, 35.0), (5,): (2, 20.0), (7,): (1, 5.0)}
+
+def test_root_parallel_search_is_deterministic(executor: ProcessPoolExecutor):
+  '''
+  Tests, whether the merged search of several workers yields a full round and the same result for the same seed.
+  '''
+  first = root_parallel_search(Board(), ROLL, budget=60, workers=2, remaining_rounds=1, seed=5, executor=executor)
+  second = root_parallel_search(Board(), ROLL, budget=60, workers=2, remaining_rounds=1, seed=5, executor=executor)
+
+  _assert_uses_roll(first)
+  assert first == second
+
+def test_leaf_parallel_search_does_not_depend_on_workers(executor: ProcessPoolExecutor):
+  '''
+  Tests, whether leaf parallel results only depend on the seed and the batch size.
+  '''
+  parallel = leaf_parallel_search(Board(), ROLL, budget=60, workers=2, batch_size=8, seed=5, executor=executor)
+  with ProcessPoolExecutor(max_workers=1) as single:
+    serial = leaf_parallel_search(Board(), ROLL, budget=60, workers=1, batch_size=8, seed=5, executor=single)
+
+  _assert_uses_roll(parallel)
+  assert parallel == serial
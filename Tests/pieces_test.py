@@ -1,4 +1,6 @@
-from Services.Pieces.piece_service import get_all_basic_pieces, get_all_special_pieces, get_all_unique_pieces
+from Models.enums import BasicDice, SpecialDice, SquareConnectorType, UniqueTiles
+from Services.Pieces.piece_registry import get_piece_registry
+from Services.Pieces.piece_service import get_all_basic_pieces, get_all_special_pieces, get_all_unique_pieces, get_basic_pieces_for_dice, get_piece_by_id, get_piece_by_name, get_special_pieces_for_dice, get_unique_pieces_for_tile
 
 def test_basic_piece_service():
   pieces = get_all_basic_pieces()
@@ -10,4 +12,36 @@ def test_special_piece_service():
   
 def test_unique_piece_service():
   pieces = get_all_unique_pieces()
-  assert len(pieces) == 16
\ No newline at end of file
+  assert len(pieces) == 16
+
+def test_piece_registry_ids():
+  '''
+  Tests, whether every piece has a stable, contiguous id and lookups return the shared instances.
+  '''
+  registry = get_piece_registry()
+  assert len(registry) == 46
+  assert get_piece_by_id(0) is None
+
+  for piece_id in range(1, 47):
+    piece = get_piece_by_id(piece_id)
+    assert piece is not None
+    assert piece.id == piece_id
+    assert get_piece_by_name(piece.name) is piece
+
+  assert get_piece_by_name("straight_rail_north_south").id == 1
+  assert get_piece_registry() is registry
+
+def test_piece_registry_dice_and_signature_lookup():
+  '''
+  Tests, whether every dice face and unique tile resolves to its pieces and the signature lookup finds pieces by connectors.
+  '''
+  for dice in BasicDice:
+    assert len(get_basic_pieces_for_dice(dice)) in (2, 4)
+  for dice in SpecialDice:
+    assert len(get_special_pieces_for_dice(dice)) in (2, 4)
+  for tile in UniqueTiles:
+    assert len(get_unique_pieces_for_tile(tile)) in (1, 2, 4)
+
+  road, rail = SquareConnectorType.road.value, SquareConnectorType.railway.value
+  names = {piece.name for piece in get_piece_registry().get_by_signature(rail, road, rail, road)}
+  assert names == {"underpass_east_west", "two_road_two_rail_straight_north_south"}
@@ -0,0 +1,34 @@
+from Models.board import Board
+from Services.Board.Evaluation.batch_evaluation_service import evaluate_boards_batch
+from Services.Board.Evaluation.network_engine import NetworkUnionFind
+from Services.Board.Evaluation.port_graph import PortGraph
+from Services.Game.game_simulator import play_random_game
+
+def test_matches_batch_evaluation():
+  '''
+  Tests, whether the fused evaluation agrees with the batch evaluator on boards of every fill level.
+  '''
+  boards = [Board.from_bytes(bytes(play_random_game(seed, 1 + seed % 7))) for seed in range(300)]
+
+  assert [PortGraph(board.cells).get_score() for board in boards] == list(evaluate_boards_batch(boards))
+
+def test_networks_match_union_find():
+  '''
+  Tests, whether the traversal of the networks agrees with the incremental union-find.
+  '''
+  for seed in range(200):
+    board = Board.from_bytes(bytes(play_random_game(seed)))
+    assert PortGraph(board.cells).get_network_points() == NetworkUnionFind.from_board(board).points
+
+def test_breakdown_adds_up():
+  '''
+  Tests, whether the breakdown totals the score and the links only join matching connectors.
+  '''
+  board = Board.from_bytes(bytes(play_random_game(7)))
+  graph = PortGraph(board.cells)
+  breakdown = graph.get_breakdown()
+
+  assert breakdown["score"] == graph.get_score()
+  for port, partner in enumerate(graph.partners):
+    if partner != -1:
+      assert graph.partners[partner] == port
@@ -0,0 +1,89 @@
+from concurrent.futures import ProcessPoolExecutor
+import time
+from random import Random
+from Models.board import Board
+from Services.Analysis.roll_analysis import analyze_roll
+from Services.Board.Evaluation.board_evaluation_service import evaluate_board_position
+from Services.Dice.dice_service import roll_dice
+from Services.Game.game_simulator import play_random_game
+from Services.Moves.round_generator import generate_round_moves
+import pytest
+
+def _position(seed: int, rounds: int):
+  return Board.from_bytes(bytes(play_random_game(seed, rounds))), roll_dice(Random(seed))
+
+def test_analysis_ranks_by_score():
+  '''
+  Tests, whether the top candidates are the best scored resulting boards with their breakdowns.
+  '''
+  board, dice = _position(1, 6)
+  scores = []
+  for placements in generate_round_moves(board, dice):
+    result = board.copy()
+    for placement in placements:
+      result.place_id(*placement)
+    scores.append(evaluate_board_position(result))
+
+  analysis = analyze_roll(board, dice, top=5)
+  assert analysis.complete
+  assert analysis.evaluated == len(scores)
+  assert [candidate.score for candidate in analysis.candidates] == sorted(scores, reverse=True)[:5]
+  assert all(set(candidate.to_dict()) >= {"placements", "networks", "deductions", "score"} for candidate in analysis.candidates)
+
+def test_parallel_analysis_matches_serial():
+  '''
+  Tests, whether scoring in worker processes ranks the candidates like scoring in this process, also with rollouts.
+  '''
+  board, dice = _position(0, 6)
+  serial = analyze_roll(board, dice, top=4, remaining_rounds=1, lookahead=2, seed=3, chunk_size=16)
+  with ProcessPoolExecutor(max_workers=2) as executor:
+    parallel = analyze_roll(board, dice, top=4, remaining_rounds=1, lookahead=2, seed=3, chunk_size=16, workers=2, executor=executor)
+
+  assert [(candidate.placements, candidate.expected) for candidate in parallel.candidates] == [
+    (candidate.placements, candidate.expected) for candidate in serial.candidates
+  ]
+  assert parallel.candidates[0].expected is not None
+
+def test_time_limit():
+  '''
+  Tests, whether an expired time limit returns no candidates and a short one the best of those scored so far, ranked
+  by the score of their resulting boards.
+  '''
+  board, dice = _position(1, 5)
+  expired = analyze_roll(board, dice, top=3, used_unique_tiles=0, chunk_size=8, time_limit=0.0)
+
+  assert not expired.complete
+  assert expired.candidates == [] and expired.evaluated == 0
+
+  analysis = analyze_roll(board, dice, top=3, used_unique_tiles=0, chunk_size=8, time_limit=0.2)
+  assert not analysis.complete
+  assert 0 < len(analysis.candidates) <= 3
+  scores = [candidate.score for candidate in analysis.candidates]
+  assert scores == sorted(scores, reverse=True)
+  for candidate in analysis.candidates:
+    result = board.copy()
+    for placement in candidate.placements:
+      result.place_id(*placement)
+    assert candidate.score == evaluate_board_position(result)
+
+@pytest.fixture(scope="module")
+def executor():
+  with ProcessPoolExecutor(max_workers=2) as pool:
+    # Starts both workers, so the pool start up is not timed.
+    list(pool.map(time.sleep, [0.1, 0.1]))
+    yield pool
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_time_limit_stops_rollouts(workers: int, executor: ProcessPoolExecutor):
+  '''
+  Tests, whether the time limit holds within a rollout and returns the candidates scored so far, also when the
+  workers are still busy with their chunks. Scoring all candidates takes far longer than the bound.
+  '''
+  board, dice = _position(3, 3)
+  analysis = analyze_roll(
+    board, dice, remaining_rounds=4, lookahead=40, seed=1, workers=workers, time_limit=0.5, executor=executor if workers > 1 else None,
+  )
+
+  assert not analysis.complete
+  assert analysis.elapsed < 0.5 + 2.0
+  assert analysis.candidates and all(candidate.expected is not None for candidate in analysis.candidates)
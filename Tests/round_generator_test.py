@@ -0,0 +1,95 @@
+from random import Random
+from Models.board import Board
+from Models.enums import UniqueTiles
+from Models.game import Game
+from Services.Dice.dice_service import encode_dice_multiset, get_roll_outcomes, get_roll_probability, roll_dice
+from Services.Game.game_simulator import play_random_game
+from Services.Moves.move_generator import generate_placements, generate_round_placements
+from Services.Moves.round_generator import generate_round_moves
+from Services.Pieces.piece_registry import get_piece_registry
+import pytest
+
+def _position(seed: int, rounds: int, free: int | None = None):
+  '''
+  The board after the rounds of a random game and a roll. With free set, all but that many frontier squares are
+  filled, which keeps the unique tiles enumerable.
+  '''
+  board = Board.from_bytes(bytes(play_random_game(seed, rounds)))
+  if free is not None:
+    keep = sorted(board.frontier)[:free]
+    board = Board.from_bytes(bytes(piece_id or int(index not in keep) for index, piece_id in enumerate(board.to_bytes())))
+
+  return board, roll_dice(Random(seed))
+
+def _final_boards(board: Board, dice, used_unique_tiles=None):
+  '''
+  All boards at the end of the round, by following every placement order level by level.
+  '''
+  registry = get_piece_registry()
+  states = {(board.to_bytes(), encode_dice_multiset(dice), used_unique_tiles): (board, list(dice))}
+  finals = set()
+  while states:
+    following = {}
+    for (cells, _, used), (state, remaining) in states.items():
+      placements = generate_round_placements(state, remaining)
+      if not placements:
+        finals.add(cells)
+      if used is not None:
+        placements += [placement for tile in UniqueTiles if not used & 1 << tile.value for placement in generate_placements(state, tile)]
+      for index, piece_id in placements:
+        child = state.copy()
+        child.place_id(index, piece_id)
+        left = list(remaining)
+        face = registry.get_by_id(piece_id).dice
+        if isinstance(face, UniqueTiles):
+          following[(child.to_bytes(), encode_dice_multiset(left), None)] = (child, left)
+        else:
+          left.remove(face)
+          following[(child.to_bytes(), encode_dice_multiset(left), used)] = (child, left)
+    states = following
+
+  return finals
+
+@pytest.mark.parametrize("seed, rounds, used_unique_tiles, free", [(0, 6, None, None), (1, 6, None, None), (2, 6, 0b101, 8)])
+def test_round_moves_are_distinct_and_legal(seed: int, rounds: int, used_unique_tiles, free):
+  '''
+  Tests, whether every resulting board of the round is generated exactly once and can be played by the game rules.
+  '''
+  board, dice = _position(seed, rounds, free)
+  cells = board.to_bytes()
+  boards = []
+  for placements in generate_round_moves(board, dice, used_unique_tiles):
+    game = Game(board=board.copy())
+    game.used_unique_tiles = used_unique_tiles or 0
+    game.unique_tile_count = game.used_unique_tiles.bit_count()
+    game.roll(dice)
+    for placement in placements:
+      game.place(placement)
+    game.end_round()
+    boards.append(game.board.to_bytes())
+
+  assert len(boards) == len(set(boards))
+  assert set(boards) == _final_boards(board, dice, used_unique_tiles)
+  assert board.to_bytes() == cells
+
+def test_all_unique_tiles_used():
+  '''
+  Tests, whether no unique tile is offered, once all allowed unique tiles have been used.
+  '''
+  board, dice = _position(0, 6)
+  registry = get_piece_registry()
+
+  for placements in generate_round_moves(board, dice, 0b111):
+    assert not any(isinstance(registry.get_by_id(piece_id).dice, UniqueTiles) for _, piece_id in placements)
+
+def test_roll_probabilities():
+  '''
+  Tests, whether the probability of a roll and the dice multiset do not depend on the order of the dice.
+  '''
+  roll, probability = get_roll_outcomes()[-1]
+  reordered = list(reversed(roll))
+
+  assert get_roll_probability(reordered) == probability
+  assert encode_dice_multiset(reordered) == encode_dice_multiset(roll)
+  assert encode_dice_multiset(roll[:1]) != encode_dice_multiset(roll[-1:])
+  assert sum(get_roll_probability(roll) for roll, _ in get_roll_outcomes()) == pytest.approx(1.0)
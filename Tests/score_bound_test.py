@@ -0,0 +1,48 @@
+import os
+from Models.board import Board
+from Models.game import ROUNDS
+from Services.Board.Evaluation.board_evaluation_service import determine_score_upper_bound, evaluate_board_position
+from Services.Board.Evaluation.score_bound import PLACEMENTS_PER_ROUND, get_score_upper_bound
+from Services.Game.game_simulator import play_random_game
+from Services.Pieces.piece_service import get_piece_by_name
+import pytest
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+board_files = sorted(os.listdir(os.path.join(current_dir, "Boards")))
+
+@pytest.mark.parametrize("board_name", board_files)
+def test_bound_of_fixtures(board_name: str):
+  '''
+  Tests, whether the bound without further placements is at least the score of every fixture.
+  '''
+  with open(os.path.join(current_dir, "Boards", board_name)) as f:
+    board = Board.from_json(f.read())
+
+  assert get_score_upper_bound(board, 0) >= evaluate_board_position(board)
+
+def test_bound_of_single_pieces():
+  '''
+  Tests, whether single pieces, whose routes have no connected side, are bounded by their score.
+  '''
+  board = Board()
+  board.set_piece(3, 3, get_piece_by_name("straight_rail_north_south"))
+  assert get_score_upper_bound(board, 0) >= evaluate_board_position(board)
+
+  board.set_piece(0, 0, get_piece_by_name("straight_road_north_south"))
+  assert get_score_upper_bound(board, 0) >= evaluate_board_position(board)
+
+@pytest.mark.parametrize("seed", range(40))
+def test_bound_of_random_games(seed: int):
+  '''
+  Tests, whether no position of a random game is bounded below the final score of the game or its own score.
+  '''
+  final = Board.from_bytes(bytes(play_random_game(seed)))
+  score = evaluate_board_position(final)
+
+  for round in range(ROUNDS + 1):
+    board = Board.from_bytes(bytes(play_random_game(seed, round)))
+    bound = determine_score_upper_bound(board, ROUNDS - round)
+    assert bound >= score
+    assert bound >= get_score_upper_bound(board, 0) >= evaluate_board_position(board)
+
+  assert determine_score_upper_bound(Board(), ROUNDS) == get_score_upper_bound(Board(), ROUNDS * PLACEMENTS_PER_ROUND)
@@ -0,0 +1,88 @@
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from Models.board import Board
+from Models.enums import UniqueTiles
+from Models.game import MAX_UNIQUE_TILES
+from Services.Board.Evaluation.board_evaluation_service import evaluate_board_position
+from Services.Game.self_play import generate_self_play, play_policy_game, play_shard, read_shards
+from Services.Pieces.piece_registry import get_piece_registry
+from Services.Search.rollout_policies import central_rollout, random_rollout
+import pytest
+
+def test_shard_positions():
+  '''
+  Tests, whether a shard holds every position of its games in order, with the score of the final board.
+  '''
+  shard = play_shard(random_rollout, 5, 3)
+
+  assert set(shard["seed"]) == {5, 6, 7}
+  for seed in (5, 6, 7):
+    board, _ = play_policy_game(random_rollout, seed)
+    positions = shard["cells"][shard["seed"] == seed]
+    assert positions[-1].tobytes() == board.to_bytes()
+    assert list(np.count_nonzero(positions, axis=1)) == list(range(1, len(positions) + 1))
+    assert set(shard["score"][shard["seed"] == seed]) == {evaluate_board_position(Board.from_bytes(positions[-1].tobytes()))}
+  assert np.all(np.diff(shard["round"][shard["seed"] == 5].astype(int)) >= 0)
+  assert np.all(shard["score"] == shard["central"] + shard["networks"] + shard["longest_road"] + shard["longest_railway"] - shard["deductions"])
+
+def test_policies_share_dice():
+  '''
+  Tests, whether games of the same seed roll the same dice for every policy.
+  '''
+  rolls = {random_rollout: [], central_rollout: []}
+  for policy, recorded in rolls.items():
+    def recording(board, dice, remaining_rounds, rng, used_unique_tiles, unique_tile_allowed, policy=policy, recorded=recorded):
+      recorded.append(list(dice))
+      return policy(board, dice, remaining_rounds, rng, used_unique_tiles, unique_tile_allowed)
+
+    _, rounds = play_policy_game(recording, 3)
+    assert rounds[-1] == 7
+
+  assert len(rolls[random_rollout]) == 7
+  assert rolls[random_rollout] == rolls[central_rollout]
+
+def test_games_follow_unique_tile_rules():
+  '''
+  Tests, whether policy games place unique tiles by the rules of Game and the shards record the used ones.
+  '''
+  registry = get_piece_registry()
+  shard = play_shard(central_rollout, 0, 20)
+
+  for seed in range(20):
+    board, rounds = play_policy_game(central_rollout, seed)
+    tiles = [(round, registry.get_by_id(board.cells[index]).dice) for index, round in zip(board.placement_history, rounds)]
+    tiles = [(round, dice) for round, dice in tiles if isinstance(dice, UniqueTiles)]
+    assert len(tiles) <= MAX_UNIQUE_TILES
+    assert len({round for round, _ in tiles}) == len({dice for _, dice in tiles}) == len(tiles)
+
+    masks = shard["unique_tiles"][shard["seed"] == seed]
+    assert masks[-1] == sum(1 << dice.value for _, dice in tiles)
+  assert np.any(shard["unique_tiles"])
+
+def test_resume(tmp_path):
+  '''
+  Tests, whether a run extended to more games only plays the missing games and keeps the earlier shards.
+  '''
+  first = generate_self_play(tmp_path, 25, games_per_shard=10)
+  second = generate_self_play(tmp_path, 30, games_per_shard=10)
+
+  assert (first.shards, first.games) == (3, 25)
+  assert (second.shards, second.skipped, second.games) == (1, 2, 10)
+  seeds = np.concatenate([shard["seed"] for shard in read_shards(tmp_path)])
+  assert set(seeds) == set(range(30))
+  assert first.positions + second.positions - len(seeds) == len(play_shard(random_rollout, 20, 5)["seed"])
+
+  with pytest.raises(ValueError):
+    generate_self_play(tmp_path, 30, policy=central_rollout, games_per_shard=10)
+
+def test_parallel_matches_serial(tmp_path):
+  '''
+  Tests, whether worker processes write the shards a single process writes.
+  '''
+  generate_self_play(tmp_path / "serial", 12, games_per_shard=4)
+  with ProcessPoolExecutor(max_workers=2) as executor:
+    report = generate_self_play(tmp_path / "parallel", 12, games_per_shard=4, workers=2, executor=executor)
+
+  assert report.shards == 3
+  for serial, parallel in zip(read_shards(tmp_path / "serial"), read_shards(tmp_path / "parallel"), strict=True):
+    assert all(np.array_equal(serial[key], parallel[key]) for key in serial)
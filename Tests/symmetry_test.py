@@ -0,0 +1,57 @@
+import random
+from Models.board import Board, cell_coordinates, cell_index
+from Services.Board.Evaluation.board_evaluation_service import evaluate_board_position
+from Services.Board.Symmetry.symmetry_service import IDENTITY, LEFT_RIGHT, ROTATE_180, SYMMETRIES, TOP_BOTTOM, canonicalize, get_canonical_hash, transform_board, transform_placement
+from Services.Pieces.piece_registry import get_piece_registry
+from Services.Pieces.piece_service import get_piece_by_name
+import pytest
+
+def test_piece_images():
+  '''
+  Tests, whether reflections remap the connectors of pieces.
+  '''
+  board = Board()
+  board.set_piece(1, 0, get_piece_by_name("curved_rail_north_east"))
+
+  reflected = transform_board(board, LEFT_RIGHT)
+  assert reflected is not None
+  assert reflected.get_piece(5, 0).name == "curved_rail_west_north"
+
+  assert transform_placement((cell_index(1, 0), get_piece_by_name("curved_rail_north_east").id), TOP_BOTTOM) == (cell_index(1, 6), get_piece_by_name("curved_rail_east_south").id)
+
+def test_curved_stations_only_rotate():
+  '''
+  Tests, whether boards with a curved station are only transformed by the rotation, as its mirror image does not exist.
+  '''
+  board = Board()
+  board.set_piece(2, 2, get_piece_by_name("curved_train_station_east_road_south_rail"))
+
+  assert transform_board(board, LEFT_RIGHT) is None
+  assert transform_board(board, TOP_BOTTOM) is None
+  assert transform_board(board, ROTATE_180) is not None
+
+@pytest.mark.parametrize("seed", range(3))
+def test_symmetric_boards_share_score_and_representative(seed: int):
+  rng = random.Random(seed)
+  pieces = get_piece_registry().pieces
+
+  for _ in range(30):
+    board = Board()
+    for index in rng.sample(range(49), rng.randint(0, 40)):
+      board.set_piece(*cell_coordinates(index), rng.choice(pieces))
+
+    canonical, symmetry = canonicalize(board)
+    assert transform_board(board, symmetry) == canonical
+    assert transform_board(canonical, symmetry) == board
+
+    for transform in range(len(SYMMETRIES)):
+      transformed = transform_board(board, transform)
+      if transformed is None:
+        continue
+
+      assert evaluate_board_position(transformed) == evaluate_board_position(board)
+      assert canonicalize(transformed)[0] == canonical
+      assert get_canonical_hash(transformed) == get_canonical_hash(board) == canonical.zobrist_hash
+
+def test_empty_board_is_canonical():
+  assert canonicalize(Board()) == (Board(), IDENTITY)
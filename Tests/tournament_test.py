@@ -0,0 +1,59 @@
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from Models.enums import UniqueTiles
+from Services.Board.Evaluation.board_evaluation_service import evaluate_board_position
+from Services.Game.self_play import play_policy_game
+from Services.Game.tournament import play_tournament, summarize
+from Services.Pieces.piece_service import get_piece_by_id
+from Services.Search.rollout_policies import central_rollout, random_rollout
+import pytest
+
+POLICIES = {"random": random_rollout, "central": central_rollout}
+
+def test_scores_per_seed():
+  '''
+  Tests, whether every policy's game of a seed, with unique tiles, is scored, with the breakdown summing up to the score.
+  '''
+  report = play_tournament(POLICIES, 6, seed=10, chunk_size=4)
+
+  assert report.scores.shape == (6, 2, 6)
+  unique_tiles = 0
+  for game, seed in enumerate(report.seeds):
+    board, _ = play_policy_game(central_rollout, int(seed))
+    assert report.scores[game, 1, -1] == evaluate_board_position(board)
+    unique_tiles += sum(isinstance(get_piece_by_id(piece_id).dice, UniqueTiles) for piece_id in board.cells if piece_id)
+  assert unique_tiles
+  breakdown = report.get_breakdown("random")
+  assert breakdown["score"] == pytest.approx(report.get_mean("random"))
+  assert breakdown["score"] == pytest.approx(
+    breakdown["central"] + breakdown["networks"] + breakdown["longest_road"] + breakdown["longest_railway"] - breakdown["deductions"]
+  )
+
+def test_paired_difference():
+  '''
+  Tests, whether a policy does not differ from itself and the interval of two policies holds their mean difference.
+  '''
+  report = play_tournament({"random": random_rollout, "same": random_rollout, "central": central_rollout}, 20)
+
+  same = report.get_paired_difference("same", "random")
+  assert (same.mean, same.low, same.high) == (0.0, 0.0, 0.0)
+  assert not same.significant
+
+  difference = report.get_paired_difference("central", "random", 0.9)
+  assert difference.mean == pytest.approx(report.get_mean("central") - report.get_mean("random"))
+  assert difference.low < difference.mean < difference.high
+  wide = report.get_paired_difference("central", "random", 0.99)
+  assert difference.high - difference.low < wide.high - wide.low
+
+  rows = dict(summarize(report))
+  assert "difference" not in rows["random"] and rows["central"]["difference"] == pytest.approx(difference.mean)
+
+def test_parallel_matches_serial():
+  '''
+  Tests, whether worker processes play the games a single process plays.
+  '''
+  serial = play_tournament(POLICIES, 9, chunk_size=4)
+  with ProcessPoolExecutor(max_workers=2) as executor:
+    parallel = play_tournament(POLICIES, 9, chunk_size=4, workers=2, executor=executor)
+
+  assert np.array_equal(serial.scores, parallel.scores)
@@ -0,0 +1,86 @@
+import random
+from Models.board import Board, cell_coordinates
+from Services.Pieces.piece_registry import get_piece_registry
+from Services.Search.transposition_table import ENTRY_SIZE, TranspositionTable
+import pytest
+
+def test_zobrist_hash_ignores_placement_order():
+  '''
+  Tests, whether boards with the same pieces have the same hash and are equal, regardless of the placement order.
+  '''
+  rng = random.Random(2)
+  pieces = get_piece_registry().pieces
+  placements = [(cell_coordinates(index), rng.choice(pieces)) for index in rng.sample(range(49), 20)]
+
+  first, second = Board(), Board()
+  for (x, y), piece in placements:
+    first.set_piece(x, y, piece)
+  for (x, y), piece in reversed(placements):
+    second.set_piece(x, y, piece)
+
+  assert first.zobrist_hash == second.zobrist_hash != 0
+  assert first == second
+  with pytest.raises(TypeError):
+    hash(first)
+  assert first.copy().zobrist_hash == first.zobrist_hash
+  assert Board.from_bytes(first.to_bytes()).zobrist_hash == first.zobrist_hash
+
+  for (x, y), _ in placements:
+    first.set_piece(x, y, None)
+  assert first.zobrist_hash == Board().zobrist_hash == 0
+  assert first == Board()
+  assert first != second
+
+def test_store_and_probe():
+  table = TranspositionTable(memory_bytes=1024)
+
+  assert table.capacity * ENTRY_SIZE <= 1024
+  assert table.probe(42) is None
+
+  table.store(42, 1.5, 3)
+  table.store(42, 2.5, 4)
+  assert table.probe(42) == (2.5, 4)
+  assert len(table) == 1
+  assert (table.hits, table.misses) == (1, 1)
+
+  table.clear()
+  assert table.probe(42) is None
+  assert len(table) == 0
+
+def test_check_separates_colliding_keys():
+  '''
+  Tests, whether entries with the same key but different checks are kept apart.
+  '''
+  table = TranspositionTable(memory_bytes=1024)
+
+  table.store(42, 1.5, 3, check=7)
+  assert table.probe(42) is None
+  assert table.probe(42, 8) is None
+
+  table.store(42, 2.5, 3, check=8)
+  assert table.probe(42, 7) == (1.5, 3)
+  assert table.probe(42, 8) == (2.5, 3)
+  assert table.probe(42, -1) is None
+  assert len(table) == 2
+
+def test_priority_preferred_replacement():
+  '''
+  Tests, whether an entry with a high priority survives entries with lower priorities in the same bucket.
+  '''
+  table = TranspositionTable(memory_bytes=2 * ENTRY_SIZE * 2)
+  buckets = table.capacity // 2
+  keys = [1 + buckets * offset for offset in range(4)]
+
+  table.store(keys[0], 10.0, priority=100)
+  table.store(keys[1], 1.0, priority=1)
+  table.store(keys[2], 2.0, priority=2)
+
+  assert table.probe(keys[0]) == (10.0, 100)
+  assert table.probe(keys[1]) is None
+  assert table.probe(keys[2]) == (2.0, 2)
+
+  table.store(keys[3], 20.0, priority=200)
+  assert table.probe(keys[3]) == (20.0, 200)
+  assert table.probe(keys[0]) == (10.0, 100)
+  assert table.probe(keys[2]) is None
+  assert len(table) == 2
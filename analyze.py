@@ -0,0 +1,52 @@
+'''
+Lists the best placements for the dice of a round on a board and writes one JSON line per candidate, the best first,
+with its placements and the points per scoring category of the resulting board (see analyze_roll).
+
+Examples
+  python analyze.py board.json straight_rail curved_road road_t_junction underground
+  python analyze.py board.json straight_road straight_road curved_rail curved_train_station --top 3 --time-limit 10
+  python analyze.py board.json straight_rail curved_road road_t_junction underground --remaining-rounds 3 --lookahead 50 --workers 4
+'''
+import argparse
+import json
+import sys
+from typing import List
+from Models.board import Board
+from Models.enums import BasicDice, SpecialDice
+from Services.Analysis.roll_analysis import analyze_roll
+from Services.Pieces.piece_registry import Dice
+
+FACES = {face.name: face for face in (*BasicDice, *SpecialDice)}
+
+
+def main(arguments: List[str]) -> int:
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument("board", help="board file as written by Board.to_json")
+  parser.add_argument("dice", nargs="+", choices=sorted(FACES), metavar="face", help=f"rolled dice faces: {', '.join(FACES)}")
+  parser.add_argument("--top", type=int, default=5, help="candidates to list (default 5)")
+  parser.add_argument("--used-unique-tiles", type=int, metavar="MASK", help="bitmask of the used unique tiles, also tries unique tiles if passed")
+  parser.add_argument("--remaining-rounds", type=int, default=0, help="rounds after this one, for the lookahead (default 0)")
+  parser.add_argument("--lookahead", type=int, default=0, help="rollouts per candidate, ranks by their mean final score (default 0)")
+  parser.add_argument("--seed", type=int, help="seed of the rollouts")
+  parser.add_argument("--workers", type=int, default=1, help="worker processes (default 1, i.e. no pool)")
+  parser.add_argument("--time-limit", type=float, help="seconds after which the best candidates so far are listed")
+  options = parser.parse_args(arguments)
+
+  with open(options.board) as file:
+    board = Board.from_json(file.read())
+  dice: List[Dice] = [FACES[name] for name in options.dice]
+
+  analysis = analyze_roll(
+    board, dice, options.top, options.used_unique_tiles, options.remaining_rounds, options.lookahead, seed=options.seed,
+    workers=options.workers, time_limit=options.time_limit,
+  )
+  for rank, candidate in enumerate(analysis.candidates, 1):
+    print(json.dumps({"rank": rank, **candidate.to_dict()}))
+  if not analysis.complete:
+    print(f"Time limit expired after {analysis.evaluated} candidates", file=sys.stderr)
+
+  return 0
+
+
+if __name__ == "__main__":
+  sys.exit(main(sys.argv[1:]))
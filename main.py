@@ -1,15 +1,70 @@
+'''
+Scores boards from files or stdin and writes one JSON line per board, in input order, with the points per scoring
+category (see evaluate_board_breakdown) or the error of a malformed board.
+
+Examples
+  python main.py Tests/Boards/complex_road_network_board.json
+  python main.py positions.rids --workers 4 --output scores.jsonl
+  cat boards.jsonl | python main.py --render View/Output
+'''
+import argparse
+import json
+import os
+import sys
+from collections import deque
+from itertools import chain
+from typing import Deque, Iterable, Iterator, List
 from Models.board import Board
-from Models.enums import BasicDice
-from Services.Board.Evaluation.board_evaluation_service import evaluate_board_position
-from Services.Pieces.piece_service import get_all_basic_pieces, get_basic_pieces_for_dice
-from View.visualizer import visualize_board_matplotlib
-
-board = Board()
-pieces = get_all_basic_pieces()
-pieces = get_basic_pieces_for_dice(BasicDice.straight_rail)
-
-with open('Tests/Boards/complex_road_network_board.json') as f:
-    board = board.from_json(f.read())
-    points = evaluate_board_position(board)
-    print(points)
-    visualize_board_matplotlib(board, "View/Output/complex_road_network_board.png")
\ No newline at end of file
+from Services.Board.Evaluation.evaluation_stream import decode_payload, evaluate_payloads
+from Services.Board.Storage.board_reader import FORMATS, BoardPayload, read_board_payloads
+
+
+def main(arguments: List[str]) -> int:
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument("inputs", nargs="*", default=["-"], help="board files, - for stdin (default)")
+  parser.add_argument("--format", choices=FORMATS, help="input format, detected from the file extension by default (stdin: jsonl)")
+  parser.add_argument("--workers", type=int, default=1, help="worker processes (default 1, i.e. no pool)")
+  parser.add_argument("--chunk-size", type=int, default=256, help="boards per task of a worker (default 256)")
+  parser.add_argument("--max-in-flight", type=int, help="chunks submitted at a time (default 2 per worker)")
+  parser.add_argument("--output", help="file to write the results to, stdout by default")
+  parser.add_argument("--render", metavar="DIRECTORY", help="also render every board as PNG into the directory")
+  options = parser.parse_args(arguments)
+
+  payloads = chain.from_iterable(read_board_payloads(path, options.format, sys.stdin.buffer) for path in options.inputs)
+  if options.render:
+    # Rendering needs the payloads again, so they are kept, while their chunk is evaluated.
+    rendered: Deque[BoardPayload] = deque()
+    payloads = _remember(payloads, rendered)
+
+  output = open(options.output, "w") if options.output else sys.stdout
+  failed = False
+  try:
+    for index, result in enumerate(evaluate_payloads(payloads, options.workers, options.chunk_size, options.max_in_flight)):
+      output.write(json.dumps({"index": index, **result}) + "\n")
+      failed = failed or "error" in result
+
+      if options.render:
+        _, kind, payload = rendered.popleft()
+        if "error" not in result:
+          _render(decode_payload(kind, payload), os.path.join(options.render, f"board_{index}.png"))
+  finally:
+    if output is not sys.stdout:
+      output.close()
+
+  return 1 if failed else 0
+
+def _remember(payloads: Iterable[BoardPayload], store: Deque[BoardPayload]) -> Iterator[BoardPayload]:
+  for payload in payloads:
+    store.append(payload)
+    yield payload
+
+def _render(board: Board, filename: str) -> None:
+  # matplotlib takes longer to import than most inputs take to score, so it is only imported for rendering.
+  from View.visualizer import visualize_board_matplotlib
+
+  os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+  visualize_board_matplotlib(board, filename)
+
+
+if __name__ == "__main__":
+  sys.exit(main(sys.argv[1:]))
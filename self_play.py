@@ -0,0 +1,44 @@
+'''
+Plays seeded games with a rollout policy and writes every position after a placement, with the subscores of the final
+board, as compressed npz shards into a directory (see generate_self_play). Runs can be interrupted and resumed, or
+extended to more games, with the same arguments.
+
+Examples
+  python self_play.py games 10000
+  python self_play.py games 1000000 --policy central --workers 8 --games-per-shard 5000
+'''
+import argparse
+import sys
+from typing import List
+from Services.Game.self_play import SelfPlayReport, generate_self_play
+from Services.Search.rollout_policies import ROLLOUT_POLICIES
+
+
+def main(arguments: List[str]) -> int:
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument("directory", help="directory of the shards, created if missing")
+  parser.add_argument("games", type=int, help="games to play in total, including those of earlier runs")
+  parser.add_argument("--policy", choices=sorted(ROLLOUT_POLICIES), default="random", help="rollout policy (default random)")
+  parser.add_argument("--seed", type=int, default=0, help="seed of the first game (default 0)")
+  parser.add_argument("--games-per-shard", type=int, default=1000, help="games per shard file (default 1000)")
+  parser.add_argument("--workers", type=int, default=1, help="worker processes (default 1, i.e. no pool)")
+  options = parser.parse_args(arguments)
+
+  def progress(report: SelfPlayReport) -> None:
+    print(
+      f"{report.shards} shards, {report.games} games, {report.positions} positions, "
+      f"{report.games_per_second:.0f} games/s, {report.positions_per_second:.0f} positions/s",
+      file=sys.stderr,
+    )
+
+  report = generate_self_play(
+    options.directory, options.games, ROLLOUT_POLICIES[options.policy], options.seed, options.games_per_shard, options.workers,
+    progress=progress,
+  )
+  print(f"Wrote {report.shards} shards, skipped {report.skipped} existing ones in {report.elapsed:.1f}s")
+
+  return 0
+
+
+if __name__ == "__main__":
+  sys.exit(main(sys.argv[1:]))
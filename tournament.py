@@ -0,0 +1,41 @@
+'''
+Plays the same seeded games with every rollout policy, so all of them see the same dice, and writes one JSON line per
+policy with the mean and variance of its final scores, its mean points per scoring category and its paired difference
+to the baseline with a confidence interval (see play_tournament).
+
+Examples
+  python tournament.py random central --games 2000
+  python tournament.py random central --games 20000 --workers 8 --baseline central --confidence 0.99
+'''
+import argparse
+import json
+import sys
+from typing import List
+from Services.Game.tournament import play_tournament, summarize
+from Services.Search.rollout_policies import ROLLOUT_POLICIES
+
+
+def main(arguments: List[str]) -> int:
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument("policies", nargs="+", choices=sorted(ROLLOUT_POLICIES), metavar="policy", help=f"rollout policies: {', '.join(ROLLOUT_POLICIES)}")
+  parser.add_argument("--games", type=int, default=1000, help="games per policy (default 1000)")
+  parser.add_argument("--seed", type=int, default=0, help="seed of the first game (default 0)")
+  parser.add_argument("--workers", type=int, default=1, help="worker processes (default 1, i.e. no pool)")
+  parser.add_argument("--baseline", help="policy the others are compared to (default the first)")
+  parser.add_argument("--confidence", type=float, default=0.95, help="confidence of the intervals (default 0.95)")
+  options = parser.parse_args(arguments)
+
+  policies = {name: ROLLOUT_POLICIES[name] for name in options.policies}
+  if options.baseline is not None and options.baseline not in policies:
+    parser.error(f"the baseline {options.baseline} is not one of the policies")
+
+  report = play_tournament(policies, options.games, options.seed, options.workers)
+  for name, row in summarize(report, options.baseline, options.confidence):
+    print(json.dumps({"policy": name, **row}))
+  print(f"{report.games} games per policy, {report.games_per_second:.0f} games/s", file=sys.stderr)
+
+  return 0
+
+
+if __name__ == "__main__":
+  sys.exit(main(sys.argv[1:]))